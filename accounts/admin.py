@@ -5,6 +5,7 @@ from django.contrib.auth.admin import GroupAdmin
 from django.utils import timezone
 from django.core.exceptions import PermissionDenied
 
+from portal.user_index import user_index
 from website.admin_site import vertix_admin_site
 from .models import User
 
@@ -14,7 +15,8 @@ class UserAdmin(BaseUserAdmin):
     ordering = ("email",)
     list_display = ("email", "role", "company_name", "is_active", "is_staff", "approved_at")
     list_filter = ("role", "is_active", "is_staff")
-    search_fields = ("email", "company_name", "company_cif")
+    # __uicontains: insensibil la diacritice (perf/postgres.py), cu index trigram pe Postgres
+    search_fields = ("email", "company_name__uicontains", "company_cif")
     actions = ["approve_users"]
 
     fieldsets = (
@@ -38,6 +40,9 @@ class UserAdmin(BaseUserAdmin):
         updated = queryset.filter(is_active=False).update(
             is_active=True, approved_at=now, approved_by=request.user
         )
+        if updated:
+            # update() nu trimite post_save: conturile aprobate intră în autocomplete-ul @mention
+            user_index.invalidate()
         self.message_user(request, f"Aprobate: {updated} cont(uri).")
 
     approve_users.short_description = "Approve selected users"
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-19 16:59
+
+from django.db import migrations
+
+from perf.postgres import search_setup, trigram_index
+
+
+class Migration(migrations.Migration):
+    # indexurile trigram (icontains / uicontains) se creează doar pe PostgreSQL
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+    ]
+
+    operations = [
+        search_setup(),
+        trigram_index("accounts_user", "email"),
+        trigram_index("accounts_user", "company_cif"),
+        trigram_index("accounts_user", "company_name", unaccent=True),
+    ]
@@ -2,6 +2,9 @@
 from django.contrib.auth.views import LoginView, LogoutView
 from django.shortcuts import render, redirect
 from django.contrib import messages
+from django.db import transaction
+
+from notifications.outbox import notify_registration
 from .forms import RegisterForm
 
 def register(request):
@@ -11,7 +14,9 @@ def register(request):
     if request.method == "POST":
         form = RegisterForm(request.POST)
         if form.is_valid():
-            form.save()
+            with transaction.atomic():
+                user = form.save()
+                notify_registration(user)
             messages.info(request, "Contul a fost creat și este în așteptare pentru aprobare.")
             return redirect("login")
     else:
@@ -7,6 +7,7 @@ from django.template.response import TemplateResponse
 from django.db.models import Count
 from django.db.models.functions import TruncDate
 
+from perf.replica import reporting
 from website.admin_site import vertix_admin_site
 from .models import PageView
 
@@ -19,6 +20,11 @@ class PageViewAdmin(admin.ModelAdmin):
     date_hierarchy = "created_at"
     ordering = ("-created_at",)
     readonly_fields = ("path", "method", "status_code", "user", "ua", "referer", "created_at", "visitor_id")
+    # User e în baza principală: fără JOIN (select_related automat), userii paginii vin într-o singură interogare
+    list_select_related = ()
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).prefetch_related("user")
 
     def has_add_permission(self, request):
         return False
@@ -27,6 +33,7 @@ class PageViewAdmin(admin.ModelAdmin):
         return False
 
 
+@reporting()
 def analytics_view(request):
     # perioadă
     try:
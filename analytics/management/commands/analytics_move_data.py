@@ -0,0 +1,52 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from analytics.models import PageView
+from analytics.routers import analytics_db
+from portal.models import AbuseEvent, BlockedIP
+
+
+class Command(BaseCommand):
+    help = (
+        "Copiază PageView / AbuseEvent / BlockedIP din baza principală în baza de analytics "
+        "(o singură dată, după migrate --database analytics). Rândurile existente sunt sărite."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--purge", action="store_true", help="Golește tabelele vechi din baza principală după copiere.")
+
+    def handle(self, *args, **options):
+        target = analytics_db()
+        if target == DEFAULT_DB_ALIAS:
+            raise CommandError("Aliasul 'analytics' nu e configurat în DATABASES.")
+
+        existing = set(connections[DEFAULT_DB_ALIAS].introspection.table_names())
+        for model in (PageView, AbuseEvent, BlockedIP):
+            if model._meta.db_table not in existing:
+                continue
+            copied = self._copy(model, target, options["batch_size"])
+            self.stdout.write(f"{model._meta.label}: {copied} rânduri copiate.")
+            if options["purge"]:
+                model.objects.using(DEFAULT_DB_ALIAS).all()._raw_delete(DEFAULT_DB_ALIAS)
+
+        self.stdout.write(self.style.SUCCESS("Gata."))
+
+    def _copy(self, model, target: str, batch_size: int) -> int:
+        # created_at are auto_now_add: păstrăm valorile originale
+        auto = [f for f in model._meta.concrete_fields if getattr(f, "auto_now_add", False)]
+        for f in auto:
+            f.auto_now_add = False
+        try:
+            source = model.objects.using(DEFAULT_DB_ALIAS).order_by("pk")
+            copied, last = 0, 0
+            while True:
+                rows = list(source.filter(pk__gt=last)[:batch_size])
+                if not rows:
+                    return copied
+                model.objects.using(target).bulk_create(rows, ignore_conflicts=True)
+                copied += len(rows)
+                last = rows[-1].pk
+        finally:
+            for f in auto:
+                f.auto_now_add = True
@@ -1,4 +1,6 @@
+import logging
 import uuid
+from django.db import DatabaseError
 from django.utils.deprecation import MiddlewareMixin
 from django.urls import resolve
 from .models import PageView
@@ -8,6 +10,8 @@ EXCLUDE_NAMES = {"set_language"}
 COOKIE_NAME = "vx_vid"
 COOKIE_MAX_AGE = 60 * 60 * 24 * 90  # 90 zile
 
+logger = logging.getLogger("analytics")
+
 class PageViewMiddleware(MiddlewareMixin):
     def process_response(self, request, response):
         path = request.path or ""
@@ -32,15 +36,19 @@ class PageViewMiddleware(MiddlewareMixin):
         ua = (request.META.get("HTTP_USER_AGENT", "") or "")[:300]
         ref = (request.META.get("HTTP_REFERER", "") or "")[:400]
 
-        PageView.objects.create(
-            path=path[:400],
-            user=user,
-            visitor_id=visitor_uuid,
-            method=(request.method or "")[:10],
-            status_code=getattr(response, "status_code", None),
-            ua=ua,
-            referer=ref,
-        )
+        # telemetria nu strică răspunsul: o accesare pierdută e preferabilă unui 500
+        try:
+            PageView.objects.create(
+                path=path[:400],
+                user=user,
+                visitor_id=visitor_uuid,
+                method=(request.method or "")[:10],
+                status_code=getattr(response, "status_code", None),
+                ua=ua,
+                referer=ref,
+            )
+        except DatabaseError:
+            logger.warning("PageView neînregistrat pentru %s", path, exc_info=True)
 
         # setăm cookie dacă lipsea/era invalid
         if request.COOKIES.get(COOKIE_NAME) != str(visitor_uuid):
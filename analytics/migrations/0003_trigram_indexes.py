@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-19 16:59
+
+from django.db import migrations
+
+from perf.postgres import search_setup, trigram_index
+
+
+class Migration(migrations.Migration):
+    # indexurile trigram (icontains / uicontains) se creează doar pe PostgreSQL
+
+    dependencies = [
+        ('analytics', '0002_alter_pageview_user'),
+    ]
+
+    operations = [
+        search_setup(),
+        trigram_index("analytics_pageview", "path"),
+        trigram_index("analytics_pageview", "ua"),
+        trigram_index("analytics_pageview", "referer"),
+    ]
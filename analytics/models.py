@@ -10,7 +10,9 @@ class PageView(models.Model):
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         null=True, blank=True,
-        on_delete=models.SET_NULL,
+        # User e în altă bază (analytics/routers.py): fără FK în DB, golit de analytics.signals
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
         related_name="page_views"
     )
 
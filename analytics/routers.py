@@ -0,0 +1,51 @@
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+# ============================================================
+# Bază separată pentru telemetrie (accesări, abuz / rate-limit)
+# ============================================================
+
+ANALYTICS_DB = "analytics"
+
+# modele din alte aplicații care stau tot în baza de analytics
+ROUTED_MODELS = {("portal", "abuseevent"), ("portal", "blockedip")}
+
+
+def analytics_db() -> str:
+    # fără alias configurat, totul rămâne în baza implicită
+    return ANALYTICS_DB if ANALYTICS_DB in settings.DATABASES else DEFAULT_DB_ALIAS
+
+
+def is_analytics(app_label: str, model_name: str = None) -> bool:
+    return app_label == "analytics" or (app_label, model_name) in ROUTED_MODELS
+
+
+class AnalyticsRouter:
+    """
+    Scrierile de telemetrie nu mai concurează pentru lock-ul bazei principale.
+    Relațiile spre User sunt fără constrângere în DB (db_constraint=False), deci fără JOIN între baze.
+    """
+
+    def _route(self, model, **hints):
+        if is_analytics(model._meta.app_label, model._meta.model_name):
+            return analytics_db()
+        # ex: PageView.user -> User: altfel Django ar căuta User în baza instanței
+        instance = hints.get("instance")
+        if instance is not None and instance._state.db == ANALYTICS_DB:
+            return DEFAULT_DB_ALIAS
+        return None
+
+    db_for_read = _route
+    db_for_write = _route
+
+    def allow_relation(self, obj1, obj2, **hints):
+        if any(is_analytics(o._meta.app_label, o._meta.model_name) for o in (obj1, obj2)):
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if is_analytics(app_label, model_name):
+            return db == analytics_db()
+        if db == ANALYTICS_DB:
+            return False
+        return None
@@ -0,0 +1,20 @@
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from portal.models import AbuseEvent
+
+from .models import PageView
+
+
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def detach_deleted_user(sender, instance, using=DEFAULT_DB_ALIAS, **kwargs):
+    # SET_NULL nu traversează bazele (user e DO_NOTHING): golim manual după commit
+    user_id = instance.pk
+
+    def _detach():
+        PageView.objects.filter(user_id=user_id).update(user=None)
+        AbuseEvent.objects.filter(user_id=user_id).update(user=None)
+
+    transaction.on_commit(_detach, using=using)
@@ -1,3 +1,84 @@
-from django.test import TestCase
+from io import StringIO
 
-# Create your tests here.
+from django.core.management import call_command
+from django.db import DEFAULT_DB_ALIAS, connections, router
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from accounts.models import User
+from perf.testing import plain_static_storage
+from portal.models import AbuseEvent, BlockedIP
+
+from .models import PageView
+from .routers import ANALYTICS_DB
+
+
+@plain_static_storage
+class AnalyticsRoutingTests(TestCase):
+    databases = {"default", "analytics"}
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("ana@example.com", "x", is_active=True)
+
+    def test_telemetry_lives_in_the_analytics_database(self):
+        for model in (PageView, AbuseEvent, BlockedIP):
+            self.assertEqual(router.db_for_write(model), ANALYTICS_DB)
+            self.assertTrue(router.allow_migrate_model(ANALYTICS_DB, model))
+            self.assertFalse(router.allow_migrate_model(DEFAULT_DB_ALIAS, model))
+        self.assertFalse(router.allow_migrate_model(ANALYTICS_DB, User))
+
+    def test_page_view_is_recorded_in_analytics(self):
+        self.client.force_login(self.user)
+        self.client.get(reverse("home"))
+        view = PageView.objects.get()
+        self.assertEqual((view._state.db, view.user_id), (ANALYTICS_DB, self.user.pk))
+        self.assertEqual(view.user, self.user)  # relația se citește din baza principală
+
+    def test_deleted_user_is_detached(self):
+        user = User.objects.create_user("sters@example.com", "x", is_active=True)
+        PageView.objects.create(path="/", user=user)
+        AbuseEvent.objects.create(reason="rate", user=user)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            user.delete()
+        self.assertEqual(list(PageView.objects.values_list("user_id", flat=True)), [None])
+        self.assertEqual(list(AbuseEvent.objects.values_list("user_id", flat=True)), [None])
+
+    def test_admin_changelist_does_not_join_across_databases(self):
+        admin = User.objects.create_superuser("admin@example.com", "x")
+        PageView.objects.create(path="/servicii/", user=self.user)
+        self.client.force_login(admin)
+
+        with CaptureQueriesContext(connections[ANALYTICS_DB]) as queries:
+            response = self.client.get(reverse("vertix_admin:analytics_pageview_changelist"))
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "ana@example.com")
+        self.assertFalse([q for q in queries.captured_queries if "accounts_user" in q["sql"]])
+
+
+class MoveDataTests(TransactionTestCase):
+    """
+    Upgrade: tabelele vechi din baza principală se copiază în analytics.
+    """
+
+    databases = {"default", "analytics"}
+
+    def setUp(self):
+        with connections[DEFAULT_DB_ALIAS].schema_editor() as editor:
+            editor.create_model(PageView)
+        self.addCleanup(self.drop_old_table)
+
+    def drop_old_table(self):
+        with connections[DEFAULT_DB_ALIAS].schema_editor() as editor:
+            editor.delete_model(PageView)
+
+    def test_rows_are_copied_once_and_purged(self):
+        PageView.objects.using(DEFAULT_DB_ALIAS).bulk_create([PageView(path=f"/p{i}/") for i in range(3)])
+
+        call_command("analytics_move_data", stdout=StringIO())
+        call_command("analytics_move_data", "--purge", stdout=StringIO())
+
+        self.assertEqual(sorted(PageView.objects.values_list("path", flat=True)), ["/p0/", "/p1/", "/p2/"])
+        self.assertFalse(PageView.objects.using(DEFAULT_DB_ALIAS).exists())
@@ -5,9 +5,21 @@ from tinymce.widgets import TinyMCE
 
 from website.admin_site import vertix_admin_site
 from accounts.models import User
-from .models import DocumentType, Document, DocumentTerms
+from .services.access import filter_accessible, get_access
+from .models import DocumentType, Document, DocumentTerms, DocumentSchemaVersion, DocumentMaterial
 
 
+class DocumentSchemaVersionInline(admin.TabularInline):
+    model = DocumentSchemaVersion
+    extra = 0
+    can_delete = False
+    fields = ("version", "schema_hash", "created_at")
+    readonly_fields = fields
+    ordering = ("-version",)
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
 
 @admin.register(DocumentType, site=vertix_admin_site)
 class DocumentTypeAdmin(admin.ModelAdmin):
@@ -22,21 +34,35 @@ class DocumentTypeAdmin(admin.ModelAdmin):
         ("Template-uri", {"fields": ("docx_template", "html_template")}),
         ("Schema formular", {"fields": ("schema_json",)}),
     )
+    inlines = [DocumentSchemaVersionInline]
+
+
+class DocumentMaterialInline(admin.TabularInline):
+    # doar citire: rândurile se regenerează din data_json["materials"]
+    model = DocumentMaterial
+    extra = 0
+    can_delete = False
+    fields = ("position", "name", "qty", "unit", "notes")
+    readonly_fields = fields
+
+    def has_add_permission(self, request, obj=None):
+        return False
 
 
 @admin.register(Document, site=vertix_admin_site)
 class DocumentAdmin(admin.ModelAdmin):
     list_display = ("number", "doc_type", "status", "client_user", "owner", "created_at")
     list_filter = ("status", "doc_type")
-    search_fields = ("number", "client_user__email", "client_user__company_name", "owner__email")
+    search_fields = ("number", "client_user__email", "client_user__company_name__uicontains", "owner__email")
     ordering = ("-created_at",)
     autocomplete_fields = ("client_user", "owner", "technicians")
-    readonly_fields = ("number", "created_at", "created_by", "docx_file", "pdf_file")
+    readonly_fields = ("number", "created_at", "created_by", "docx_file", "pdf_file", "schema_version")
+    inlines = [DocumentMaterialInline]
 
     fieldsets = (
         ("Identificare", {"fields": ("doc_type", "number", "status")}),
         ("Asignare", {"fields": ("client_user", "owner", "technicians")}),
-        ("Date document", {"fields": ("data_json",)}),
+        ("Date document", {"fields": ("data_json", "schema_version")}),
         ("Fișiere generate", {"fields": ("docx_file", "pdf_file")}),
         ("Audit", {"fields": ("created_by", "created_at")}),
     )
@@ -55,7 +81,7 @@ class DocumentAdmin(admin.ModelAdmin):
 
         # Tehnician vede doar documentele unde e asignat
         if u.role == User.Role.TEHNICIAN:
-            return qs.filter(technicians=u)
+            return filter_accessible(qs, u)
 
         # Client nu are ce căuta în admin
         return qs.none()
@@ -73,7 +99,7 @@ class DocumentAdmin(admin.ModelAdmin):
         if u.role == User.Role.TEHNICIAN:
             if obj is None:
                 return True
-            return obj.technicians.filter(pk=u.pk).exists()
+            return get_access(u).can_view(obj.pk)
         return False
 
     def has_change_permission(self, request, obj=None):
@@ -86,7 +112,7 @@ class DocumentAdmin(admin.ModelAdmin):
             if obj is None:
                 return True
             # tehnician poate edita doar dacă nu e FINAL/CANCELLED
-            return obj.technicians.filter(pk=u.pk).exists() and obj.status in ["DRAFT", "IN_PROGRESS", "READY"]
+            return get_access(u).can_edit(obj.pk)
         return False
 
     def has_add_permission(self, request):
@@ -38,16 +38,30 @@ def _field_from_schema(f: dict) -> forms.Field:
     return forms.CharField(label=label, required=required, max_length=500)
 
 
+def _apply_widget_css(field: forms.Field) -> forms.Field:
+    """
+    Clasele bootstrap se pun o singură dată, pe clasa de form compilată
+    (instanțele copiază widget-ul, deci nu mai e nevoie de bucla din view).
+    """
+    cls = "form-control"
+    if field.widget.__class__.__name__ in ["Select", "SelectMultiple"]:
+        cls = "form-select"
+    # mic în portal
+    field.widget.attrs.setdefault("class", cls + " form-control-sm")
+    return field
+
+
 def build_document_form(schema_json: dict) -> type[forms.Form]:
     """
     Construiește un Form Django din schema_json (fără câmpurile de tip table).
+    Nu se apelează direct din view-uri: folosește services.schema_registry (cache).
     """
     fields = {}
     for f in schema_json.get("fields", []):
         if f.get("type") == "table":
             continue
         name = f["name"]
-        fields[name] = _field_from_schema(f)
+        fields[name] = _apply_widget_css(_field_from_schema(f))
 
     DynamicForm = type("DynamicDocumentForm", (forms.Form,), fields)
     return DynamicForm
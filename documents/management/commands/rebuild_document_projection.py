@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from documents.models import Document
+from documents.services.projection import sync_document_projection
+
+
+class Command(BaseCommand):
+    help = "Reface proiecția indexată (câmpuri searchable + materiale) din Document.data_json."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--type", dest="doc_type", default="", help="Doar pentru un DocumentType (code).")
+
+    def handle(self, *args, **options):
+        qs = Document.objects.select_related("doc_type", "schema_version").order_by("pk")
+        if options["doc_type"]:
+            qs = qs.filter(doc_type__code=options["doc_type"])
+
+        total = 0
+        for doc in qs.iterator(chunk_size=500):
+            sync_document_projection(doc)
+            total += 1
+
+        self.stdout.write(self.style.SUCCESS(f"Proiecție refăcută pentru {total} documente."))
@@ -0,0 +1,61 @@
+# Generated by Django 5.2.18 on 2026-10-19 16:18
+
+import hashlib
+import json
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def create_initial_versions(apps, schema_editor):
+    """
+    v1 pentru fiecare DocumentType existent; documentele existente se fixează pe ea.
+    """
+    DocumentType = apps.get_model("documents", "DocumentType")
+    DocumentSchemaVersion = apps.get_model("documents", "DocumentSchemaVersion")
+    Document = apps.get_model("documents", "Document")
+
+    for dt in DocumentType.objects.all():
+        schema = dt.schema_json or {}
+        raw = json.dumps(schema, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+        version = DocumentSchemaVersion.objects.create(
+            doc_type=dt,
+            version=1,
+            schema_hash=hashlib.sha256(raw.encode("utf-8")).hexdigest(),
+            schema_json=schema,
+        )
+        Document.objects.filter(doc_type=dt, schema_version__isnull=True).update(schema_version=version)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0003_documentterms_documenttype_terms'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DocumentSchemaVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.PositiveIntegerField()),
+                ('schema_hash', models.CharField(db_index=True, max_length=64)),
+                ('schema_json', models.JSONField(blank=True, default=dict)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('doc_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='schema_versions', to='documents.documenttype')),
+            ],
+            options={
+                'verbose_name': 'Versiune schemă',
+                'verbose_name_plural': 'Versiuni schemă',
+                'ordering': ['doc_type', '-version'],
+                'unique_together': {('doc_type', 'version')},
+            },
+        ),
+        migrations.AddField(
+            model_name='document',
+            name='schema_version',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='documents', to='documents.documentschemaversion'),
+        ),
+        migrations.RunPython(create_initial_versions, migrations.RunPython.noop),
+    ]
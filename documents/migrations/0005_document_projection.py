@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-19 16:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0004_documentschemaversion'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DocumentMaterial',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('position', models.PositiveIntegerField(default=0)),
+                ('name', models.CharField(max_length=200)),
+                ('name_norm', models.CharField(db_index=True, max_length=200)),
+                ('qty', models.DecimalField(blank=True, decimal_places=2, max_digits=12, null=True)),
+                ('unit', models.CharField(blank=True, max_length=30)),
+                ('notes', models.CharField(blank=True, max_length=200)),
+                ('document', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='material_rows', to='documents.document')),
+            ],
+            options={
+                'ordering': ['document', 'position'],
+            },
+        ),
+        migrations.CreateModel(
+            name='DocumentFieldValue',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=64)),
+                ('value_text', models.CharField(blank=True, max_length=255)),
+                ('value_num', models.DecimalField(blank=True, decimal_places=2, max_digits=14, null=True)),
+                ('value_date', models.DateTimeField(blank=True, null=True)),
+                ('document', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='field_values', to='documents.document')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['key', 'value_text'], name='documents_d_key_1b1c3f_idx'), models.Index(fields=['key', 'value_num'], name='documents_d_key_0ce3a3_idx'), models.Index(fields=['key', 'value_date'], name='documents_d_key_ca59ef_idx')],
+                'unique_together': {('document', 'key')},
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 16:59
+
+from django.db import migrations
+
+from perf.postgres import search_setup, trigram_index
+
+
+class Migration(migrations.Migration):
+    # indexurile trigram (icontains / uicontains) se creează doar pe PostgreSQL
+
+    dependencies = [
+        ('documents', '0005_document_projection'),
+    ]
+
+    operations = [
+        search_setup(),
+        trigram_index("documents_document", "number"),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 17:04
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0006_trigram_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='document',
+            index=models.Index(fields=['status', 'created_at'], name='documents_d_status_64808e_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='document',
+            index=models.Index(fields=['client_user', 'status'], name='documents_d_client__82d113_idx'),
+        ),
+    ]
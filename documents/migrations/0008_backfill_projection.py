@@ -0,0 +1,65 @@
+from django.db import migrations
+
+BATCH = 500
+
+
+def backfill_projection(apps, schema_editor):
+    """
+    Documentele existente la 0005 nu aveau proiecție: o construim aici, cu
+    modelele istorice (echivalentul rebuild_document_projection).
+    """
+    from documents.services.projection import _field_value_row, _material_rows
+
+    Document = apps.get_model("documents", "Document")
+    DocumentFieldValue = apps.get_model("documents", "DocumentFieldValue")
+    DocumentMaterial = apps.get_model("documents", "DocumentMaterial")
+    db = schema_editor.connection.alias
+
+    fields_by_type = {}
+    values, materials = [], []
+    # id-urile întâi: scriem în tabelele de care depinde filtrul
+    pks = list(
+        Document.objects.using(db)
+        .filter(field_values__isnull=True, material_rows__isnull=True)
+        .order_by("pk").values_list("pk", flat=True)
+    )
+    docs = (
+        doc
+        for i in range(0, len(pks), BATCH)
+        for doc in Document.objects.using(db).filter(pk__in=pks[i:i + BATCH]).select_related("doc_type")
+    )
+    for doc in docs:
+        data = doc.data_json or {}
+        if not isinstance(data, dict) or not data:
+            continue
+
+        if doc.doc_type_id not in fields_by_type:
+            fields_by_type[doc.doc_type_id] = [
+                f for f in (doc.doc_type.schema_json or {}).get("fields", [])
+                if isinstance(f, dict) and f.get("name") and f.get("searchable")
+                and f.get("type", "text") != "table"
+            ]
+        for f in fields_by_type[doc.doc_type_id]:
+            row = _field_value_row(doc, f, data.get(f["name"]), model=DocumentFieldValue)
+            if row is not None:
+                values.append(row)
+        materials += _material_rows(doc, data.get("materials"), model=DocumentMaterial)
+
+        if len(values) + len(materials) >= BATCH:
+            DocumentFieldValue.objects.using(db).bulk_create(values)
+            DocumentMaterial.objects.using(db).bulk_create(materials)
+            values, materials = [], []
+
+    DocumentFieldValue.objects.using(db).bulk_create(values)
+    DocumentMaterial.objects.using(db).bulk_create(materials)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0007_composite_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_projection, migrations.RunPython.noop),
+    ]
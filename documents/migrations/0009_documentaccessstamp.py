@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 17:28
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_trigram_indexes'),
+        ('documents', '0008_backfill_projection'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DocumentAccessStamp',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='+', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('version', models.BigIntegerField(default=0)),
+            ],
+        ),
+    ]
@@ -28,6 +28,33 @@ class DocumentType(models.Model):
     def __str__(self):
         return f"{self.name} ({self.code})"
 
+    def clean(self):
+        # schema_json se validează o singură dată, la salvare (nu la fiecare request)
+        from .services.schema_registry import validate_schema
+        validate_schema(self.schema_json or {})
+
+
+class DocumentSchemaVersion(models.Model):
+    """
+    Snapshot al schema_json pentru un DocumentType.
+    Fiecare modificare de schemă creează o versiune nouă; documentele rămân
+    legate de versiunea cu care au fost scrise.
+    """
+    doc_type = models.ForeignKey("documents.DocumentType", on_delete=models.CASCADE, related_name="schema_versions")
+    version = models.PositiveIntegerField()
+    schema_hash = models.CharField(max_length=64, db_index=True)
+    schema_json = models.JSONField(default=dict, blank=True)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        unique_together = [("doc_type", "version")]
+        ordering = ["doc_type", "-version"]
+        verbose_name = "Versiune schemă"
+        verbose_name_plural = "Versiuni schemă"
+
+    def __str__(self):
+        return f"{self.doc_type.code} v{self.version}"
+
 
 class Document(models.Model):
     class Status(models.TextChoices):
@@ -56,6 +83,10 @@ class Document(models.Model):
     )
 
     data_json = models.JSONField(default=dict, blank=True)
+    schema_version = models.ForeignKey(
+        "documents.DocumentSchemaVersion", on_delete=models.SET_NULL,
+        null=True, blank=True, related_name="documents"
+    )
 
     docx_file = models.FileField(upload_to="generated_docs/docx/", blank=True, null=True)
     pdf_file = models.FileField(upload_to="generated_docs/pdf/", blank=True, null=True)
@@ -66,6 +97,13 @@ class Document(models.Model):
     )
     created_at = models.DateTimeField(default=timezone.now)
 
+    class Meta:
+        indexes = [
+            # document_list: filtru pe status, sortat după dată; clientul vede doar documentele lui FINAL
+            models.Index(fields=["status", "created_at"]),
+            models.Index(fields=["client_user", "status"]),
+        ]
+
     def is_closed(self) -> bool:
         return self.status in {self.Status.FINAL, self.Status.CANCELLED}
 
@@ -74,6 +112,65 @@ class Document(models.Model):
 
 
 
+class DocumentAccessStamp(models.Model):
+    """
+    Versiunea seturilor de acces (services.access) pentru un user.
+    Stă în baza de date ca orice proces să vadă schimbarea: cheia din cache
+    include versiunea, deci un drept revocat nu mai poate fi servit din cache.
+    Versiunea e aleatoare, nu un contor: după un rollback, valoarea anulată
+    nu mai poate reapărea peste seturi calculate din date necomise.
+    """
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, primary_key=True, related_name="+"
+    )
+    version = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.user_id} v{self.version}"
+
+
+class DocumentFieldValue(models.Model):
+    """
+    Proiecție indexată a câmpurilor marcate "searchable" în schema_json.
+    Se regenerează la fiecare salvare a data_json (vezi services.projection).
+    """
+    document = models.ForeignKey("documents.Document", on_delete=models.CASCADE, related_name="field_values")
+    key = models.CharField(max_length=64)
+    value_text = models.CharField(max_length=255, blank=True)  # lower + fără diacritice
+    value_num = models.DecimalField(max_digits=14, decimal_places=2, null=True, blank=True)
+    value_date = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        unique_together = [("document", "key")]
+        indexes = [
+            models.Index(fields=["key", "value_text"]),
+            models.Index(fields=["key", "value_num"]),
+            models.Index(fields=["key", "value_date"]),
+        ]
+
+    def __str__(self):
+        return f"{self.document_id}:{self.key}={self.value_text}"
+
+
+class DocumentMaterial(models.Model):
+    """
+    Rândurile din data_json["materials"], ca tabel separat (filtrare pe material).
+    """
+    document = models.ForeignKey("documents.Document", on_delete=models.CASCADE, related_name="material_rows")
+    position = models.PositiveIntegerField(default=0)
+    name = models.CharField(max_length=200)
+    name_norm = models.CharField(max_length=200, db_index=True)
+    qty = models.DecimalField(max_digits=12, decimal_places=2, null=True, blank=True)
+    unit = models.CharField(max_length=30, blank=True)
+    notes = models.CharField(max_length=200, blank=True)
+
+    class Meta:
+        ordering = ["document", "position"]
+
+    def __str__(self):
+        return f"{self.name} ({self.qty} {self.unit})"
+
+
 class DocumentTerms(models.Model):
     key = models.SlugField(unique=True)  # ex: "default"
     title = models.CharField(max_length=200, default="Termeni și condiții")
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import secrets
+from dataclasses import dataclass
+from typing import FrozenSet, Iterable, Optional
+
+from django.core.cache import cache
+
+from accounts.models import User
+
+CACHE_TTL = 300  # secunde
+# peste acest prag filtrăm listele prin JOIN, nu prin "pk IN (...)"
+MAX_INLINE_IDS = 5000
+
+EDITABLE_STATUSES = {"DRAFT", "IN_PROGRESS", "READY"}
+
+
+@dataclass(frozen=True)
+class DocumentAccess:
+    """
+    Ce documente poate vedea / edita un user.
+    view_ids / edit_ids = None înseamnă "toate" (admin / manager).
+    """
+    view_ids: Optional[FrozenSet[int]]
+    edit_ids: Optional[FrozenSet[int]]
+
+    def can_view(self, doc_id: int) -> bool:
+        return self.view_ids is None or doc_id in self.view_ids
+
+    def can_edit(self, doc_id: int) -> bool:
+        return self.edit_ids is None or doc_id in self.edit_ids
+
+
+NO_ACCESS = DocumentAccess(frozenset(), frozenset())
+FULL_ACCESS = DocumentAccess(None, None)
+
+
+def _version(user) -> int:
+    from documents.models import DocumentAccessStamp
+
+    return (
+        DocumentAccessStamp.objects.filter(user_id=user.pk).values_list("version", flat=True).first() or 0
+    )
+
+
+def invalidate(user_ids: Optional[Iterable[int]] = None) -> None:
+    """
+    Schimbă versiunea seturilor pentru userii afectați (None = toți tehnicienii și clienții).
+    Se scrie în aceeași tranzacție cu modificarea; celelalte procese citesc
+    versiunea din baza de date, deci nu mai folosesc seturile vechi din cache.
+    """
+    from documents.models import DocumentAccessStamp
+
+    if user_ids is None:
+        ids = set(
+            User.objects.filter(role__in=[User.Role.TEHNICIAN, User.Role.CLIENT]).values_list("pk", flat=True)
+        )
+    else:
+        ids = {pk for pk in user_ids if pk}
+    if not ids:
+        return
+
+    DocumentAccessStamp.objects.bulk_create(
+        [DocumentAccessStamp(user_id=pk) for pk in ids], ignore_conflicts=True,
+    )
+    DocumentAccessStamp.objects.filter(user_id__in=ids).update(version=secrets.randbits(62) + 1)
+
+
+def _compute(user) -> DocumentAccess:
+    from documents.models import Document
+
+    if user.role == User.Role.TEHNICIAN:
+        rows = Document.objects.filter(technicians=user).values_list("pk", "status")
+        view = frozenset(pk for pk, _ in rows)
+        edit = frozenset(pk for pk, status in rows if status in EDITABLE_STATUSES)
+        return DocumentAccess(view, edit)
+
+    if user.role == User.Role.CLIENT:
+        # client: doar FINAL și doar documentele lui
+        ids = Document.objects.filter(client_user=user, status=Document.Status.FINAL).values_list("pk", flat=True)
+        return DocumentAccess(frozenset(ids), frozenset())
+
+    return NO_ACCESS
+
+
+def get_access(user) -> DocumentAccess:
+    """
+    Seturile de acces, din memoria request-ului (atribut pe user) sau din cache.
+    Cheia din cache conține versiunea userului citită din DocumentAccessStamp.
+    """
+    if not user.is_authenticated:
+        return NO_ACCESS
+    if user.role in (User.Role.ADMIN, User.Role.MANAGER):
+        return FULL_ACCESS
+
+    # request.user trăiește un singur request
+    memo = getattr(user, "_vx_document_access", None)
+    if memo is not None:
+        return memo
+
+    # versiunea se citește înaintea seturilor: o modificare concurentă duce la o versiune nouă
+    key = f"documents:acl:{user.pk}:{_version(user)}"
+    access = cache.get(key)
+    if access is None:
+        access = _compute(user)
+        cache.set(key, access, CACHE_TTL)
+
+    user._vx_document_access = access
+    return access
+
+
+def filter_accessible(qs, user):
+    """
+    Restrânge un queryset de Document la ce poate vedea userul.
+    """
+    access = get_access(user)
+    if access.view_ids is None:
+        return qs
+    if len(access.view_ids) > MAX_INLINE_IDS:
+        # seturi foarte mari: lăsăm baza de date să facă join-ul
+        from documents.models import Document
+        if user.role == User.Role.TEHNICIAN:
+            return qs.filter(technicians=user)
+        return qs.filter(client_user=user, status=Document.Status.FINAL)
+    return qs.filter(pk__in=access.view_ids)
@@ -1,5 +1,9 @@
 from django.db import transaction
 
+from perf.sqlite import retry_on_locked
+
+
+@retry_on_locked
 def allocate_number(doc_type):
     """
     Alocă un număr unic (safe în concurență).
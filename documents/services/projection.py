@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import logging
+from datetime import datetime, time
+from decimal import Decimal, InvalidOperation
+from typing import Dict, List, Optional
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from documents.models import DocumentFieldValue, DocumentMaterial
+from documents.services.schema_registry import get_compiled
+from search.text import fold_text
+
+logger = logging.getLogger("documents.projection")
+
+TEXT_TYPES = {"text", "textarea", "select"}
+RANGE_TYPES = {"number", "date", "datetime"}
+# schimbare de schemă: reproiectăm în request doar tipurile cu puține documente
+RESYNC_INLINE_MAX = 500
+# sufix pentru "prefix range" (value >= q AND value < q + PREFIX_END)
+PREFIX_END = "\uffff"
+
+
+def _to_decimal(value) -> Optional[Decimal]:
+    if value in (None, ""):
+        return None
+    try:
+        return Decimal(str(value).replace(",", "."))
+    except (InvalidOperation, ValueError):
+        return None
+
+
+def _to_datetime(value) -> Optional[datetime]:
+    if not value:
+        return None
+    dt = parse_datetime(str(value))
+    if dt is None:
+        d = parse_date(str(value))
+        if d is None:
+            return None
+        dt = datetime.combine(d, time.min)
+    if timezone.is_naive(dt):
+        dt = timezone.make_aware(dt)
+    return dt
+
+
+def searchable_fields(compiled) -> List[dict]:
+    """
+    Câmpurile din schemă marcate cu "searchable": true (fără tabele).
+    """
+    return [
+        f for f in compiled.fields
+        if f.get("searchable") and f.get("type", "text") != "table"
+    ]
+
+
+def _field_value_row(doc, f: dict, raw, model=DocumentFieldValue) -> Optional[DocumentFieldValue]:
+    # model: clasa istorică în migrări (0008_backfill_projection)
+    ftype = f.get("type", "text")
+    row = model(document=doc, key=f["name"])
+
+    if ftype == "number":
+        row.value_num = _to_decimal(raw)
+        row.value_text = fold_text(raw)[:255]
+    elif ftype in {"date", "datetime"}:
+        row.value_date = _to_datetime(raw)
+        row.value_text = fold_text(raw)[:255]
+    else:
+        row.value_text = fold_text(raw)[:255]
+
+    if not row.value_text and row.value_num is None and row.value_date is None:
+        return None
+    return row
+
+
+def _material_rows(doc, materials, model=DocumentMaterial) -> List[DocumentMaterial]:
+    rows = []
+    for i, m in enumerate(materials or []):
+        if not isinstance(m, dict):
+            continue
+        name = str(m.get("name") or "").strip()
+        if not name:
+            continue
+        rows.append(model(
+            document=doc,
+            position=i,
+            name=name[:200],
+            name_norm=fold_text(name)[:200],
+            qty=_to_decimal(m.get("qty")),
+            unit=str(m.get("unit") or "")[:30],
+            notes=str(m.get("notes") or "")[:200],
+        ))
+    return rows
+
+
+def sync_document_projection(doc, compiled=None) -> None:
+    """
+    Rescrie proiecția (câmpuri searchable + materiale) pentru un document.
+    Câmpurile indexate vin din schema curentă a tipului (nu din versiunea
+    fixată pe document), ca filtrele din listă să acopere și documentele vechi.
+    """
+    compiled = compiled or get_compiled(doc.doc_type)
+    data = doc.data_json or {}
+
+    values = []
+    for f in searchable_fields(compiled):
+        row = _field_value_row(doc, f, data.get(f["name"]))
+        if row is not None:
+            values.append(row)
+
+    materials = _material_rows(doc, data.get("materials"))
+
+    with transaction.atomic():
+        DocumentFieldValue.objects.filter(document=doc).delete()
+        DocumentMaterial.objects.filter(document=doc).delete()
+        DocumentFieldValue.objects.bulk_create(values)
+        DocumentMaterial.objects.bulk_create(materials)
+
+
+def searchable_names(schema_json: dict) -> set:
+    return {
+        f.get("name") for f in (schema_json or {}).get("fields", [])
+        if isinstance(f, dict) and f.get("searchable")
+    }
+
+
+def resync_doc_type(doc_type) -> int:
+    """
+    Reface proiecția pentru toate documentele unui tip (ex: s-a schimbat
+    setul de câmpuri searchable în schemă).
+    """
+    total = 0
+    compiled = get_compiled(doc_type)
+    for doc in doc_type.documents.order_by("pk").iterator(chunk_size=500):
+        doc.doc_type = doc_type
+        sync_document_projection(doc, compiled)
+        total += 1
+    return total
+
+
+def schedule_resync(doc_type) -> None:
+    """
+    Reproiectarea după o schimbare de schemă, amânată după commit.
+    Peste RESYNC_INLINE_MAX documente nu se face în request-ul din admin:
+    rămâne pentru rebuild_document_projection --type <code>.
+    """
+    def _run():
+        count = doc_type.documents.count()
+        if count > RESYNC_INLINE_MAX:
+            logger.warning(
+                "Schema pentru %s s-a schimbat: %d documente de reproiectat. "
+                "Rulează: python manage.py rebuild_document_projection --type %s",
+                doc_type.code, count, doc_type.code,
+            )
+            return
+        resync_doc_type(doc_type)
+
+    transaction.on_commit(_run)
+
+
+def _prefix_q(field: str, value: str) -> Q:
+    # interval pe index în loc de LIKE (SQLite nu folosește indexul pentru LIKE/icontains)
+    return Q(**{f"{field}__gte": value, f"{field}__lt": value + PREFIX_END})
+
+
+def filter_by_projection(qs, field_filters: Dict[str, dict], material: str = ""):
+    """
+    field_filters: {"location": {"type": "text", "value": "cluj"},
+                    "planned_start": {"type": "datetime", "from": ..., "to": ...}}
+    Filtrele text sunt pe prefix (după normalizare), cele numerice/dată pe interval.
+    """
+    for key, spec in field_filters.items():
+        ftype = spec.get("type", "text")
+        sub = DocumentFieldValue.objects.filter(key=key)
+
+        if ftype in TEXT_TYPES:
+            value = fold_text(spec.get("value"))
+            if not value:
+                continue
+            sub = sub.filter(_prefix_q("value_text", value))
+        elif ftype == "number":
+            lo, hi = _to_decimal(spec.get("from")), _to_decimal(spec.get("to"))
+            if lo is None and hi is None:
+                continue
+            if lo is not None:
+                sub = sub.filter(value_num__gte=lo)
+            if hi is not None:
+                sub = sub.filter(value_num__lte=hi)
+        else:
+            lo, hi = _to_datetime(spec.get("from")), _to_datetime(spec.get("to"))
+            if lo is None and hi is None:
+                continue
+            if lo is not None:
+                sub = sub.filter(value_date__gte=lo)
+            if hi is not None:
+                # "până la" o dată = inclusiv toată ziua
+                if ftype == "date" or len(str(spec.get("to"))) <= 10:
+                    hi = hi.replace(hour=23, minute=59, second=59)
+                sub = sub.filter(value_date__lte=hi)
+
+        qs = qs.filter(pk__in=sub.values("document_id"))
+
+    material = fold_text(material)
+    if material:
+        qs = qs.filter(pk__in=DocumentMaterial.objects.filter(_prefix_q("name_norm", material)).values("document_id"))
+
+    return qs
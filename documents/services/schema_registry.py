@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from django import forms
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from documents.forms_dynamic import build_document_form
+
+FIELD_TYPES = {"text", "textarea", "select", "number", "date", "datetime", "table"}
+FIELD_NAME_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+@dataclass(frozen=True)
+class CompiledSchema:
+    """
+    Schema validată + clasa de form generată (o singură dată per hash).
+    """
+    doc_type_id: int
+    schema_hash: str
+    fields: Tuple[dict, ...]
+    form_class: type[forms.Form]
+    table_fields: Tuple[str, ...] = field(default_factory=tuple)
+
+    def field_names(self) -> List[str]:
+        return [f["name"] for f in self.fields]
+
+
+# (doc_type_id, schema_hash) -> CompiledSchema (per proces)
+_REGISTRY: Dict[Tuple[int, str], CompiledSchema] = {}
+_LOCK = threading.Lock()
+
+
+def schema_hash(schema_json: dict) -> str:
+    """
+    Hash stabil (independent de ordinea cheilor) pentru schema_json.
+    """
+    raw = json.dumps(schema_json or {}, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def validate_schema(schema_json) -> List[dict]:
+    """
+    Validează structura schema_json și returnează lista de câmpuri.
+    Ridică ValidationError cu toate problemele găsite.
+    """
+    if not isinstance(schema_json, dict):
+        raise ValidationError({"schema_json": "Schema trebuie să fie un obiect JSON."})
+
+    raw_fields = schema_json.get("fields", [])
+    if not isinstance(raw_fields, list):
+        raise ValidationError({"schema_json": "Cheia 'fields' trebuie să fie o listă."})
+
+    errors = []
+    seen = set()
+    for i, f in enumerate(raw_fields):
+        if not isinstance(f, dict):
+            errors.append(f"Câmpul #{i + 1} nu este un obiect.")
+            continue
+
+        name = f.get("name")
+        if not isinstance(name, str) or not FIELD_NAME_RE.match(name):
+            errors.append(f"Câmpul #{i + 1}: 'name' lipsește sau nu este un identificator valid.")
+        elif name in seen:
+            errors.append(f"Câmpul '{name}' apare de mai multe ori.")
+        else:
+            seen.add(name)
+
+        ftype = f.get("type", "text")
+        if ftype not in FIELD_TYPES:
+            errors.append(f"Câmpul '{name}': tip necunoscut '{ftype}'.")
+
+        if ftype == "select" and not isinstance(f.get("choices") or [], list):
+            errors.append(f"Câmpul '{name}': 'choices' trebuie să fie o listă.")
+
+        if not isinstance(f.get("searchable", False), bool):
+            errors.append(f"Câmpul '{name}': 'searchable' trebuie să fie true/false.")
+
+    if errors:
+        raise ValidationError({"schema_json": errors})
+
+    return raw_fields
+
+
+def _compile(doc_type_id: int, schema_json: dict, digest: str) -> CompiledSchema:
+    fields = validate_schema(schema_json)
+    return CompiledSchema(
+        doc_type_id=doc_type_id,
+        schema_hash=digest,
+        fields=tuple(fields),
+        form_class=build_document_form(schema_json),
+        table_fields=tuple(f["name"] for f in fields if f.get("type") == "table"),
+    )
+
+
+def get_compiled(doc_type, schema_json: Optional[dict] = None, digest: Optional[str] = None) -> CompiledSchema:
+    """
+    Returnează schema compilată pentru doc_type (sau pentru un schema_json
+    explicit, ex: o versiune veche, cu hash-ul ei deja calculat). Cheia de cache
+    include hash-ul schemei, deci o schemă modificată în alt proces nu poate
+    servi o clasă veche. Ridică ValidationError dacă schema e invalidă.
+    """
+    if schema_json is None:
+        schema_json = doc_type.schema_json or {}
+
+    digest = digest or schema_hash(schema_json)
+    key = (doc_type.pk, digest)
+
+    compiled = _REGISTRY.get(key)
+    if compiled is None:
+        compiled = _compile(doc_type.pk, schema_json, digest)
+        with _LOCK:
+            _REGISTRY[key] = compiled
+    return compiled
+
+
+def compiled_for_document(doc) -> CompiledSchema:
+    """
+    Schema cu care a fost scris documentul (dacă e fixată), altfel schema curentă.
+    """
+    if doc.schema_version_id:
+        # hash-ul versiunii e salvat: fără re-serializarea schemei la fiecare request
+        version = doc.schema_version
+        return get_compiled(doc.doc_type, version.schema_json or {}, version.schema_hash)
+    return get_compiled(doc.doc_type)
+
+
+def invalidate(doc_type_pk: int) -> None:
+    """
+    Scoate din registry toate intrările pentru un DocumentType.
+    """
+    with _LOCK:
+        for key in [k for k in _REGISTRY if k[0] == doc_type_pk]:
+            del _REGISTRY[key]
+
+
+def ensure_schema_version(doc_type):
+    """
+    Returnează versiunea corespunzătoare schemei curente; o creează dacă
+    schema s-a schimbat față de ultima versiune.
+    """
+    from documents.models import DocumentSchemaVersion
+
+    schema_json = doc_type.schema_json or {}
+    digest = schema_hash(schema_json)
+
+    with transaction.atomic():
+        latest = (
+            DocumentSchemaVersion.objects
+            .select_for_update()
+            .filter(doc_type=doc_type)
+            .order_by("-version")
+            .first()
+        )
+        if latest and latest.schema_hash == digest:
+            return latest
+
+        return DocumentSchemaVersion.objects.create(
+            doc_type=doc_type,
+            version=(latest.version + 1) if latest else 1,
+            schema_hash=digest,
+            schema_json=schema_json,
+        )
@@ -0,0 +1,93 @@
+from django.db.models.signals import m2m_changed, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from .models import Document, DocumentType
+from .services import access, schema_registry
+from .services.projection import schedule_resync, searchable_names, sync_document_projection
+
+
+@receiver(post_save, sender=DocumentType)
+def documenttype_schema_changed(sender, instance, update_fields=None, **kwargs):
+    # ex: allocate_number salvează doar next_number
+    if update_fields and "schema_json" not in update_fields:
+        return
+
+    # schema nouă => versiune nouă + scoatem clasele compilate vechi din registry
+    previous = instance.schema_versions.order_by("-version").first()
+
+    schema_registry.invalidate(instance.pk)
+    version = schema_registry.ensure_schema_version(instance)
+
+    # s-au schimbat câmpurile indexate => documentele existente se reproiectează (după commit)
+    if previous and previous.pk != version.pk:
+        if searchable_names(previous.schema_json) != searchable_names(version.schema_json):
+            schedule_resync(instance)
+
+
+@receiver(post_save, sender=Document)
+def document_data_changed(sender, instance, created, update_fields=None, **kwargs):
+    # proiecția se reface doar când se schimbă data_json
+    if update_fields and "data_json" not in update_fields:
+        return
+    if created and not instance.data_json:
+        return
+    sync_document_projection(instance)
+
+
+# ----------------------------
+# Cache permisiuni (services.access)
+# ----------------------------
+ACCESS_FIELDS = {"status", "client_user", "client_user_id"}
+
+
+def _touches_access(update_fields) -> bool:
+    return not update_fields or bool(ACCESS_FIELDS.intersection(update_fields))
+
+
+@receiver(pre_save, sender=Document)
+def document_access_before(sender, instance, update_fields=None, raw=False, **kwargs):
+    # valorile vechi: clientul anterior pierde accesul, iar statusul decide editarea
+    if raw or not instance.pk or not _touches_access(update_fields):
+        instance._vx_access_before = None
+        return
+    instance._vx_access_before = (
+        Document.objects.filter(pk=instance.pk).values_list("client_user_id", "status").first()
+    )
+
+
+@receiver(post_save, sender=Document)
+def document_access_changed(sender, instance, created, update_fields=None, raw=False, **kwargs):
+    if raw or not _touches_access(update_fields):
+        return
+    if created:
+        access.invalidate([instance.client_user_id])
+        return
+
+    before = getattr(instance, "_vx_access_before", None)
+    old_client, old_status = before or (None, None)
+    if before and old_client == instance.client_user_id and old_status == instance.status:
+        return
+
+    affected = {old_client, instance.client_user_id}
+    if not before or old_status != instance.status:
+        # tehnicienii: se schimbă setul de editare
+        affected.update(instance.technicians.values_list("pk", flat=True))
+    access.invalidate(affected)
+
+
+@receiver(pre_delete, sender=Document)
+def document_deleted(sender, instance, **kwargs):
+    # înainte de ștergere: legăturile cu tehnicienii încă există
+    access.invalidate({instance.client_user_id, *instance.technicians.values_list("pk", flat=True)})
+
+
+@receiver(m2m_changed, sender=Document.technicians.through)
+def document_technicians_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if reverse:
+        # user.assigned_documents.add(...): se schimbă doar setul acelui user
+        if action in {"post_add", "post_remove", "post_clear"}:
+            access.invalidate([instance.pk])
+    elif action in {"post_add", "post_remove"}:
+        access.invalidate(pk_set)
+    elif action == "pre_clear":
+        access.invalidate(instance.technicians.values_list("pk", flat=True))
@@ -1,7 +1,9 @@
 from urllib.parse import urlencode
 
+from django import forms
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
+from django.core.exceptions import ValidationError
 from django.core.paginator import Paginator
 from django.db.models import Q
 from django.http import Http404
@@ -11,27 +13,42 @@ import json
 from django.core.serializers.json import DjangoJSONEncoder
 
 from accounts.models import User
+from perf.queries import query_budget
+from search.api import is_indexed, order_by_ids, search_ids
 from .forms import DocumentCreateForm, DocumentDataForm
-from .forms_dynamic import build_document_form, MaterialFormSet
+from .forms_dynamic import MaterialFormSet
 from .models import Document, DocumentType
 from .permissions import is_admin_or_manager, is_technician, can_close_document, can_edit_document, can_view_document
+from .services.access import filter_accessible, get_access
 from .services.numbering import allocate_number
+from .services.projection import RANGE_TYPES, filter_by_projection, searchable_fields
+from .services.schema_registry import compiled_for_document, ensure_schema_version, get_compiled
+
+
+def _list_search_fields(doc_types, f_type: str):
+    """
+    Câmpurile "searchable" afișate ca filtre: ale tipului selectat sau
+    reuniunea lor pe toate tipurile active (după nume).
+    """
+    out = {}
+    for dt in doc_types:
+        if f_type and dt.code != f_type:
+            continue
+        for f in searchable_fields(get_compiled(dt)):
+            out.setdefault(f["name"], f)
+    return list(out.values())
 
 
 @login_required
+@query_budget(15)
 def document_list(request):
     u = request.user
 
     # ---------------------------
     # Base queryset pe rol
     # ---------------------------
-    if u.role in [User.Role.ADMIN, User.Role.MANAGER]:
-        qs = Document.objects.select_related("doc_type", "client_user", "owner").prefetch_related("technicians")
-    elif u.role == User.Role.TEHNICIAN:
-        qs = Document.objects.filter(technicians=u).select_related("doc_type", "client_user", "owner").prefetch_related("technicians")
-    else:
-        # client: doar FINAL
-        qs = Document.objects.filter(client_user=u, status=Document.Status.FINAL).select_related("doc_type", "client_user", "owner")
+    # admin/manager: tot; tehnician: asignate; client: doar FINAL (services.access)
+    qs = filter_accessible(Document.objects.select_related("doc_type", "client_user", "owner"), u)
 
     # ---------------------------
     # Filtre
@@ -42,14 +59,25 @@ def document_list(request):
     per_page = int(request.GET.get("per_page") or 20)
     page = int(request.GET.get("page") or 1)
 
+    # căutare globală prin indexul full-text (include și textul din data_json);
+    # fallback pe icontains cât timp indexul nu e construit (search_reindex)
+    hit_ids = None
     if q:
-        qs = qs.filter(
-            Q(number__icontains=q) |
-            Q(doc_type__name__icontains=q) |
-            Q(client_user__email__icontains=q) |
-            Q(client_user__company_name__icontains=q) |
-            Q(owner__email__icontains=q)
-        )
+        if is_indexed("document"):
+            # dreptul de acces intră în căutare (înainte de limită), altfel documentele
+            # userului pot cădea sub primele DEFAULT_LIMIT rezultate globale
+            within = None if get_access(u).view_ids is None else filter_accessible(Document.objects.all(), u)
+            # căutare interactivă: pe baza principală (un document abia salvat apare imediat)
+            hit_ids = search_ids("document", q, within=within)
+            qs = qs.filter(pk__in=hit_ids)
+        else:
+            qs = qs.filter(
+                Q(number__icontains=q) |
+                Q(doc_type__name__uicontains=q) |
+                Q(client_user__email__icontains=q) |
+                Q(client_user__company_name__uicontains=q) |
+                Q(owner__email__icontains=q)
+            )
 
     if f_type:
         qs = qs.filter(doc_type__code=f_type)
@@ -57,10 +85,36 @@ def document_list(request):
     if f_status:
         qs = qs.filter(status=f_status)
 
+    # ---------------------------
+    # Filtre pe câmpuri din data_json (proiecție indexată)
+    # ---------------------------
+    doc_types = DocumentType.objects.filter(is_active=True).order_by("name")
+    search_fields = _list_search_fields(doc_types, f_type)
+
+    field_filters = {}
+    field_filter_rows = []
+    for f in search_fields:
+        name = f["name"]
+        ftype = f.get("type", "text")
+        if ftype in RANGE_TYPES:
+            spec = {
+                "type": ftype,
+                "from": (request.GET.get(f"fld_{name}_from") or "").strip(),
+                "to": (request.GET.get(f"fld_{name}_to") or "").strip(),
+            }
+        else:
+            spec = {"type": ftype, "value": (request.GET.get(f"fld_{name}") or "").strip()}
+        field_filters[name] = spec
+        field_filter_rows.append({"field": f, "is_range": ftype in RANGE_TYPES, **spec})
+
+    f_material = (request.GET.get("material") or "").strip()
+    qs = filter_by_projection(qs, field_filters, material=f_material)
+
     # ---------------------------
     # Sort
     # ---------------------------
-    sort = request.GET.get("sort") or "created_at"
+    # cu căutare și fără sortare explicită => ordinea de relevanță
+    sort = request.GET.get("sort") or ("rank" if hit_ids else "created_at")
     direction = request.GET.get("dir") or "desc"
 
     sort_map = {
@@ -75,7 +129,10 @@ def document_list(request):
     if direction == "desc":
         order = "-" + order
 
-    qs = qs.order_by(order)
+    if sort == "rank":
+        qs = order_by_ids(qs, hit_ids)
+    else:
+        qs = qs.order_by(order)
 
     # ---------------------------
     # Pagination + keep_qs
@@ -83,12 +140,15 @@ def document_list(request):
     paginator = Paginator(qs, per_page)
     page_obj = paginator.get_page(page)
 
+    # butonul "Edit" pe rând: lookup în memorie, nu d.technicians.all per rând
+    access = get_access(u)
+    for d in page_obj.object_list:
+        d.user_can_edit = access.can_edit(d.pk)
+
     keep = request.GET.copy()
     keep.pop("page", None)
     keep_qs = keep.urlencode()
 
-    doc_types = DocumentType.objects.filter(is_active=True).order_by("name")
-
     return render(request, "documents/list.html", {
         "page_obj": page_obj,
         "q": q,
@@ -100,6 +160,8 @@ def document_list(request):
         "sort": sort,
         "dir": direction,
         "doc_types": doc_types,
+        "field_filter_rows": field_filter_rows,
+        "f_material": f_material,
     })
 
 
@@ -140,6 +202,7 @@ def document_create(request):
             if not doc.owner:
                 doc.owner = request.user
             doc.number = allocate_number(doc.doc_type)
+            doc.schema_version = ensure_schema_version(doc.doc_type)
             doc.save()
             form.save_m2m()
             messages.success(request, f"Document creat: {doc.number}")
@@ -153,13 +216,19 @@ def document_create(request):
 
 @login_required
 def document_edit(request, pk: int):
-    doc = get_object_or_404(Document.objects.select_related("doc_type"), pk=pk)
+    doc = get_object_or_404(Document.objects.select_related("doc_type", "schema_version"), pk=pk)
 
     if not can_edit_document(request.user, doc):
         raise Http404()
 
-    schema = doc.doc_type.schema_json or {}
-    DynamicForm = build_document_form(schema)
+    # clasa de form vine din registry (compilată o dată per versiune de schemă)
+    schema_errors = []
+    try:
+        DynamicForm = compiled_for_document(doc).form_class
+    except ValidationError as exc:
+        # schemă scrisă ocolind validarea (shell, fixture): eroare în pagină, nu 500
+        DynamicForm = forms.Form
+        schema_errors = exc.messages
 
     # date existente
     data = doc.data_json or {}
@@ -173,7 +242,7 @@ def document_edit(request, pk: int):
         for f in materials_fs:
             f.add_bootstrap()
 
-        if form.is_valid() and materials_fs.is_valid():
+        if not schema_errors and form.is_valid() and materials_fs.is_valid():
             # 1) datele din form (pot conține datetime)
             cleaned = form.cleaned_data
 
@@ -196,9 +265,13 @@ def document_edit(request, pk: int):
             # 3) convertim totul în JSON-safe (datetime/date/Decimal etc.)
             cleaned_safe = json.loads(json.dumps(cleaned, cls=DjangoJSONEncoder))
 
-            # 4) salvăm
+            # 4) salvăm (documentele vechi, fără versiune, se fixează pe schema curentă)
             doc.data_json = cleaned_safe
-            doc.save(update_fields=["data_json"])
+            update_fields = ["data_json"]
+            if not doc.schema_version_id:
+                doc.schema_version = ensure_schema_version(doc.doc_type)
+                update_fields.append("schema_version")
+            doc.save(update_fields=update_fields)
 
             messages.success(request, "Document salvat.")
             return redirect("documents:detail", pk=doc.pk)
@@ -211,13 +284,10 @@ def document_edit(request, pk: int):
         for f in materials_fs:
             f.add_bootstrap()
 
-    # bootstrap classes pentru câmpuri simple
-    for name, field in form.fields.items():
-        cls = "form-control"
-        if field.widget.__class__.__name__ in ["Select", "SelectMultiple"]:
-            cls = "form-select"
-        # mic în portal
-        field.widget.attrs.setdefault("class", cls + " form-control-sm")
+    if schema_errors:
+        # form legat (fără date), ca erorile să apară și la GET; nu s-a salvat nimic
+        form = forms.Form(data={})
+        form.add_error(None, [f"Schema tipului „{doc.doc_type.name}” este invalidă: {m}" for m in schema_errors])
 
     return render(request, "documents/edit_work_order.html", {
         "doc": doc,
@@ -0,0 +1,20 @@
+from django.contrib import admin
+
+from website.admin_site import vertix_admin_site
+from .models import Notification
+
+
+@admin.register(Notification, site=vertix_admin_site)
+class NotificationAdmin(admin.ModelAdmin):
+    list_display = ("kind", "email", "subject", "status", "attempts", "created_at", "sent_at")
+    list_filter = ("kind", "status")
+    search_fields = ("email", "subject")
+    date_hierarchy = "created_at"
+    readonly_fields = (
+        "kind", "recipient", "email", "subject", "body", "url", "status",
+        "available_at", "attempts", "last_error", "created_at", "sent_at",
+    )
+    list_select_related = ("recipient",)
+
+    def has_add_permission(self, request):
+        return False
@@ -0,0 +1,31 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from notifications.worker import drain
+
+
+class Command(BaseCommand):
+    help = "Trimite notificările din outbox (digest per destinatar, reîncercare cu backoff)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=100)
+        parser.add_argument("--every", type=int, default=0, metavar="SECONDS", help="Rulează în buclă.")
+
+    def handle(self, *args, **options):
+        while True:
+            # golește tot ce e scadent acum, lot cu lot
+            while True:
+                result = drain(options["batch_size"])
+                if result.emails or result.retried or result.failed:
+                    self.stdout.write(
+                        f"{result.emails} email(uri), {result.sent} notificări trimise, "
+                        f"{result.retried} reprogramate, {result.failed} eșuate."
+                    )
+                if not (result.sent or result.retried or result.failed):
+                    break
+            if not options["every"]:
+                return
+            close_old_connections()
+            time.sleep(options["every"])
@@ -0,0 +1,48 @@
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+
+
+class Notification(models.Model):
+    """
+    Outbox: un rând per (eveniment, destinatar), scris în aceeași tranzacție cu
+    evenimentul. Trimis ulterior de worker (python manage.py notifications_worker),
+    grupat pe destinatar într-un singur email (digest).
+    """
+
+    class Kind(models.TextChoices):
+        MENTION = "MENTION", "Mențiune în chat"
+        PUBLIC_REQUEST = "PUBLIC_REQUEST", "Cerere nouă"
+        REGISTRATION = "REGISTRATION", "Cont nou"
+
+    class Status(models.TextChoices):
+        PENDING = "PENDING", "În așteptare"
+        SENT = "SENT", "Trimis"
+        FAILED = "FAILED", "Eșuat"
+
+    kind = models.CharField(max_length=20, choices=Kind.choices)
+    recipient = models.ForeignKey(
+        settings.AUTH_USER_MODEL, null=True, blank=True,
+        on_delete=models.CASCADE, related_name="notifications"
+    )
+    email = models.EmailField()  # adresa de la momentul evenimentului
+    subject = models.CharField(max_length=200)
+    body = models.TextField(blank=True)
+    url = models.CharField(max_length=400, blank=True)  # cale relativă; SITE_URL se adaugă la trimitere
+
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.PENDING)
+    # următoarea încercare (fereastra de digest, lease-ul worker-ului sau backoff după eroare)
+    available_at = models.DateTimeField(default=timezone.now)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["status", "available_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.get_kind_display()} -> {self.email} ({self.status})"
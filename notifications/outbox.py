@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import Iterable, List
+
+from django.conf import settings
+from django.urls import reverse
+from django.utils import timezone, translation
+
+from accounts.models import User
+
+from .models import Notification
+
+# ============================================================
+# Scriere în outbox (în tranzacția evenimentului)
+# ============================================================
+
+
+def digest_delay() -> timedelta:
+    # evenimentele din fereastra asta ajung în același email
+    return timedelta(seconds=int(getattr(settings, "NOTIFICATIONS_DIGEST_DELAY", 60)))
+
+
+def staff_recipients():
+    return User.objects.filter(
+        is_active=True, role__in=[User.Role.ADMIN, User.Role.MANAGER]
+    ).exclude(email="")
+
+
+def _url(name: str, *args) -> str:
+    # link-urile din email sunt în limba implicită, indiferent de cererea curentă
+    with translation.override(settings.LANGUAGE_CODE):
+        return reverse(name, args=args)
+
+
+def enqueue(kind: str, users: Iterable, subject: str, body: str = "", url: str = "") -> List[Notification]:
+    """
+    Adaugă câte un rând per destinatar. Apelantul îl pune în același
+    transaction.atomic() cu evenimentul: fără eveniment nu există notificare (și invers).
+    """
+    available_at = timezone.now() + digest_delay()
+    rows = [
+        Notification(
+            kind=kind,
+            recipient=u,
+            email=u.email,
+            subject=subject[:200],
+            body=body,
+            url=url[:400],
+            available_at=available_at,
+        )
+        for u in users
+        if getattr(u, "email", "")
+    ]
+    return Notification.objects.bulk_create(rows) if rows else []
+
+
+# ============================================================
+# Evenimente
+# ============================================================
+
+def notify_mention(message, users) -> List[Notification]:
+    from portal.chat_permissions import is_staff_user
+    from portal.models_chat import TicketMessage
+
+    recipients = [u for u in users if u.pk != message.author_id]
+    # mesajele interne nu sunt vizibile clienților: nici notificarea
+    if message.visibility == TicketMessage.Visibility.INTERNAL:
+        recipients = [u for u in recipients if is_staff_user(u)]
+    if not recipients:
+        return []
+
+    model = message.content_type.model
+    view = {"ticket": "ticket_edit", "publicrequest": "public_request_edit"}.get(model)
+    author = getattr(message.author, "email", "") or "cineva"
+    text = (message.body or "").strip()
+    body = f"{author}: {text[:500]}" if text else f"{author} a atașat fișiere."
+
+    out = []
+    for staff in (True, False):
+        group = [u for u in recipients if is_staff_user(u) == staff]
+        # clienții nu au acces la paginile de editare din portal
+        url = _url(view, message.object_id) if staff and view else _url("portal_dashboard")
+        out += enqueue(
+            Notification.Kind.MENTION, group,
+            subject=f"Ai fost menționat în {message.target_label}", body=body, url=url,
+        )
+    return out
+
+
+def notify_public_request(req) -> List[Notification]:
+    who = req.company or req.email
+    return enqueue(
+        Notification.Kind.PUBLIC_REQUEST, staff_recipients(),
+        subject=f"Cerere nouă de la {who}",
+        body=(req.description or "").strip()[:500],
+        url=_url("public_request_edit", req.pk),
+    )
+
+
+def notify_registration(user) -> List[Notification]:
+    company = (user.company_name or "").strip()
+    return enqueue(
+        Notification.Kind.REGISTRATION, staff_recipients(),
+        subject=f"Cont nou în așteptarea aprobării: {user.email}",
+        body=f"{user.email}" + (f" — {company}" if company else ""),
+        url=_url("vertix_admin:accounts_user_change", user.pk),
+    )
@@ -0,0 +1,111 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.core import mail
+from django.core.mail.backends import locmem
+from django.db import transaction
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import User
+from portal.models import PublicRequest, Ticket
+from portal.models_chat import TicketMessage
+
+from . import worker
+from .models import Notification
+from .outbox import enqueue, notify_public_request
+
+
+class OutboxTests(TestCase):
+    databases = {"default", "analytics"}
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.manager = User.objects.create_user("manager@example.com", "x", role=User.Role.MANAGER, is_active=True)
+        cls.admin = User.objects.create_user("admin@example.com", "x", role=User.Role.ADMIN, is_active=True)
+        cls.owner = User.objects.create_user("owner@example.com", "x", is_active=True)
+        cls.outsider = User.objects.create_user("outsider@example.com", "x", is_active=True)
+        cls.ticket = Ticket.objects.create(created_by=cls.owner, subject="Tichet", message="x")
+
+    def post(self, user, body, **data):
+        self.client.force_login(user)
+        return self.client.post(reverse("chat_post", args=["ticket", self.ticket.pk]), {"body": body, **data})
+
+    def recipients(self):
+        return sorted(Notification.objects.values_list("email", flat=True))
+
+    def test_rolled_back_event_leaves_no_notification(self):
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            req = PublicRequest.objects.create(email="c@example.com", description="x")
+            self.assertEqual(len(notify_public_request(req)), 2)
+            raise RuntimeError
+        self.assertFalse(PublicRequest.objects.exists())
+        self.assertFalse(Notification.objects.exists())
+
+    def test_mention_is_written_with_the_message(self):
+        self.post(self.owner, "@manager@example.com te rog verifică")
+        message = TicketMessage.objects.get()
+        notification = Notification.objects.get()
+        self.assertEqual((notification.kind, notification.recipient), (Notification.Kind.MENTION, self.manager))
+        self.assertIn(message.body, notification.body)
+
+    def test_internal_message_does_not_notify_the_client(self):
+        self.post(
+            self.manager, "@owner@example.com @admin@example.com intern",
+            visibility=TicketMessage.Visibility.INTERNAL,
+        )
+        self.assertEqual(self.recipients(), ["admin@example.com"])
+
+    def test_only_thread_participants_are_notified(self):
+        self.post(self.manager, "@owner@example.com @outsider@example.com salut")
+        self.assertEqual(self.recipients(), ["owner@example.com"])
+
+
+@override_settings(
+    EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend",
+    NOTIFICATIONS_MAX_ATTEMPTS=3,
+)
+class WorkerTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.ana = User.objects.create_user("ana@example.com", "x", is_active=True)
+        cls.dan = User.objects.create_user("dan@example.com", "x", is_active=True)
+
+    def due(self):
+        # după fereastra de digest
+        return timezone.now() + timedelta(hours=1)
+
+    def test_one_digest_per_recipient(self):
+        for i in range(3):
+            enqueue(Notification.Kind.MENTION, [self.ana], subject=f"Mențiune {i}")
+        enqueue(Notification.Kind.MENTION, [self.dan], subject="Mențiune")
+
+        self.assertEqual(worker.drain(now=timezone.now()).emails, 0)  # încă în fereastră
+        result = worker.drain(now=self.due())
+        self.assertEqual((result.emails, result.sent), (2, 4))
+        subjects = {m.to[0]: m.subject for m in mail.outbox}
+        self.assertEqual(subjects, {"ana@example.com": "3 notificări noi", "dan@example.com": "Mențiune"})
+        self.assertFalse(Notification.objects.exclude(status=Notification.Status.SENT).exists())
+
+    def test_failed_send_backs_off_then_fails(self):
+        with override_settings(NOTIFICATIONS_DIGEST_DELAY=0):
+            enqueue(Notification.Kind.MENTION, [self.ana], subject="Mențiune")
+        now = timezone.now()
+        with mock.patch.object(locmem.EmailBackend, "send_messages", side_effect=OSError("smtp")), \
+                self.assertLogs("notifications", "WARNING"):
+            for attempt in (1, 2):
+                self.assertEqual(worker.drain(now=now).retried, 1)
+                row = Notification.objects.get()
+                self.assertEqual((row.status, row.attempts), (Notification.Status.PENDING, attempt))
+                self.assertAlmostEqual(
+                    row.available_at - timezone.now(), worker.retry_delay(attempt), delta=timedelta(seconds=5),
+                )
+                self.assertEqual(worker.drain(now=now).retried, 0)  # nu înainte de backoff
+                now = row.available_at
+
+            self.assertEqual(worker.drain(now=now).failed, 1)
+        row = Notification.objects.get()
+        self.assertEqual((row.status, row.attempts, row.last_error), (Notification.Status.FAILED, 3, "OSError: smtp"))
+        self.assertEqual(worker.drain(now=now + timedelta(days=1)).failed, 0)
+        self.assertEqual(mail.outbox, [])
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import logging
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import connections, router, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Notification
+
+logger = logging.getLogger("notifications")
+
+# ============================================================
+# Worker: outbox -> email (digest per destinatar)
+# ============================================================
+
+# cât timp un lot revendicat e "al" worker-ului; după (ex. proces oprit) se reia
+LEASE = timedelta(minutes=5)
+
+
+@dataclass
+class DrainResult:
+    emails: int = 0
+    sent: int = 0
+    retried: int = 0
+    failed: int = 0
+
+
+def max_attempts() -> int:
+    return int(getattr(settings, "NOTIFICATIONS_MAX_ATTEMPTS", 8))
+
+
+def retry_delay(attempt: int) -> timedelta:
+    # exponențial: 1, 2, 4 ... minute, plafonat (implicit 6 ore)
+    base = int(getattr(settings, "NOTIFICATIONS_RETRY_BASE", 60))
+    cap = int(getattr(settings, "NOTIFICATIONS_RETRY_CAP", 6 * 3600))
+    return timedelta(seconds=min(cap, base * 2 ** max(0, attempt - 1)))
+
+
+def claim(batch_size: int, now=None) -> List[Notification]:
+    """
+    Revendică notificările scadente: attempts + 1 și available_at mutat după lease,
+    ca alt worker să nu le ia. Rândurile aceluiași destinatar vin împreună (un singur email).
+    """
+    now = now or timezone.now()
+    alias = router.db_for_write(Notification)
+    ready = Notification.objects.using(alias).filter(status=Notification.Status.PENDING, available_at__lte=now)
+    if connections[alias].features.has_select_for_update_skip_locked:
+        # Postgres: workerii paraleli sar peste rândurile deja blocate; în SQLite BEGIN IMMEDIATE serializează
+        ready = ready.select_for_update(skip_locked=True)
+
+    with transaction.atomic(using=alias):
+        rows = list(ready.order_by("available_at", "pk")[:batch_size])
+        if not rows:
+            return []
+        emails = {r.email for r in rows}
+        rows += list(ready.filter(email__in=emails).exclude(pk__in=[r.pk for r in rows]).order_by("pk"))
+        Notification.objects.using(alias).filter(pk__in=[r.pk for r in rows]).update(
+            available_at=now + LEASE, attempts=F("attempts") + 1
+        )
+    for r in rows:
+        r.attempts += 1
+    return rows
+
+
+def build_digest(email: str, rows: List[Notification]) -> EmailMessage:
+    rows = sorted(rows, key=lambda r: r.created_at)
+    site = getattr(settings, "SITE_URL", "").rstrip("/")
+    subject = rows[0].subject if len(rows) == 1 else f"{len(rows)} notificări noi"
+
+    parts = []
+    for r in rows:
+        lines = [f"• {r.subject}"]
+        if r.body:
+            lines.append(f"  {r.body}")
+        if r.url:
+            lines.append(f"  {site}{r.url}")
+        parts.append("\n".join(lines))
+
+    return EmailMessage(
+        subject=subject,
+        body="\n\n".join(parts) + "\n",
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[email],
+    )
+
+
+def _finish(rows: List[Notification], error: Optional[str], now) -> None:
+    if error is None:
+        Notification.objects.filter(pk__in=[r.pk for r in rows]).update(
+            status=Notification.Status.SENT, sent_at=now, last_error=""
+        )
+        return
+    for r in rows:
+        r.last_error = error[:2000]
+        if r.attempts >= max_attempts():
+            r.status = Notification.Status.FAILED
+        else:
+            r.available_at = now + retry_delay(r.attempts)
+    Notification.objects.bulk_update(rows, ["status", "available_at", "last_error"])
+
+
+def drain(batch_size: int = 100, now=None) -> DrainResult:
+    """
+    Un lot: revendicare, un email per destinatar, apoi SENT sau reprogramare cu backoff.
+    """
+    result = DrainResult()
+    rows = claim(batch_size, now)
+    if not rows:
+        return result
+
+    by_email: Dict[str, List[Notification]] = defaultdict(list)
+    for r in rows:
+        by_email[r.email].append(r)
+
+    connection = get_connection()
+    try:
+        connection.open()
+    except Exception as exc:
+        logger.warning("notifications: conexiune email eșuată: %s", exc)
+        _finish(rows, f"{type(exc).__name__}: {exc}", timezone.now())
+        result.retried = sum(r.status == Notification.Status.PENDING for r in rows)
+        result.failed = len(rows) - result.retried
+        return result
+
+    try:
+        for email, group in by_email.items():
+            error = None
+            try:
+                connection.send_messages([build_digest(email, group)])
+            except Exception as exc:
+                logger.warning("notifications: trimitere eșuată către %s: %s", email, exc)
+                error = f"{type(exc).__name__}: {exc}"
+            _finish(group, error, timezone.now())
+
+            if error is None:
+                result.emails += 1
+                result.sent += len(group)
+            else:
+                failed = sum(r.status == Notification.Status.FAILED for r in group)
+                result.failed += failed
+                result.retried += len(group) - failed
+    finally:
+        connection.close()
+    return result
@@ -0,0 +1,354 @@
+from __future__ import annotations
+
+import json
+import re
+import statistics
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from django.apps import apps
+from django.db import connections, models, transaction
+
+from .queries import QueryRecorder, query_shape
+
+# ============================================================
+# Captură: șabloane de interogări cu timpi și un exemplu executabil
+# ============================================================
+
+
+@dataclass
+class ShapeSample:
+    alias: str
+    shape: str
+    sql: str
+    params: list
+    count: int = 0
+    time: float = 0.0
+
+
+class ShapeCapture(QueryRecorder):
+    """
+    Ca QueryRecorder, dar păstrează per șablon aliasul și primul exemplu (SQL + parametri),
+    ca advisor-ul să poată rula EXPLAIN pe el.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.samples: Dict[Tuple[str, str], ShapeSample] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, execute, sql, params, many, context):
+        t0 = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - t0
+            if not many and sql.lstrip()[:6].upper() == "SELECT":
+                self._add(context["connection"].alias, sql, params, elapsed)
+
+    def _add(self, alias: str, sql: str, params, elapsed: float) -> None:
+        key = (alias, query_shape(sql))
+        with self._lock:
+            s = self.samples.get(key)
+            if s is None:
+                s = self.samples[key] = ShapeSample(alias, key[1], sql, _jsonable(params))
+            s.count += 1
+            s.time += elapsed
+
+    def records(self) -> List[dict]:
+        return [s.__dict__.copy() for s in self.samples.values()]
+
+
+def _jsonable(params) -> list:
+    # datetime / Decimal / UUID -> text (SQLite le compară oricum ca text)
+    return json.loads(json.dumps(list(params or ()), default=str))
+
+
+_file_lock = threading.Lock()
+
+
+def append_capture(path, records: Iterable[dict]) -> None:
+    lines = [json.dumps(r, ensure_ascii=False) for r in records]
+    if not lines:
+        return
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with _file_lock, path.open("a", encoding="utf-8") as fh:
+        fh.write("\n".join(lines) + "\n")
+
+
+def load_capture(paths: Sequence) -> List[ShapeSample]:
+    merged: Dict[Tuple[str, str], ShapeSample] = {}
+    for path in paths:
+        with Path(path).open(encoding="utf-8") as fh:
+            for line in fh:
+                if not line.strip():
+                    continue
+                r = json.loads(line)
+                key = (r["alias"], r["shape"])
+                s = merged.setdefault(key, ShapeSample(r["alias"], r["shape"], r["sql"], r["params"]))
+                s.count += r["count"]
+                s.time += r["time"]
+    return list(merged.values())
+
+
+# ============================================================
+# Analiză SQL (forma generată de ORM: "tabel"."coloană")
+# ============================================================
+
+_COL = r'"(?P<table>\w+)"\."(?P<column>\w+)"'
+_PREDICATE_RE = re.compile(
+    _COL + r'\s*(?P<op>IS\s+NULL|IN\b|BETWEEN\b|<=|>=|=|<|>)(?!\s*")', re.IGNORECASE
+)
+_ORDER_RE = re.compile(_COL + r"(?:\s+(?:ASC|DESC))?", re.IGNORECASE)
+_CLAUSE_END = r"(?=\s+(?:GROUP BY|HAVING|ORDER BY|LIMIT|OFFSET)\b|$)"
+_WHERE_RE = re.compile(r"\bWHERE\s+(?P<where>.*?)" + _CLAUSE_END, re.IGNORECASE | re.DOTALL)
+_ORDER_BY_RE = re.compile(r"\bORDER BY\s+(?P<order>.*?)(?=\s+(?:LIMIT|OFFSET)\b|$)", re.IGNORECASE | re.DOTALL)
+
+
+@dataclass
+class TableAccess:
+    table: str
+    equality: List[str] = field(default_factory=list)
+    ranges: List[str] = field(default_factory=list)
+    order: List[str] = field(default_factory=list)
+
+    def candidate(self, max_columns: int = 3) -> List[str]:
+        """
+        Ordinea clasică: egalități, apoi sortarea (dacă e pe același tabel), apoi primul interval.
+        """
+        cols = list(dict.fromkeys(self.equality))
+        tail = [c for c in self.order if c not in cols] or [c for c in self.ranges if c not in cols][:1]
+        return (cols + tail)[:max_columns]
+
+
+def table_accesses(sql: str) -> Dict[str, TableAccess]:
+    # doar SELECT-ul exterior: subinterogările au propriile exemple în captură
+    out: Dict[str, TableAccess] = {}
+    where = _WHERE_RE.search(sql)
+    if where and " OR " not in where.group("where").upper():
+        for m in _PREDICATE_RE.finditer(where.group("where")):
+            acc = out.setdefault(m["table"], TableAccess(m["table"]))
+            op = m["op"].upper()
+            (acc.ranges if op in ("<", ">", "<=", ">=", "BETWEEN") else acc.equality).append(m["column"])
+
+    order = _ORDER_BY_RE.search(sql)
+    if order:
+        cols = [(m["table"], m["column"]) for m in _ORDER_RE.finditer(order.group("order"))]
+        # sortare pe un singur tabel: altfel niciun index nu o poate furniza
+        if cols and len({t for t, _ in cols}) == 1:
+            table = cols[0][0]
+            out.setdefault(table, TableAccess(table)).order = [c for _, c in cols]
+    return out
+
+
+def explain(alias: str, sql: str, params) -> List[str]:
+    conn = connections[alias]
+    prefix = "EXPLAIN QUERY PLAN " if conn.vendor == "sqlite" else "EXPLAIN "
+    with conn.cursor() as c:
+        c.execute(prefix + sql, params)
+        rows = c.fetchall()
+    # SQLite: (id, parent, notused, detail); Postgres: o linie de text per rând
+    return [str(r[-1]) for r in rows]
+
+
+def plan_problems(vendor: str, plan: List[str], table: str) -> List[str]:
+    problems = []
+    for line in plan:
+        if vendor == "sqlite":
+            if re.match(rf"\s*SCAN {table}\b(?! USING (?:COVERING )?INDEX)", line):
+                problems.append("scan")
+            elif "USE TEMP B-TREE FOR ORDER BY" in line:
+                problems.append("sort")
+        elif vendor == "postgresql":
+            if f"Seq Scan on {table}" in line:
+                problems.append("scan")
+            elif line.strip().startswith("Sort") or "-> Sort" in line:
+                problems.append("sort")
+    return problems
+
+
+def _model_for_table(table: str):
+    for model in apps.get_models():
+        if model._meta.db_table == table and not model._meta.proxy:
+            return model
+    return None
+
+
+def _field_names(model, columns: List[str]) -> Optional[List[str]]:
+    by_column = {f.column: f.name for f in model._meta.concrete_fields}
+    names = [by_column.get(c) for c in columns]
+    return None if None in names else names
+
+
+def _covered(alias: str, table: str, columns: List[str], equality: List[str]) -> bool:
+    # există deja un index (sau PK / unique) care începe cu aceste coloane,
+    # ori egalitățile ating deja o cheie unică (cel mult un rând per valoare)
+    conn = connections[alias]
+    with conn.cursor() as c:
+        constraints = conn.introspection.get_constraints(c, table)
+    for info in constraints.values():
+        existing = info.get("columns") or []
+        if not (info.get("index") or info.get("primary_key") or info.get("unique")):
+            continue
+        if existing[:len(columns)] == columns:
+            return True
+        if (info.get("primary_key") or info.get("unique")) and existing and set(existing) <= set(equality):
+            return True
+    return False
+
+
+# ============================================================
+# Propuneri + măsurare pe o copie (sandbox)
+# ============================================================
+
+@dataclass
+class Proposal:
+    alias: str
+    model: type
+    columns: List[str]
+    fields: List[str]
+    reasons: List[str] = field(default_factory=list)
+    shapes: List[ShapeSample] = field(default_factory=list)
+    before_ms: float = 0.0
+    after_ms: float = 0.0
+    saved_ms: float = 0.0  # estimat pe fereastra capturată (execuții x câștig per execuție)
+    used: bool = False
+
+    @property
+    def index(self) -> models.Index:
+        index = models.Index(fields=self.fields)
+        index.set_name_with_model(self.model)
+        return index
+
+    @property
+    def executions(self) -> int:
+        return sum(s.count for s in self.shapes)
+
+
+def propose(samples: Iterable[ShapeSample], min_executions: int = 1) -> List[Proposal]:
+    proposals: Dict[Tuple[str, str, Tuple[str, ...]], Proposal] = {}
+    for sample in sorted(samples, key=lambda s: s.time, reverse=True):
+        if sample.count < min_executions or sample.alias not in connections.settings:
+            continue
+        vendor = connections[sample.alias].vendor
+        try:
+            plan = explain(sample.alias, sample.sql, sample.params)
+        except Exception:
+            continue
+        for table, access in table_accesses(sample.sql).items():
+            problems = plan_problems(vendor, plan, table)
+            columns = access.candidate()
+            model = _model_for_table(table)
+            if not problems or not columns or model is None:
+                continue
+            fields = _field_names(model, columns)
+            if fields is None or _covered(sample.alias, table, columns, access.equality):
+                continue
+            key = (sample.alias, table, tuple(columns))
+            p = proposals.setdefault(key, Proposal(sample.alias, model, columns, fields))
+            p.shapes.append(sample)
+            p.reasons = sorted(set(p.reasons) | set(problems))
+    return list(proposals.values())
+
+
+@contextmanager
+def sandbox(alias: str) -> Iterator[str]:
+    """
+    Alias pe care se pot crea indexuri de probă: copie SQLite (online backup) sau,
+    pe Postgres, o tranzacție anulată la final (DDL tranzacțional).
+    """
+    conn = connections[alias]
+    if conn.vendor == "sqlite":
+        import copy
+        import sqlite3
+
+        with tempfile.TemporaryDirectory(prefix="vertix-advisor-") as tmp:
+            path = Path(tmp) / "sandbox.sqlite3"
+            with sqlite3.connect(conn.settings_dict["NAME"]) as src, sqlite3.connect(path) as dst:
+                src.backup(dst)
+            name = f"{alias}_advisor"
+            connections.settings[name] = {**copy.deepcopy(conn.settings_dict), "NAME": str(path), "CONN_MAX_AGE": 0}
+            try:
+                yield name
+            finally:
+                connections[name].close()
+                del connections.settings[name]
+                if hasattr(connections._connections, name):
+                    delattr(connections._connections, name)
+    else:
+        with transaction.atomic(using=alias):
+            yield alias
+            transaction.set_rollback(True, using=alias)
+
+
+def _timed(alias: str, sql: str, params, repeat: int) -> float:
+    runs = []
+    with connections[alias].cursor() as c:
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            c.execute(sql, params)
+            c.fetchall()
+            runs.append(time.perf_counter() - t0)
+    return statistics.median(runs) * 1000
+
+
+def measure(proposals: List[Proposal], repeat: int = 5) -> List[Proposal]:
+    """
+    Pentru fiecare propunere: timp median înainte / după crearea indexului (pe sandbox),
+    dacă planul nou îl folosește și câștigul estimat pe fereastra capturată.
+    """
+    by_alias: Dict[str, List[Proposal]] = {}
+    for p in proposals:
+        by_alias.setdefault(p.alias, []).append(p)
+
+    for alias, group in by_alias.items():
+        with sandbox(alias) as box:
+            conn = connections[box]
+            for p in group:
+                before = {id(s): _timed(box, s.sql, s.params, repeat) for s in p.shapes}
+                index = p.index
+                with conn.schema_editor() as editor:
+                    editor.add_index(p.model, index)
+                after = {id(s): _timed(box, s.sql, s.params, repeat) for s in p.shapes}
+                p.used = any(index.name in line for s in p.shapes for line in explain(box, s.sql, s.params))
+                with conn.schema_editor() as editor:
+                    editor.remove_index(p.model, index)
+
+                p.before_ms = sum(before.values()) / len(before)
+                p.after_ms = sum(after.values()) / len(after)
+                p.saved_ms = sum((before[id(s)] - after[id(s)]) * s.count for s in p.shapes)
+    return sorted(proposals, key=lambda p: p.saved_ms, reverse=True)
+
+
+# ============================================================
+# Migrări generate
+# ============================================================
+
+def write_migrations(proposals: List[Proposal]) -> List[Path]:
+    from django.db.migrations import AddIndex, Migration
+    from django.db.migrations.loader import MigrationLoader
+    from django.db.migrations.writer import MigrationWriter
+
+    loader = MigrationLoader(None, ignore_no_migrations=True)
+    by_app: Dict[str, List[Proposal]] = {}
+    for p in proposals:
+        by_app.setdefault(p.model._meta.app_label, []).append(p)
+
+    paths = []
+    for app_label, group in by_app.items():
+        leaf = loader.graph.leaf_nodes(app_label)[0]
+        number = int(leaf[1].split("_", 1)[0]) + 1
+        migration = Migration(f"{number:04d}_advisor_indexes", app_label)
+        migration.dependencies = [leaf]
+        migration.operations = [AddIndex(model_name=p.model._meta.model_name, index=p.index) for p in group]
+        writer = MigrationWriter(migration)
+        path = Path(writer.path)
+        path.write_text(writer.as_string(), encoding="utf-8")
+        paths.append(path)
+    return paths
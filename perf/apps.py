@@ -0,0 +1,12 @@
+from django.apps import AppConfig
+
+
+class PerfConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'perf'
+
+    def ready(self):
+        from . import postgres  # noqa: F401  (lookup __uicontains)
+        from . import sqlite  # noqa: F401  (connection_created: pragma-uri + retry la lock)
+        from .template_profiler import install
+        install()
@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+import json
+import math
+import subprocess
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from django.conf import settings
+from django.db import connection, connections
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+from django.utils import timezone, translation
+
+from perf.queries import QueryRecorder
+
+from .seed import EMAIL_DOMAIN, bench_email
+
+BASELINE_DIR = Path(__file__).resolve().parent / "baselines"
+
+# Host-ul cererilor bench; adăugat în ALLOWED_HOSTS cât rulează (altfel 400 DisallowedHost)
+BENCH_HOST = "bench.localhost"
+
+# ============================================================
+# Endpoint-uri măsurate
+# ============================================================
+
+
+@dataclass(frozen=True)
+class Endpoint:
+    name: str
+    url: Callable[[], str]
+    # rolul utilizatorului bench autentificat (None = vizitator anonim)
+    role: Optional[str] = None
+
+
+def _url(name: str, *args, lang: str = "ro") -> Callable[[], str]:
+    def _resolve():
+        with translation.override(lang):
+            return reverse(name, args=args)
+    return _resolve
+
+
+ENDPOINTS = [
+    Endpoint("home", _url("home")),
+    Endpoint("services_list", _url("services_list")),
+    Endpoint("products_list", _url("products_list")),
+    Endpoint("blog_list", _url("blog_list")),
+    Endpoint("portal_dashboard_admin", _url("portal_dashboard"), "ADMIN"),
+    Endpoint("portal_dashboard_client", _url("portal_dashboard"), "CLIENT"),
+    Endpoint("portal_export_xlsx", _url("portal_export_xlsx"), "ADMIN"),
+    Endpoint("chat_unread_count", _url("chat_unread_count"), "CLIENT"),
+    Endpoint("document_list", _url("documents:list"), "TEHNICIAN"),
+    Endpoint("admin_analytics", _url("admin:analytics-dashboard"), "ADMIN"),
+]
+
+
+@dataclass
+class EndpointResult:
+    name: str
+    url: str
+    requests: int
+    errors: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    mean_ms: float
+    throughput_rps: float
+    queries_avg: float
+    queries_max: int
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """
+    Nearest-rank (fără interpolare), ca rezultatele să fie reproductibile.
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = max(0, math.ceil(pct / 100 * len(ordered)) - 1)
+    return ordered[k]
+
+
+# ============================================================
+# Rulare (in-process, prin tot lanțul de middleware)
+# ============================================================
+
+def _client(role: Optional[str]) -> Client:
+    from accounts.models import User
+
+    client = Client(HTTP_HOST=BENCH_HOST, raise_request_exception=False)
+    if role:
+        user = User.objects.filter(email=bench_email(role, 0)).first()
+        if user is None:
+            raise RuntimeError(f"Lipsește utilizatorul {bench_email(role, 0)}: rulează întâi bench_seed.")
+        client.force_login(user)
+    return client
+
+
+def run_endpoint(endpoint: Endpoint, requests: int, warmup: int = 3, concurrency: int = 1) -> EndpointResult:
+    with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, BENCH_HOST]):
+        return _run_endpoint(endpoint, requests, warmup, concurrency)
+
+
+def _run_endpoint(endpoint: Endpoint, requests: int, warmup: int, concurrency: int) -> EndpointResult:
+    url = endpoint.url()
+    latencies: List[float] = []
+    queries: List[int] = []
+    statuses: Counter = Counter()
+    lock = threading.Lock()
+
+    def _worker(n: int):
+        client = _client(endpoint.role)
+        try:
+            for _ in range(n):
+                with QueryRecorder() as rec:
+                    t0 = time.perf_counter()
+                    response = client.get(url)
+                    elapsed = time.perf_counter() - t0
+                with lock:
+                    latencies.append(elapsed * 1000)
+                    queries.append(rec.stats.count)
+                    statuses[response.status_code] += 1
+        finally:
+            if threading.current_thread() is not threading.main_thread():
+                connection.close()
+
+    # încălzire: cache-uri, indexuri în memorie, template-uri compilate
+    warm = _client(endpoint.role)
+    for _ in range(warmup):
+        warm.get(url)
+
+    per_worker = [requests // concurrency + (1 if i < requests % concurrency else 0) for i in range(concurrency)]
+    started = time.perf_counter()
+    if concurrency == 1:
+        _worker(requests)
+    else:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            list(pool.map(_worker, per_worker))
+    wall = time.perf_counter() - started
+
+    # latențele unor răspunsuri 400 / 500 nu spun nimic despre endpoint
+    errors = sum(n for status, n in statuses.items() if status != 200)
+    if errors:
+        codes = ", ".join(f"{status} x{n}" for status, n in sorted(statuses.items()) if status != 200)
+        raise RuntimeError(f"{endpoint.name} ({url}): {errors}/{requests} cereri eșuate ({codes}).")
+
+    return EndpointResult(
+        name=endpoint.name,
+        url=url,
+        requests=len(latencies),
+        errors=errors,
+        p50_ms=round(percentile(latencies, 50), 2),
+        p95_ms=round(percentile(latencies, 95), 2),
+        p99_ms=round(percentile(latencies, 99), 2),
+        mean_ms=round(sum(latencies) / len(latencies), 2) if latencies else 0.0,
+        throughput_rps=round(len(latencies) / wall, 1) if wall else 0.0,
+        queries_avg=round(sum(queries) / len(queries), 1) if queries else 0.0,
+        queries_max=max(queries) if queries else 0,
+    )
+
+
+def run(names: Optional[List[str]] = None, requests: int = 50, concurrency: int = 1,
+        log: Optional[Callable[[EndpointResult], None]] = None) -> Dict:
+    selected = [e for e in ENDPOINTS if not names or e.name in names]
+    results = []
+    for endpoint in selected:
+        res = run_endpoint(endpoint, requests, concurrency=concurrency)
+        results.append(res)
+        if log:
+            log(res)
+    return {"meta": _meta(requests, concurrency), "results": [asdict(r) for r in results]}
+
+
+def _meta(requests: int, concurrency: int) -> Dict:
+    from accounts.models import User
+
+    try:
+        revision = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=settings.BASE_DIR,
+            capture_output=True, text=True, timeout=5,
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        revision = ""
+    return {
+        "revision": revision,
+        "created_at": timezone.now().isoformat(),
+        "database": connections["default"].vendor,
+        "requests": requests,
+        "concurrency": concurrency,
+        "bench_users": User.objects.filter(email__endswith=f"@{EMAIL_DOMAIN}").count(),
+    }
+
+
+# ============================================================
+# Baseline-uri JSON
+# ============================================================
+
+def baseline_path(name: str) -> Path:
+    path = Path(name)
+    return path if path.suffix == ".json" else BASELINE_DIR / f"{name}.json"
+
+
+def save_baseline(report: Dict, name: str) -> Path:
+    failed = [r["name"] for r in report["results"] if r["errors"]]
+    if failed:
+        raise RuntimeError(f"Baseline cu cereri eșuate: {', '.join(failed)}.")
+    path = baseline_path(name)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+    return path
+
+
+def compare(report: Dict, baseline: Dict, tolerance: float = 0.2) -> List[Dict]:
+    """
+    Diferențe față de baseline per endpoint; regression=True dacă p95 crește peste
+    toleranță (procent), dacă numărul maxim de interogări crește sau dacă apar erori.
+    """
+    old = {r["name"]: r for r in baseline.get("results", [])}
+    rows = []
+    for r in report["results"]:
+        b = old.get(r["name"])
+        if not b:
+            continue
+        p95_delta = (r["p95_ms"] - b["p95_ms"]) / b["p95_ms"] if b["p95_ms"] else 0.0
+        rows.append({
+            "name": r["name"],
+            "p95_ms": (b["p95_ms"], r["p95_ms"]),
+            "p95_delta": p95_delta,
+            "queries_max": (b["queries_max"], r["queries_max"]),
+            "errors": r["errors"],
+            "regression": p95_delta > tolerance or r["queries_max"] > b["queries_max"] or r["errors"] > 0,
+        })
+    return rows
@@ -0,0 +1,380 @@
+from __future__ import annotations
+
+import random
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.utils import timezone
+
+# ============================================================
+# Generator de date sintetice (volum de producție)
+# ============================================================
+
+# toate rândurile generate sunt marcate, ca să poată fi șterse cu --reset
+EMAIL_DOMAIN = "bench.local"
+MARK = "[bench]"
+SKU_PREFIX = "BENCH-"
+UA = "bench-seed"
+PASSWORD = "bench-pass"
+
+COUNTS = {
+    "pageviews": 100_000,
+    "tickets": 20_000,
+    "public_requests": 20_000,
+    "messages": 200_000,
+    "documents": 10_000,
+    "products": 5_000,
+    "clients": 500,
+    "technicians": 25,
+    "managers": 3,
+}
+BATCH = 2000
+
+PUBLIC_PATHS = [
+    "/ro/", "/en/", "/ro/servicii/", "/ro/proiecte/", "/ro/industrii/", "/ro/blog/",
+    "/ro/produse/", "/ro/contact/", "/ro/despre-noi/", "/ro/cariere/", "/en/servicii/", "/en/produse/",
+]
+WORDS = (
+    "motor pompa senzor tablou automat plc hmi scada invertor retrofit mentenanta reparatie "
+    "conveior presa robot valva compresor encoder cablaj calibrare urgenta oferta linie"
+).split()
+
+
+def bench_email(role: str, i: int) -> str:
+    return f"bench-{role.lower()}-{i}@{EMAIL_DOMAIN}"
+
+
+@contextmanager
+def _manual_timestamps(*models):
+    """
+    created_at / updated_at primesc valorile generate (auto_now / auto_now_add suspendate).
+    """
+    saved = []
+    for model in models:
+        for f in model._meta.concrete_fields:
+            if getattr(f, "auto_now", False) or getattr(f, "auto_now_add", False):
+                saved.append((f, f.auto_now, f.auto_now_add))
+                f.auto_now = f.auto_now_add = False
+    try:
+        yield
+    finally:
+        for f, auto_now, auto_now_add in saved:
+            f.auto_now, f.auto_now_add = auto_now, auto_now_add
+
+
+class Seeder:
+    def __init__(self, seed: int = 42, scale: float = 1.0, log: Optional[Callable[[str], None]] = None):
+        self.rnd = random.Random(seed)
+        self.counts = {k: max(1, int(v * scale)) for k, v in COUNTS.items()}
+        self.now = timezone.now()
+        self.log = log or (lambda msg: None)
+
+    def _past(self, days: int) -> datetime:
+        return self.now - timedelta(seconds=self.rnd.randint(0, days * 86400))
+
+    def _text(self, n: int) -> str:
+        return " ".join(self.rnd.choice(WORDS) for _ in range(n))
+
+    # ----------------------------
+    # Utilizatori
+    # ----------------------------
+
+    def users(self) -> Dict[str, List]:
+        from accounts.models import User
+        from portal.models import Technician
+
+        password = make_password(PASSWORD)
+        plan = [
+            (User.Role.ADMIN, 1),
+            (User.Role.MANAGER, self.counts["managers"]),
+            (User.Role.TEHNICIAN, self.counts["technicians"]),
+            (User.Role.CLIENT, self.counts["clients"]),
+        ]
+        rows = [
+            User(
+                email=bench_email(role, i), role=role, password=password, is_active=True,
+                is_staff=role == User.Role.ADMIN, is_superuser=role == User.Role.ADMIN,
+                company_name=f"Bench SRL {i}" if role == User.Role.CLIENT else "",
+                date_joined=self._past(365),
+            )
+            for role, n in plan for i in range(n)
+        ]
+        User.objects.bulk_create(rows, batch_size=BATCH)
+
+        users = {role: list(User.objects.filter(email__endswith=f"@{EMAIL_DOMAIN}", role=role)) for role, _ in plan}
+        Technician.objects.bulk_create(
+            [Technician(name=f"Tehnician bench {u.pk}", email=u.email, user=u) for u in users[User.Role.TEHNICIAN]],
+            batch_size=BATCH,
+        )
+        self.log(f"utilizatori: {len(rows)}")
+        return users
+
+    # ----------------------------
+    # Cereri + chat
+    # ----------------------------
+
+    def requests(self, users) -> None:
+        from accounts.models import User
+        from portal.models import PublicRequest, RequestStatus, Ticket, Technician
+
+        statuses = [
+            RequestStatus.objects.get_or_create(name=name)[0]
+            for name in ("Neprocesat", "În lucru", "Rezolvat", "Închis")
+        ]
+        clients = users[User.Role.CLIENT]
+        staff = users[User.Role.ADMIN] + users[User.Role.MANAGER]
+        techs = users[User.Role.TEHNICIAN]
+        tech_profiles = list(Technician.objects.filter(user__in=techs))
+
+        with _manual_timestamps(Ticket, PublicRequest):
+            tickets = []
+            for _ in range(self.counts["tickets"]):
+                created = self._past(365)
+                tickets.append(Ticket(
+                    created_by=self.rnd.choice(clients) if self.rnd.random() < 0.8 else self.rnd.choice(staff),
+                    assigned_to=self.rnd.choice(techs) if self.rnd.random() < 0.7 else None,
+                    subject=f"{MARK} {self._text(4)}",
+                    message=self._text(40),
+                    status=self.rnd.choice(statuses),
+                    created_at=created,
+                    updated_at=created,
+                ))
+            Ticket.objects.bulk_create(tickets, batch_size=BATCH)
+
+            publics = []
+            for i in range(self.counts["public_requests"]):
+                user = self.rnd.choice(clients) if self.rnd.random() < 0.4 else None
+                publics.append(PublicRequest(
+                    user=user,
+                    email=user.email if user else f"lead-{i}@{EMAIL_DOMAIN}",
+                    phone=f"07{self.rnd.randint(10000000, 99999999)}",
+                    company=f"Firma {self._text(1).title()} {i}",
+                    description=f"{MARK} {self._text(30)}",
+                    status=self.rnd.choice(statuses) if self.rnd.random() < 0.8 else None,
+                    assigned_to=self.rnd.choice(tech_profiles) if tech_profiles and self.rnd.random() < 0.5 else None,
+                    created_at=self._past(365),
+                ))
+            PublicRequest.objects.bulk_create(publics, batch_size=BATCH)
+
+        tickets = list(Ticket.objects.filter(subject__startswith=MARK).only("id", "created_by_id", "created_at"))
+        publics = list(PublicRequest.objects.filter(description__startswith=MARK).only("id", "user_id", "created_at"))
+        self.log(f"tichete: {len(tickets)}, cereri publice: {len(publics)}")
+        self._messages(tickets, publics, staff + techs, clients)
+
+    def _messages(self, tickets, publics, staff, clients) -> None:
+        from portal.models import PublicRequest, Ticket
+        from portal.models_chat import TicketMessage, TicketMessageRead
+
+        ct_ticket = ContentType.objects.get_for_model(Ticket)
+        ct_public = ContentType.objects.get_for_model(PublicRequest)
+        targets = [(ct_ticket, t, t.created_by_id) for t in tickets] + [(ct_public, p, p.user_id) for p in publics]
+
+        last_chat: Dict[tuple, datetime] = {}
+        total = self.counts["messages"]
+        created = 0
+        while created < total:
+            chunk = []
+            for _ in range(min(BATCH * 5, total - created)):
+                ct, obj, owner_id = self.rnd.choice(targets)
+                at = obj.created_at + timedelta(minutes=self.rnd.randint(1, 60 * 24 * 30))
+                at = min(at, self.now)
+                author_id = owner_id if owner_id and self.rnd.random() < 0.5 else self.rnd.choice(staff).pk
+                internal = author_id != owner_id and self.rnd.random() < 0.15
+                chunk.append(TicketMessage(
+                    content_type=ct, object_id=obj.pk, author_id=author_id, body=self._text(12), created_at=at,
+                    visibility=TicketMessage.Visibility.INTERNAL if internal else TicketMessage.Visibility.PUBLIC,
+                ))
+                key = (ct.pk, obj.pk)
+                if key not in last_chat or last_chat[key] < at:
+                    last_chat[key] = at
+            TicketMessage.objects.bulk_create(chunk, batch_size=BATCH)
+            created += len(chunk)
+        self.log(f"mesaje chat: {created}")
+
+        for model, ct, objs in ((Ticket, ct_ticket, tickets), (PublicRequest, ct_public, publics)):
+            for obj in objs:
+                obj.last_chat_at = last_chat.get((ct.pk, obj.pk))
+            model.objects.bulk_update([o for o in objs if o.last_chat_at], ["last_chat_at"], batch_size=BATCH)
+
+        # jumătate din proprietari au citit până la un mesaj oarecare (restul rămân necitite)
+        reads = []
+        for ct, obj, owner_id in targets:
+            if owner_id and self.rnd.random() < 0.5:
+                reads.append((ct, obj.pk, owner_id))
+        last_ids = {}
+        for ct_id, obj_id, msg_id in (
+            TicketMessage.objects.filter(author__email__endswith=f"@{EMAIL_DOMAIN}")
+            .values_list("content_type_id", "object_id", "id")
+            .iterator(chunk_size=BATCH * 5)
+        ):
+            key = (ct_id, obj_id)
+            if self.rnd.random() < 0.7 or key not in last_ids:
+                last_ids[key] = msg_id
+        TicketMessageRead.objects.bulk_create(
+            [
+                TicketMessageRead(content_type=ct, object_id=pk, user_id=uid, last_read_message_id=last_ids.get((ct.pk, pk)))
+                for ct, pk, uid in reads
+            ],
+            batch_size=BATCH,
+        )
+        self.log(f"marcaje citire: {len(reads)}")
+
+    # ----------------------------
+    # Analytics
+    # ----------------------------
+
+    def pageviews(self, users) -> None:
+        from accounts.models import User
+        from analytics.models import PageView
+
+        visitors = [uuid.UUID(int=self.rnd.getrandbits(128)) for _ in range(20_000)]
+        clients = users[User.Role.CLIENT]
+        total = self.counts["pageviews"]
+        with _manual_timestamps(PageView):
+            for start in range(0, total, BATCH * 5):
+                PageView.objects.bulk_create(
+                    [
+                        PageView(
+                            path=self.rnd.choice(PUBLIC_PATHS), method="GET",
+                            visitor_id=self.rnd.choice(visitors),
+                            status_code=200 if self.rnd.random() < 0.97 else 404,
+                            user=self.rnd.choice(clients) if self.rnd.random() < 0.1 else None,
+                            ua=UA, referer="", created_at=self._past(90),
+                        )
+                        for _ in range(min(BATCH * 5, total - start))
+                    ],
+                    batch_size=BATCH,
+                )
+        self.log(f"accesări: {total}")
+
+    # ----------------------------
+    # Documente
+    # ----------------------------
+
+    def documents(self, users) -> None:
+        from accounts.models import User
+        from documents.models import Document, DocumentType
+        from documents.services import access
+
+        doc_type, _ = DocumentType.objects.get_or_create(
+            code="bench", defaults={"name": "Document bench", "series": "BENCH"}
+        )
+        clients = users[User.Role.CLIENT]
+        staff = users[User.Role.ADMIN] + users[User.Role.MANAGER]
+        techs = users[User.Role.TEHNICIAN]
+        statuses = [c for c, _ in Document.Status.choices]
+
+        docs = [
+            Document(
+                doc_type=doc_type, number=f"{SKU_PREFIX}{i:06d}", status=self.rnd.choice(statuses),
+                client_user=self.rnd.choice(clients), owner=self.rnd.choice(staff), created_by=self.rnd.choice(staff),
+                data_json={"descriere": self._text(10)}, created_at=self._past(365),
+            )
+            for i in range(1, self.counts["documents"] + 1)
+        ]
+        Document.objects.bulk_create(docs, batch_size=BATCH)
+
+        through = Document.technicians.through
+        ids = Document.objects.filter(number__startswith=SKU_PREFIX).values_list("pk", flat=True)
+        links = []
+        for pk in ids:
+            for tech in self.rnd.sample(techs, k=min(len(techs), self.rnd.randint(1, 2))):
+                links.append(through(document_id=pk, user_id=tech.pk))
+        through.objects.bulk_create(links, batch_size=BATCH)
+
+        # bulk_create nu trimite semnale
+        access.invalidate([u.pk for u in techs + clients])
+        self.log(f"documente: {len(docs)}")
+
+    # ----------------------------
+    # Catalog
+    # ----------------------------
+
+    def products(self) -> None:
+        from website.catalog import catalog_index
+        from website.models import Brand, Product, ProductCategory
+        from website.specs import sync_many_product_specs
+
+        brands = [Brand.objects.get_or_create(name=f"Bench Brand {i}")[0] for i in range(1, 13)]
+        categories = [
+            ProductCategory.objects.get_or_create(slug=f"bench-cat-{i}", defaults={"name": f"Bench categorie {i}"})[0]
+            for i in range(1, 9)
+        ]
+        availability = [c for c, _ in Product.AVAILABILITY_CHOICES]
+
+        rows = []
+        for i in range(1, self.counts["products"] + 1):
+            title = f"{self._text(2).title()} {i}"
+            rows.append(Product(
+                title=title, slug=f"bench-produs-{i}", sku=f"{SKU_PREFIX}{i:05d}",
+                brand=self.rnd.choice(brands), category=self.rnd.choice(categories),
+                short_description=self._text(8), description=self._text(60),
+                specs={
+                    "Tensiune": f"{self.rnd.choice([12, 24, 230, 400])}V",
+                    "Putere": f"{self.rnd.choice([0.37, 0.75, 1.5, 2.2, 5.5])}kW",
+                },
+                availability=self.rnd.choice(availability), order=i, updated_at=self.now,
+            ))
+        Product.objects.bulk_create(rows, batch_size=BATCH)
+
+        sync_many_product_specs(Product.objects.filter(sku__startswith=SKU_PREFIX))
+        catalog_index.invalidate()
+        self.log(f"produse: {len(rows)}")
+
+    # ----------------------------
+
+    def run(self) -> None:
+        from website import dashboard
+        from website.publish import sitemaps
+
+        with transaction.atomic():
+            users = self.users()
+            self.requests(users)
+            self.pageviews(users)
+            self.documents(users)
+            self.products()
+            sitemaps.refresh_section("products")
+        dashboard.invalidate()
+
+
+def reset(log: Optional[Callable[[str], None]] = None) -> None:
+    """
+    Șterge tot ce a generat Seeder (după marcaje).
+    """
+    from accounts.models import User
+    from analytics.models import PageView
+    from documents.models import Document, DocumentType
+    from documents.services import access
+    from portal.models import PublicRequest, Ticket
+    from portal.models_chat import TicketMessage
+    from website import dashboard
+    from website.catalog import catalog_index
+    from website.models import Brand, Product, ProductCategory
+
+    log = log or (lambda msg: None)
+    bench_users = User.objects.filter(email__endswith=f"@{EMAIL_DOMAIN}")
+    with transaction.atomic():
+        steps = [
+            ("mesaje", TicketMessage.objects.filter(author__in=bench_users)),
+            ("tichete", Ticket.objects.filter(subject__startswith=MARK)),
+            ("cereri publice", PublicRequest.objects.filter(description__startswith=MARK)),
+            ("accesări", PageView.objects.filter(ua=UA)),
+            ("documente", Document.objects.filter(number__startswith=SKU_PREFIX)),
+            ("produse", Product.objects.filter(sku__startswith=SKU_PREFIX)),
+            ("utilizatori", bench_users),
+        ]
+        for label, qs in steps:
+            n, _ = qs.delete()
+            log(f"{label}: {n} rânduri șterse")
+        DocumentType.objects.filter(code="bench").delete()
+        Brand.objects.filter(name__startswith="Bench Brand").delete()
+        ProductCategory.objects.filter(slug__startswith="bench-cat-").delete()
+
+    access.invalidate()
+    catalog_index.invalidate()
+    dashboard.invalidate()
@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+import copy
+import random
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List
+
+from django.conf import settings
+from django.db import OperationalError, connections, transaction
+from django.utils import timezone
+
+from perf.sqlite import is_locked_error, retry_on_locked
+
+from .driver import percentile
+
+# ============================================================
+# Benchmark de concurență pe SQLite: profil implicit vs. profil de producție
+# ============================================================
+
+PROFILES = {
+    # ce aveam înainte: journal DELETE, BEGIN (deferred), reconectare la fiecare cerere, fără retry
+    "default": {
+        "OPTIONS": {},
+        "PRAGMAS": {"journal_mode": "DELETE", "synchronous": "FULL"},
+        "LOCK_RETRIES": 0,
+        "CONN_MAX_AGE": 0,
+        "SPLIT_ANALYTICS": False,
+    },
+    "tuned": {
+        "OPTIONS": {"transaction_mode": "IMMEDIATE"},
+        "PRAGMAS": None,  # SQLITE_PRAGMAS din settings
+        "LOCK_RETRIES": None,
+        "CONN_MAX_AGE": 60,
+        # accesările în baza de analytics (analytics/routers.py), nu în cea principală
+        "SPLIT_ANALYTICS": True,
+    },
+}
+
+# amestec de operații (pondere): accesări, mesaje de chat, alocare număr document
+MIX = [("pageview", 6), ("chat_post", 3), ("allocate_number", 1)]
+
+
+@dataclass
+class ProfileResult:
+    profile: str
+    ops: int
+    errors: int
+    locked_errors: int
+    seconds: float
+    throughput: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    duplicate_numbers: int
+
+
+def _copy_database(src: str, dst: Path) -> None:
+    # online backup API: copie consistentă chiar dacă baza e folosită
+    with sqlite3.connect(src) as source, sqlite3.connect(dst) as target:
+        source.backup(target)
+
+
+@contextmanager
+def _alias(name: str, path: Path, profile: Dict):
+    base = copy.deepcopy(connections.settings["default"])
+    base.update({
+        "NAME": str(path),
+        "OPTIONS": profile["OPTIONS"],
+        "CONN_MAX_AGE": profile["CONN_MAX_AGE"],
+        "PRAGMAS": profile["PRAGMAS"] if profile["PRAGMAS"] is not None else settings.SQLITE_PRAGMAS,
+        "LOCK_RETRIES": profile["LOCK_RETRIES"] if profile["LOCK_RETRIES"] is not None else settings.SQLITE_LOCK_RETRIES,
+    })
+    connections.settings[name] = base
+    try:
+        yield name
+    finally:
+        connections[name].close()
+        del connections.settings[name]
+        if hasattr(connections._connections, name):
+            delattr(connections._connections, name)
+
+
+def _ensure_table(alias: str, model) -> None:
+    conn = connections[alias]
+    if model._meta.db_table not in conn.introspection.table_names():
+        with conn.schema_editor() as editor:
+            editor.create_model(model)
+
+
+def _fixtures(alias: str):
+    from accounts.models import User
+    from documents.models import DocumentType
+    from portal.models import Ticket
+
+    user = User.objects.using(alias).order_by("pk").first()
+    ticket = Ticket.objects.using(alias).order_by("pk").first()
+    if user is None or ticket is None:
+        raise RuntimeError("Baza nu are utilizatori/tichete: rulează întâi bench_seed.")
+    # bulk_create: fără post_save (schema_versions s-ar scrie pe alias-ul default)
+    doc_type = DocumentType.objects.using(alias).filter(code="bench-sqlite").first()
+    if doc_type is None:
+        doc_type = DocumentType.objects.using(alias).bulk_create(
+            [DocumentType(code="bench-sqlite", name="Bench SQLite", series="BS")]
+        )[0]
+    return user, ticket, doc_type
+
+
+def _operations(alias: str, telemetry: str, user, ticket, doc_type, retries: bool):
+    from analytics.models import PageView
+    from documents.models import DocumentType
+    from portal.models import Ticket
+    from portal.models_chat import TicketMessage
+    from django.contrib.contenttypes.models import ContentType
+
+    ct_ticket = ContentType.objects.db_manager(alias).get_for_model(Ticket)
+    numbers: List[int] = []
+
+    def pageview():
+        PageView.objects.using(telemetry).create(path="/ro/", method="GET", status_code=200, ua="bench-sqlite")
+
+    def chat_post():
+        # ca în chat_post: citire țintă, mesaj nou, last_chat_at pe țintă
+        with transaction.atomic(using=alias):
+            Ticket.objects.using(alias).filter(pk=ticket.pk).values_list("last_chat_at", flat=True).first()
+            TicketMessage.objects.using(alias).create(
+                content_type=ct_ticket, object_id=ticket.pk, author_id=user.pk, body="bench"
+            )
+            Ticket.objects.using(alias).filter(pk=ticket.pk).update(last_chat_at=timezone.now())
+
+    def allocate_number():
+        # ca documents.services.numbering.allocate_number
+        with transaction.atomic(using=alias):
+            locked = DocumentType.objects.using(alias).select_for_update().get(pk=doc_type.pk)
+            num = locked.next_number
+            locked.next_number += 1
+            locked.save(update_fields=["next_number"], using=alias)
+        numbers.append(num)
+
+    ops = {"pageview": pageview, "chat_post": chat_post, "allocate_number": allocate_number}
+    if retries:
+        ops = {k: (retry_on_locked(fn, using=alias) if k != "pageview" else fn) for k, fn in ops.items()}
+    return ops, numbers
+
+
+def run_profile(name: str, sources: Dict[str, str], workdir: Path, threads: int, duration: float,
+                seed: int = 1) -> ProfileResult:
+    from analytics.models import PageView
+
+    profile = PROFILES[name]
+    main_path = workdir / f"{name}.sqlite3"
+    _copy_database(sources["main"], main_path)
+    telemetry_path = main_path
+    if profile["SPLIT_ANALYTICS"]:
+        telemetry_path = workdir / f"{name}-analytics.sqlite3"
+        _copy_database(sources["analytics"], telemetry_path)
+
+    with _alias(f"bench_{name}", main_path, profile) as alias, \
+            _alias(f"bench_{name}_analytics", telemetry_path, profile) as telemetry:
+        user, ticket, doc_type = _fixtures(alias)
+        _ensure_table(telemetry, PageView)
+        for a in (alias, telemetry):
+            connections[a].close()
+        ops, numbers = _operations(alias, telemetry, user, ticket, doc_type, retries=profile["CONN_MAX_AGE"] > 0)
+
+        latencies: List[float] = []
+        counters = {"errors": 0, "locked": 0}
+        lock = threading.Lock()
+        names = [n for n, w in MIX for _ in range(w)]
+        deadline = time.perf_counter() + duration
+
+        def worker(i: int):
+            rnd = random.Random(seed + i)
+            conns = [connections[alias], connections[telemetry]]
+            try:
+                while time.perf_counter() < deadline:
+                    op = rnd.choice(names)
+                    t0 = time.perf_counter()
+                    try:
+                        ops[op]()
+                    except OperationalError as exc:
+                        with lock:
+                            counters["errors"] += 1
+                            counters["locked"] += is_locked_error(exc)
+                    else:
+                        with lock:
+                            latencies.append((time.perf_counter() - t0) * 1000)
+                    # sfârșit de "cerere": cu CONN_MAX_AGE = 0 conexiunea se închide
+                    for conn in conns:
+                        conn.close_if_unusable_or_obsolete()
+            finally:
+                for conn in conns:
+                    conn.close()
+
+        started = time.perf_counter()
+        pool = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+        for t in pool:
+            t.start()
+        for t in pool:
+            t.join()
+        elapsed = time.perf_counter() - started
+
+    return ProfileResult(
+        profile=name,
+        ops=len(latencies),
+        errors=counters["errors"],
+        locked_errors=counters["locked"],
+        seconds=round(elapsed, 2),
+        throughput=round(len(latencies) / elapsed, 1),
+        p50_ms=round(percentile(latencies, 50), 2),
+        p95_ms=round(percentile(latencies, 95), 2),
+        p99_ms=round(percentile(latencies, 99), 2),
+        duplicate_numbers=len(numbers) - len(set(numbers)),
+    )
+
+
+def run(profiles=("default", "tuned"), threads: int = 8, duration: float = 10.0) -> List[ProfileResult]:
+    from analytics.routers import analytics_db
+
+    sources = {
+        "main": str(connections.settings["default"]["NAME"]),
+        "analytics": str(connections.settings[analytics_db()]["NAME"]),
+    }
+    workdir = Path(tempfile.mkdtemp(prefix="vertix-sqlite-bench-"))
+    try:
+        return [run_profile(p, sources, workdir, threads, duration) for p in profiles]
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
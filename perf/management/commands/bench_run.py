@@ -0,0 +1,68 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from perf import advisor
+from perf.bench import driver
+
+
+class Command(BaseCommand):
+    help = (
+        "Rulează endpoint-urile critice in-process (tot lanțul de middleware) și raportează "
+        "p50/p95/p99, throughput și interogări SQL; opțional salvează / compară baseline-uri JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("endpoints", nargs="*", help="Nume endpoint (implicit toate): " + ", ".join(e.name for e in driver.ENDPOINTS))
+        parser.add_argument("-n", "--requests", type=int, default=50, help="Cereri per endpoint.")
+        parser.add_argument("-c", "--concurrency", type=int, default=1, help="Fire de execuție paralele.")
+        parser.add_argument("--save", metavar="NAME", help="Salvează rezultatul în perf/bench/baselines/NAME.json (sau cale .json).")
+        parser.add_argument("--compare", metavar="NAME", help="Compară cu un baseline salvat.")
+        parser.add_argument("--tolerance", type=float, default=0.2, help="Creștere p95 acceptată la --compare (0.2 = 20%%).")
+        parser.add_argument("--capture", metavar="FILE", help="Adaugă șabloanele SELECT în FILE (JSONL) pentru index_advisor.")
+
+    def handle(self, *args, **options):
+        unknown = set(options["endpoints"]) - {e.name for e in driver.ENDPOINTS}
+        if unknown:
+            raise CommandError(f"Endpoint necunoscut: {', '.join(sorted(unknown))}")
+
+        self.stdout.write(f"{'endpoint':28} {'p50':>8} {'p95':>8} {'p99':>8} {'rps':>8} {'sql':>6} {'err':>4}")
+
+        def _log(r):
+            self.stdout.write(
+                f"{r.name:28} {r.p50_ms:8.1f} {r.p95_ms:8.1f} {r.p99_ms:8.1f} "
+                f"{r.throughput_rps:8.1f} {r.queries_max:6d} {r.errors:4d}"
+            )
+
+        capture = advisor.ShapeCapture() if options["capture"] else None
+        try:
+            if capture:
+                with capture:
+                    report = driver.run(options["endpoints"], options["requests"], options["concurrency"], log=_log)
+                advisor.append_capture(options["capture"], capture.records())
+            else:
+                report = driver.run(options["endpoints"], options["requests"], options["concurrency"], log=_log)
+        except RuntimeError as exc:
+            raise CommandError(str(exc))
+
+        if options["save"]:
+            try:
+                path = driver.save_baseline(report, options["save"])
+            except RuntimeError as exc:
+                raise CommandError(str(exc))
+            self.stdout.write(self.style.SUCCESS(f"Baseline salvat: {path}"))
+
+        if options["compare"]:
+            path = driver.baseline_path(options["compare"])
+            if not path.exists():
+                raise CommandError(f"Nu există baseline-ul {path}")
+            rows = driver.compare(report, json.loads(path.read_text(encoding="utf-8")), options["tolerance"])
+            regressions = [r for r in rows if r["regression"]]
+            for r in rows:
+                mark = self.style.ERROR("REGRESIE") if r["regression"] else "ok"
+                self.stdout.write(
+                    f"{r['name']:28} p95 {r['p95_ms'][0]:.1f} -> {r['p95_ms'][1]:.1f} ms ({r['p95_delta']:+.0%}), "
+                    f"sql {r['queries_max'][0]} -> {r['queries_max'][1]}, err {r['errors']}  {mark}"
+                )
+            if regressions:
+                raise CommandError(f"{len(regressions)} endpoint-uri au regresat față de {path.name}.")
@@ -0,0 +1,34 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from perf.bench.seed import COUNTS, Seeder, reset
+
+
+class Command(BaseCommand):
+    help = (
+        "Generează date sintetice la volum de producție (PageView, Ticket, PublicRequest, "
+        "TicketMessage, Document, Product). Determinist pentru același --seed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--scale", type=float, default=1.0, help="Multiplicator pentru volumele implicite.")
+        parser.add_argument("--reset", action="store_true", help="Șterge datele generate anterior (și nu generează altele).")
+
+    def handle(self, *args, **options):
+        log = lambda msg: self.stdout.write(f"  {msg}")  # noqa: E731
+        t0 = time.perf_counter()
+
+        if options["reset"]:
+            reset(log=log)
+            self.stdout.write(self.style.SUCCESS(f"Date bench șterse în {time.perf_counter() - t0:.1f}s."))
+            return
+
+        seeder = Seeder(seed=options["seed"], scale=options["scale"], log=log)
+        self.stdout.write("Volume: " + ", ".join(f"{k}={v}" for k, v in seeder.counts.items() if k in COUNTS))
+        seeder.run()
+        self.stdout.write(self.style.SUCCESS(
+            f"Date generate în {time.perf_counter() - t0:.1f}s. "
+            "Pentru căutarea din portal: python manage.py search_reindex"
+        ))
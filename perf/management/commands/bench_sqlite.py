@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from perf.bench import sqlite_concurrency
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark de concurență SQLite pe o copie a bazei: accesări + mesaje chat + alocare număr document "
+        "din mai multe fire, profil implicit vs. profil de producție (WAL, BEGIN IMMEDIATE, retry, bază analytics separată)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("-t", "--threads", type=int, default=8)
+        parser.add_argument("-d", "--duration", type=float, default=10.0, help="Secunde per profil.")
+        parser.add_argument("--profile", action="append", choices=sorted(sqlite_concurrency.PROFILES))
+
+    def handle(self, *args, **options):
+        if connections["default"].vendor != "sqlite":
+            raise CommandError("Baza implicită nu e SQLite.")
+
+        profiles = options["profile"] or ["default", "tuned"]
+        results = sqlite_concurrency.run(profiles, options["threads"], options["duration"])
+
+        self.stdout.write(
+            f"{'profil':10} {'ops':>7} {'ops/s':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'erori':>6} {'locked':>7} {'dubluri':>8}"
+        )
+        for r in results:
+            self.stdout.write(
+                f"{r.profile:10} {r.ops:7d} {r.throughput:8.1f} {r.p50_ms:8.1f} {r.p95_ms:8.1f} {r.p99_ms:8.1f} "
+                f"{r.errors:6d} {r.locked_errors:7d} {r.duplicate_numbers:8d}"
+            )
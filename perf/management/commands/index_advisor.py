@@ -0,0 +1,67 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from perf import advisor
+from perf.bench import driver
+
+
+class Command(BaseCommand):
+    help = (
+        "Propune indexuri compuse din șabloanele de interogări capturate (bench_run --capture / "
+        "QUERY_CAPTURE_RATE): EXPLAIN pe fiecare, index candidat măsurat pe o copie, câștig estimat; "
+        "--write generează migrările."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--capture", nargs="+", metavar="FILE", help="Fișiere JSONL capturate.")
+        parser.add_argument(
+            "--bench", nargs="*", metavar="ENDPOINT",
+            help="Capturează acum, rulând endpoint-urile de benchmark (implicit toate).",
+        )
+        parser.add_argument("-n", "--requests", type=int, default=10, help="Cereri per endpoint cu --bench.")
+        parser.add_argument("--repeat", type=int, default=5, help="Rulări per interogare la măsurare.")
+        parser.add_argument("--min-gain", type=float, default=1.0, help="Câștig minim estimat (ms) pe fereastra capturată.")
+        parser.add_argument("--write", action="store_true", help="Scrie migrările AddIndex pentru propunerile reținute.")
+
+    def handle(self, *args, **options):
+        samples = []
+        if options["capture"]:
+            samples += advisor.load_capture(options["capture"])
+        if options["bench"] is not None:
+            capture = advisor.ShapeCapture()
+            try:
+                with capture:
+                    driver.run(options["bench"], options["requests"])
+            except RuntimeError as exc:
+                raise CommandError(str(exc))
+            samples += list(capture.samples.values())
+        if not samples:
+            raise CommandError("Nicio captură: folosește --capture FILE sau --bench.")
+
+        total_ms = sum(s.time for s in samples) * 1000
+        self.stdout.write(f"{len(samples)} șabloane SELECT, {sum(s.count for s in samples)} execuții, {total_ms:.0f} ms SQL")
+
+        proposals = advisor.measure(advisor.propose(samples), repeat=options["repeat"])
+        accepted = [p for p in proposals if p.used and p.saved_ms >= options["min_gain"]]
+
+        for p in proposals:
+            mark = self.style.SUCCESS("propus") if p in accepted else "respins"
+            share = p.saved_ms / total_ms if total_ms else 0.0
+            self.stdout.write(
+                f"\n{p.model._meta.label}({', '.join(p.fields)})  [{', '.join(p.reasons)}]  {mark}\n"
+                f"  {len(p.shapes)} șabloane, {p.executions} execuții; {p.before_ms:.2f} -> {p.after_ms:.2f} ms/interogare; "
+                f"câștig estimat {p.saved_ms:.0f} ms ({share:.0%} din timpul SQL capturat)"
+                + ("" if p.used else "; planul nu folosește indexul")
+            )
+            self.stdout.write(f"  {p.shapes[0].shape[:240]}")
+
+        if not accepted:
+            self.stdout.write("\nNicio propunere peste pragul de câștig.")
+            return
+
+        self.stdout.write("\nDe adăugat în Meta.indexes:")
+        for p in accepted:
+            self.stdout.write(f"  {p.model._meta.label}: models.Index(fields={p.fields!r})")
+
+        if options["write"]:
+            for path in advisor.write_migrations(accepted):
+                self.stdout.write(self.style.SUCCESS(f"Migrare scrisă: {path}"))
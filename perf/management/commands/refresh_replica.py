@@ -0,0 +1,31 @@
+import time
+
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management.base import BaseCommand, CommandError
+
+from perf import replica
+
+
+class Command(BaseCommand):
+    help = "Reîmprospătează snapshot-urile SQLite ale replicilor de raportare (REPORTING_REPLICAS)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("aliases", nargs="*", help="Implicit: toate replicile configurate.")
+        parser.add_argument("--every", type=int, default=0, metavar="SECONDS", help="Rulează în buclă.")
+
+    def handle(self, *args, **options):
+        aliases = options["aliases"] or list(replica.replicas().values())
+        if not aliases:
+            raise CommandError("Nicio replică în REPORTING_REPLICAS.")
+
+        while True:
+            for alias in aliases:
+                started = time.perf_counter()
+                try:
+                    path = replica.refresh_snapshot(alias)
+                except ImproperlyConfigured as exc:
+                    raise CommandError(str(exc))
+                self.stdout.write(f"{alias}: {path} ({time.perf_counter() - started:.2f}s)")
+            if not options["every"]:
+                return
+            time.sleep(options["every"])
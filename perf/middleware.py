@@ -0,0 +1,126 @@
+import logging
+import random
+
+from django.conf import settings
+
+from . import template_profiler
+from .queries import QueryBudgetExceeded, QueryRecorder
+
+logger = logging.getLogger("perf.templates")
+
+PROFILE_HEADER_ITEMS = 8
+
+
+class TemplateProfilerMiddleware:
+    """
+    Timp de randare per template / include pentru fiecare cerere:
+    antet Server-Timing + X-Template-Profile (top după timpul propriu) și log "perf.templates".
+    Pus primul în MIDDLEWARE ca să prindă și TemplateResponse-urile.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.active = template_profiler.enabled()
+        self.slow_ms = getattr(settings, "TEMPLATE_PROFILER_SLOW_MS", 50)
+
+    def __call__(self, request):
+        if not self.active:
+            return self.get_response(request)
+
+        template_profiler.start()
+        try:
+            response = self.get_response(request)
+        finally:
+            profile = template_profiler.stop()
+
+        if profile is None or not profile.stats:
+            return response
+
+        total_ms = profile.total * 1000
+        top = profile.top(PROFILE_HEADER_ITEMS)
+        response["Server-Timing"] = ", ".join(
+            filter(None, [response.get("Server-Timing"), f'tpl;dur={total_ms:.1f};desc="templates"'])
+        )
+        response["X-Template-Profile"] = ", ".join(
+            f"{s.name};self={s.self_time * 1000:.1f};total={s.total * 1000:.1f};n={s.calls}" for s in top
+        )
+
+        level = logging.WARNING if total_ms >= self.slow_ms else logging.DEBUG
+        if logger.isEnabledFor(level):
+            lines = "\n".join(
+                f"  {s.self_time * 1000:8.2f} ms self {s.total * 1000:8.2f} ms total {s.calls:4d}x  {s.name}"
+                for s in profile.top(len(profile.stats))
+            )
+            logger.log(level, "%s %s: %.1f ms în template-uri\n%s", request.method, request.path, total_ms, lines)
+        return response
+
+
+query_logger = logging.getLogger("perf.queries")
+
+
+class QueryBudgetMiddleware:
+    """
+    Numărul de interogări, timpul SQL și șabloanele repetate (N+1) per cerere.
+    DEBUG: antete X-Query-Count / X-Query-Time-Ms / X-Query-Repeated + Server-Timing.
+    View-urile cu @query_budget sunt verificate; QUERY_BUDGET_STRICT = True ridică excepție.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not getattr(settings, "QUERY_BUDGET", settings.DEBUG):
+            return self.get_response(request)
+
+        request.query_budget = None
+        with QueryRecorder() as rec:
+            response = self.get_response(request)
+            # TemplateResponse se randează înainte să ajungă aici
+        stats = rec.stats
+        repeated = stats.repeated()
+
+        if settings.DEBUG:
+            response["X-Query-Count"] = str(stats.count)
+            response["X-Query-Time-Ms"] = f"{stats.time * 1000:.1f}"
+            response["X-Query-Repeated"] = str(len(repeated))
+            response["Server-Timing"] = ", ".join(
+                filter(None, [response.get("Server-Timing"), f'sql;dur={stats.time * 1000:.1f};desc="{stats.count} queries"'])
+            )
+
+        budget = request.query_budget
+        violations = budget.violations(stats) if budget else []
+        if violations:
+            message = f"{request.method} {request.path}: " + "; ".join(violations)
+            if getattr(settings, "QUERY_BUDGET_STRICT", False):
+                raise QueryBudgetExceeded(message + "\n" + stats.report())
+            query_logger.warning("%s\n%s", message, stats.report())
+        elif repeated:
+            query_logger.info("%s %s: posibil N+1\n%s", request.method, request.path, stats.report())
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if hasattr(request, "query_budget"):
+            request.query_budget = getattr(view_func, "query_budget", None)
+        return None
+
+
+class QueryCaptureMiddleware:
+    """
+    Fereastră de eșantionare în producție pentru index_advisor: o fracțiune
+    QUERY_CAPTURE_RATE din cereri își scrie șabloanele SELECT (cu un exemplu) în QUERY_CAPTURE_FILE.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        rate = getattr(settings, "QUERY_CAPTURE_RATE", 0)
+        if not rate or random.random() >= rate:
+            return self.get_response(request)
+
+        from .advisor import ShapeCapture, append_capture
+
+        with ShapeCapture() as capture:
+            response = self.get_response(request)
+        append_capture(settings.QUERY_CAPTURE_FILE, capture.records())
+        return response
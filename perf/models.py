@@ -0,0 +1,15 @@
+from django.db import models
+
+
+class VersionStamp(models.Model):
+    """
+    Versiune partajată între procese pentru structurile ținute în memorie
+    (index catalog, navigare blog, index useri pentru @mention).
+    token e aleator, nu un contor: după un rollback valoarea anulată nu reapare.
+    """
+    key = models.CharField(max_length=64, primary_key=True)
+    token = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.key}={self.token}"
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import unicodedata
+
+from django.db import migrations
+from django.db.models import CharField, TextField
+from django.db.models.lookups import IContains
+
+# ============================================================
+# Căutare insensibilă la diacritice + indexuri trigram (Postgres)
+# ============================================================
+
+# IMMUTABLE în Postgres (unaccent() e doar STABLE, deci nu poate intra într-un index);
+# în SQLite e o funcție Python înregistrată la conectare (perf/sqlite.py)
+UNACCENT_FUNCTION = "vx_unaccent"
+
+SETUP_SQL = f"""
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE EXTENSION IF NOT EXISTS unaccent;
+CREATE OR REPLACE FUNCTION {UNACCENT_FUNCTION}(text) RETURNS text
+    LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+    AS $$ SELECT public.unaccent('public.unaccent'::regdictionary, $1) $$;
+"""
+
+
+def strip_accents(value):
+    # ș/ş -> s, ț/ţ -> t, ă/â -> a, î -> i (ca unaccent din Postgres)
+    if value is None:
+        return None
+    s = unicodedata.normalize("NFKD", str(value))
+    return "".join(ch for ch in s if not unicodedata.combining(ch))
+
+
+@CharField.register_lookup
+@TextField.register_lookup
+class UnaccentIContains(IContains):
+    """
+    field__uicontains="sectiune" găsește și "Secțiune". Expresia din stânga
+    e aceeași cu cea din indexul trigram (trigram_index(..., unaccent=True)).
+    """
+
+    lookup_name = "uicontains"
+
+    def process_lhs(self, compiler, connection, lhs=None):
+        sql, params = super().process_lhs(compiler, connection, lhs)
+        return f"UPPER({UNACCENT_FUNCTION}({sql}))", params
+
+    def get_rhs_op(self, connection, rhs):
+        rhs = f"UPPER({UNACCENT_FUNCTION}({rhs}))"
+        if hasattr(self.rhs, "as_sql") or self.bilateral_transforms:
+            # ex: F("alt_camp"): pattern-ul %...% se construiește în SQL
+            return connection.pattern_ops["contains"].format(connection.pattern_esc).format(rhs)
+        # "contains": LIKE cu escape-ul backend-ului; pattern-ul %q% vine din IContains
+        return connection.operators["contains"] % rhs
+
+
+# ============================================================
+# Operații de migrare doar pentru Postgres
+# ============================================================
+
+class PostgresOnlySQL(migrations.RunSQL):
+    """
+    RunSQL rulat doar pe Postgres; pe SQLite e no-op (același set de migrări pe ambele).
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == "postgresql":
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == "postgresql":
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+
+    def describe(self):
+        return "Raw SQL (doar PostgreSQL)"
+
+
+def search_setup() -> PostgresOnlySQL:
+    # idempotent: fiecare aplicație îl include înaintea indexurilor ei (și în baza de analytics)
+    return PostgresOnlySQL(SETUP_SQL, migrations.RunSQL.noop)
+
+
+def trigram_index(table: str, column: str, unaccent: bool = False) -> PostgresOnlySQL:
+    """
+    GIN gin_trgm_ops pe expresia generată de icontains (UPPER(col::text))
+    sau de uicontains (UPPER(vx_unaccent(col))), ca LIKE '%q%' să folosească indexul.
+    """
+    if unaccent:
+        expr, suffix = f'UPPER({UNACCENT_FUNCTION}("{column}"))', "utrgm"
+    else:
+        expr, suffix = f'UPPER("{column}"::text)', "trgm"
+    name = f"{table}_{column}_{suffix}"[:63]
+    return PostgresOnlySQL(
+        f'CREATE INDEX IF NOT EXISTS "{name}" ON "{table}" USING gin (({expr}) gin_trgm_ops);',
+        f'DROP INDEX IF EXISTS "{name}";',
+    )
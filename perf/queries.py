@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import connections
+
+# ============================================================
+# Înregistrare interogări SQL (per cerere / per bloc de cod)
+# ============================================================
+
+_IN_LIST_RE = re.compile(r"\b(IN\s*)\((?:\s*%s\s*,)*\s*%s\s*\)", re.IGNORECASE)
+_STRING_RE = re.compile(r"'(?:''|[^'])*'")
+_NUMBER_RE = re.compile(r"(?<![\w.\"])-?\d+(?:\.\d+)?\b")
+_SPACE_RE = re.compile(r"\s+")
+
+
+def query_shape(sql: str) -> str:
+    """
+    Forma interogării: literalii și listele IN (%s, %s, ...) de lungimi diferite
+    devin același șablon, ca să se numere împreună.
+    """
+    sql = _STRING_RE.sub("?", sql)
+    sql = _NUMBER_RE.sub("?", sql)
+    sql = _IN_LIST_RE.sub(r"\1(%s...)", sql)
+    return _SPACE_RE.sub(" ", sql).strip()
+
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    time: float = 0.0
+    shapes: Counter = field(default_factory=Counter)
+    shape_time: Dict[str, float] = field(default_factory=dict)
+
+    def repeated(self, threshold: Optional[int] = None) -> List[Tuple[str, int]]:
+        """
+        Șabloanele rulate de mai mult de `threshold` ori (N+1), descrescător.
+        """
+        k = nplusone_threshold() if threshold is None else threshold
+        return [(shape, n) for shape, n in self.shapes.most_common() if n > k]
+
+    def report(self, limit: int = 5) -> str:
+        lines = [f"{self.count} interogări, {self.time * 1000:.1f} ms SQL"]
+        for shape, n in self.repeated()[:limit]:
+            lines.append(f"  {n}x ({self.shape_time[shape] * 1000:.1f} ms)  {shape[:300]}")
+        return "\n".join(lines)
+
+
+def nplusone_threshold() -> int:
+    return int(getattr(settings, "QUERY_NPLUSONE_THRESHOLD", 5))
+
+
+class QueryRecorder:
+    """
+    with QueryRecorder() as rec: ...  ->  rec.stats
+    Folosește execute_wrapper pe toate conexiunile (inclusiv alias-uri suplimentare).
+    """
+
+    def __init__(self):
+        self.stats = QueryStats()
+        self._stack: Optional[ExitStack] = None
+
+    def __call__(self, execute, sql, params, many, context):
+        t0 = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - t0
+            shape = query_shape(sql)
+            st = self.stats
+            st.count += 1
+            st.time += elapsed
+            st.shapes[shape] += 1
+            st.shape_time[shape] = st.shape_time.get(shape, 0.0) + elapsed
+
+    def __enter__(self) -> "QueryRecorder":
+        self._stack = ExitStack()
+        for conn in connections.all():
+            self._stack.enter_context(conn.execute_wrapper(self))
+        return self
+
+    def __exit__(self, *exc):
+        self._stack.close()
+        self._stack = None
+        return False
+
+
+# ============================================================
+# Buget declarat pe view
+# ============================================================
+
+@dataclass(frozen=True)
+class QueryBudget:
+    max_queries: int
+    # de câte ori are voie să se repete același șablon (None = pragul global)
+    max_repeats: Optional[int] = None
+
+    def violations(self, stats: QueryStats) -> List[str]:
+        out = []
+        if stats.count > self.max_queries:
+            out.append(f"{stats.count} interogări > buget {self.max_queries}")
+        limit = nplusone_threshold() if self.max_repeats is None else self.max_repeats
+        for shape, n in stats.repeated(limit):
+            out.append(f"N+1: {n}x {shape[:200]}")
+        return out
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+def query_budget(max_queries: int, max_repeats: Optional[int] = None):
+    """
+    @query_budget(12) pe un view: QueryBudgetMiddleware verifică numărul de interogări
+    (log în DEBUG, excepție cu QUERY_BUDGET_STRICT = True, ex. în teste).
+    """
+    budget = QueryBudget(max_queries, max_repeats)
+
+    def decorator(view):
+        view.query_budget = budget
+        return view
+
+    return decorator
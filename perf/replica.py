@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Dict, Optional
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections, router
+
+# ============================================================
+# Replică de raportare (citiri lungi: exporturi, analytics, dashboard, căutări)
+# ============================================================
+
+# cât de des se reverifică întârzierea unei replici (secunde)
+CHECK_INTERVAL = 5
+
+_active: ContextVar[bool] = ContextVar("reporting", default=False)
+_lag_cache: Dict[str, tuple] = {}
+_lag_lock = threading.Lock()
+
+
+def replicas() -> Dict[str, str]:
+    # REPORTING_REPLICAS = {alias principal: alias replică}; doar aliasurile configurate
+    mapping = getattr(settings, "REPORTING_REPLICAS", {})
+    return {p: r for p, r in mapping.items() if p in settings.DATABASES and r in settings.DATABASES}
+
+
+def primary_of(alias: str) -> str:
+    for primary, replica in replicas().items():
+        if replica == alias:
+            return primary
+    return alias
+
+
+def max_lag() -> float:
+    return float(getattr(settings, "REPORTING_MAX_LAG", 900))
+
+
+@contextmanager
+def reporting():
+    """
+    Citirile din bloc (sau din view-ul decorat cu @reporting()) merg pe replică,
+    dacă e configurată și suficient de proaspătă; altfel pe baza principală.
+    Scrierile rămân mereu pe baza principală.
+    """
+    token = _active.set(True)
+    try:
+        yield
+    finally:
+        _active.reset(token)
+
+
+def in_reporting() -> bool:
+    return _active.get()
+
+
+def for_reporting(qs):
+    """
+    Queryset marcat explicit pentru replică (în afara unui bloc reporting()).
+    """
+    alias = replica_for(qs.db)
+    return qs.using(alias) if alias else qs
+
+
+# ============================================================
+# Prospețime
+# ============================================================
+
+def _measure_lag(alias: str) -> Optional[float]:
+    conn = connections[alias]
+    if conn.vendor == "sqlite":
+        # snapshot: vârsta = momentul începerii copiei (mtime setat de refresh_snapshot)
+        path = conn.settings_dict["NAME"]
+        if not os.path.exists(path):
+            return None
+        return max(0.0, time.time() - os.path.getmtime(path))
+
+    try:
+        with conn.cursor() as c:
+            if conn.vendor == "postgresql":
+                c.execute(
+                    "SELECT CASE WHEN NOT pg_is_in_recovery() THEN 0 "
+                    "WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+                    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+                )
+                return float(c.fetchone()[0])
+            c.execute("SELECT 1")
+            return 0.0
+    except DatabaseError:
+        return None
+
+
+def lag(alias: str) -> Optional[float]:
+    """
+    Întârzierea replicii în secunde (None = indisponibilă), cache-uită CHECK_INTERVAL secunde.
+    """
+    now = time.monotonic()
+    with _lag_lock:
+        cached = _lag_cache.get(alias)
+        if cached and now - cached[0] < CHECK_INTERVAL:
+            return cached[1]
+    value = _measure_lag(alias)
+    with _lag_lock:
+        _lag_cache[alias] = (now, value)
+    return value
+
+
+def replica_for(primary: str) -> Optional[str]:
+    alias = replicas().get(primary)
+    if alias is None:
+        return None
+    value = lag(alias)
+    if value is None or value > max_lag():
+        return None
+    return alias
+
+
+# ============================================================
+# Router
+# ============================================================
+
+class ReplicaRouter:
+    """
+    Primul în DATABASE_ROUTERS: în reporting() trimite citirile pe replica aliasului
+    ales de celelalte routere; în rest nu decide nimic (cu excepția instanțelor
+    încărcate din replică, ale căror relații / salvări revin pe baza principală).
+    """
+
+    def _primary(self, method: str, model, **hints) -> str:
+        for r in router.routers:
+            if r is self or not hasattr(r, method):
+                continue
+            alias = getattr(r, method)(model, **hints)
+            if alias:
+                return primary_of(alias)
+        instance = hints.get("instance")
+        if instance is not None and instance._state.db:
+            return primary_of(instance._state.db)
+        return DEFAULT_DB_ALIAS
+
+    def _from_replica(self, **hints) -> bool:
+        instance = hints.get("instance")
+        return instance is not None and instance._state.db in replicas().values()
+
+    def db_for_read(self, model, **hints):
+        if in_reporting():
+            primary = self._primary("db_for_read", model, **hints)
+            return replica_for(primary) or primary
+        if self._from_replica(**hints):
+            return self._primary("db_for_read", model, **hints)
+        return None
+
+    def db_for_write(self, model, **hints):
+        if in_reporting() or self._from_replica(**hints):
+            return self._primary("db_for_write", model, **hints)
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        if obj1._state.db in replicas().values() or obj2._state.db in replicas().values():
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # replica e o copie (snapshot) sau o replică fizică: nu se migrează separat
+        if db in replicas().values():
+            return False
+        return None
+
+
+# ============================================================
+# Snapshot SQLite (online backup API)
+# ============================================================
+
+def refresh_snapshot(alias: str) -> Path:
+    """
+    Copiază baza principală în fișierul replicii: backup consistent (WAL: fără să
+    blocheze scrierile) într-un fișier temporar, apoi înlocuire atomică.
+    Conexiunile deja deschise citesc în continuare copia veche (CONN_MAX_AGE = 0 pe replică).
+    """
+    primary = primary_of(alias)
+    if primary == alias:
+        raise ImproperlyConfigured(f"'{alias}' nu e în REPORTING_REPLICAS.")
+    source, target = connections[primary], connections[alias]
+    if source.vendor != "sqlite" or target.vendor != "sqlite":
+        raise ImproperlyConfigured("Snapshot-ul e doar pentru SQLite; o replică Postgres se actualizează singură.")
+
+    path = Path(target.settings_dict["NAME"])
+    tmp = path.with_name(path.name + ".tmp")
+    started = time.time()
+
+    src = sqlite3.connect(source.settings_dict["NAME"])
+    dst = sqlite3.connect(tmp)
+    try:
+        src.backup(dst)
+        # copia se deschide doar pentru citire: fără fișiere -wal/-shm lângă ea
+        dst.execute("PRAGMA journal_mode=DELETE")
+    finally:
+        dst.close()
+        src.close()
+
+    # vârsta snapshot-ului = momentul la care a început copia
+    os.utime(tmp, (started, started))
+    os.replace(tmp, path)
+
+    with _lag_lock:
+        _lag_cache.pop(alias, None)
+    return path
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import functools
+import random
+import time
+from typing import Optional
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+from .postgres import UNACCENT_FUNCTION, strip_accents
+
+# ============================================================
+# Profil SQLite de producție
+# ============================================================
+
+DEFAULT_PRAGMAS = {
+    "journal_mode": "WAL",  # cititorii nu mai blochează scriitorul (și invers)
+    "synchronous": "NORMAL",  # sigur cu WAL; fsync doar la checkpoint
+    "busy_timeout": 5000,  # ms de așteptare pe lock înainte de "database is locked"
+    "cache_size": -65536,  # KiB (64 MB) per conexiune
+    "mmap_size": 268435456,  # 256 MB citiri prin mmap
+    "temp_store": "MEMORY",
+}
+
+# fără profilul de producție: doar pragma-uri per conexiune. journal_mode=WAL e
+# persistent în fișier și lasă db.sqlite3-wal / -shm lângă baza din checkout
+DEV_PRAGMAS = {
+    "busy_timeout": 5000,
+}
+
+
+def _pragmas(conn) -> dict:
+    # per alias: DATABASES[alias]["PRAGMAS"]; altfel SQLITE_PRAGMAS doar cu SQLITE_PRODUCTION_PROFILE
+    if "PRAGMAS" in conn.settings_dict:
+        return conn.settings_dict["PRAGMAS"] or {}
+    if getattr(settings, "SQLITE_PRODUCTION_PROFILE", False):
+        return getattr(settings, "SQLITE_PRAGMAS", DEFAULT_PRAGMAS)
+    return DEV_PRAGMAS
+
+
+def _lock_retries(conn) -> int:
+    return int(conn.settings_dict.get("LOCK_RETRIES", getattr(settings, "SQLITE_LOCK_RETRIES", 5)))
+
+
+def is_locked_error(exc: BaseException) -> bool:
+    msg = str(exc).lower()
+    return isinstance(exc, OperationalError) and ("database is locked" in msg or "database table is locked" in msg)
+
+
+def backoff(attempt: int, base: float = 0.02, cap: float = 1.0) -> float:
+    # exponențial cu jitter complet
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class LockRetry:
+    """
+    execute_wrapper: reia instrucțiunea la "database is locked" doar când e sigur —
+    în autocommit (o singură instrucțiune) sau la BEGIN IMMEDIATE (încă nimic scris).
+    """
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __call__(self, execute, sql, params, many, context):
+        attempt = 0
+        while True:
+            try:
+                return execute(sql, params, many, context)
+            except OperationalError as exc:
+                retries = _lock_retries(self.conn)
+                safe = not self.conn.in_atomic_block or sql.lstrip().upper().startswith("BEGIN")
+                if not (is_locked_error(exc) and safe and attempt < retries):
+                    raise
+                time.sleep(backoff(attempt))
+                attempt += 1
+
+
+@receiver(connection_created)
+def configure_sqlite(sender, connection, **kwargs):
+    if connection.vendor != "sqlite":
+        return
+
+    # direct pe conexiunea sqlite3 (autocommit): journal_mode nu se poate schimba într-o tranzacție
+    for name, value in _pragmas(connection).items():
+        connection.connection.execute(f"PRAGMA {name}={value}")
+
+    # același SQL ca în Postgres pentru __uicontains (perf/postgres.py)
+    connection.connection.create_function(UNACCENT_FUNCTION, 1, strip_accents, deterministic=True)
+
+    if not any(isinstance(w, LockRetry) for w in connection.execute_wrappers):
+        connection.execute_wrappers.append(LockRetry(connection))
+
+
+def retry_on_locked(func=None, *, using: Optional[str] = None, retries: Optional[int] = None):
+    """
+    Reia o funcție tranzacțională întreagă dacă iese cu "database is locked".
+    Doar din afara unui atomic (altfel tranzacția exterioară e deja compromisă).
+    """
+
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            conn = connections[using or DEFAULT_DB_ALIAS]
+            limit = _lock_retries(conn) if retries is None else retries
+            attempt = 0
+            while True:
+                try:
+                    return fn(*args, **kwargs)
+                except OperationalError as exc:
+                    if conn.in_atomic_block or not is_locked_error(exc) or attempt >= limit:
+                        raise
+                    time.sleep(backoff(attempt))
+                    attempt += 1
+
+        return wrapper
+
+    return decorator(func) if func is not None else decorator
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.template.base import Template
+
+# ============================================================
+# Profiler pentru randarea template-urilor (per cerere)
+# ============================================================
+
+
+@dataclass
+class TemplateStat:
+    name: str
+    calls: int = 0
+    total: float = 0.0  # inclusiv include-uri / extends
+    self_time: float = 0.0  # fără template-urile randate în interior
+
+
+@dataclass
+class RenderProfile:
+    stats: Dict[str, TemplateStat] = field(default_factory=dict)
+    # (nume template, timp acumulat de copii) pentru template-urile în curs
+    stack: List[list] = field(default_factory=list)
+    total: float = 0.0
+
+    def top(self, n: int = 10) -> List[TemplateStat]:
+        return sorted(self.stats.values(), key=lambda s: -s.self_time)[:n]
+
+
+_state = threading.local()
+
+
+def enabled() -> bool:
+    return bool(getattr(settings, "TEMPLATE_PROFILER", settings.DEBUG))
+
+
+def start() -> RenderProfile:
+    _state.profile = RenderProfile()
+    return _state.profile
+
+
+def stop() -> Optional[RenderProfile]:
+    profile = getattr(_state, "profile", None)
+    _state.profile = None
+    return profile
+
+
+def _profiled_render(original):
+    def _render(self, context):
+        profile = getattr(_state, "profile", None)
+        if profile is None:
+            return original(self, context)
+
+        name = self.origin.template_name if self.origin and self.origin.template_name else "<string>"
+        frame = [name, 0.0]
+        profile.stack.append(frame)
+        t0 = time.perf_counter()
+        try:
+            return original(self, context)
+        finally:
+            elapsed = time.perf_counter() - t0
+            profile.stack.pop()
+
+            st = profile.stats.get(name)
+            if st is None:
+                st = profile.stats[name] = TemplateStat(name)
+            st.calls += 1
+            st.total += elapsed
+            st.self_time += elapsed - frame[1]
+
+            if profile.stack:
+                profile.stack[-1][1] += elapsed
+            else:
+                profile.total += elapsed
+
+    _render._profiled = True
+    return _render
+
+
+def install() -> None:
+    """
+    Înfășoară Template._render (o singură dată); costul e un getattr pe thread-local
+    când profilerul nu e pornit pentru cererea curentă.
+    """
+    if not enabled() or getattr(Template._render, "_profiled", False):
+        return
+    Template._render = _profiled_render(Template._render)
@@ -0,0 +1,37 @@
+from contextlib import contextmanager
+from typing import Optional
+
+from django.test.utils import override_settings
+
+from .queries import QueryBudget, QueryBudgetExceeded, QueryRecorder
+
+# testele rulează fără DEBUG și fără collectstatic: {% static %} / {% asset %}
+# nu au manifest, deci URL-urile vin din storage-ul simplu
+plain_static_storage = override_settings(STORAGES={
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+})
+
+
+@contextmanager
+def assert_query_budget(max_queries: int, max_repeats: Optional[int] = None):
+    """
+    with assert_query_budget(10): client.get(url)
+    Eșuează dacă se depășește numărul de interogări sau dacă un șablon se repetă (N+1).
+    """
+    with QueryRecorder() as rec:
+        yield rec
+    violations = QueryBudget(max_queries, max_repeats).violations(rec.stats)
+    if violations:
+        raise QueryBudgetExceeded("; ".join(violations) + "\n" + rec.stats.report())
+
+
+class QueryBudgetTestMixin:
+    """
+    Pentru TestCase: orice view cu @query_budget care își depășește bugetul
+    face testul să pice (QueryBudgetExceeded prin client).
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.enterContext(override_settings(QUERY_BUDGET=True, QUERY_BUDGET_STRICT=True))
@@ -0,0 +1,216 @@
+import importlib
+import shutil
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+from django.db import router
+from django.template.base import Template
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from accounts.models import User
+from analytics.models import PageView
+from documents.models import Document
+from website.models import ContactMessage
+
+from . import advisor, postgres, replica, sqlite, template_profiler
+from .bench import driver
+from .testing import plain_static_storage
+
+
+@plain_static_storage
+@override_settings(ALLOWED_HOSTS=[])
+class BenchDriverTests(TestCase):
+    databases = {"default", "analytics"}
+
+    def test_anonymous_endpoint_is_served_without_allowed_hosts(self):
+        report = driver.run(["home"], requests=2)
+        self.assertEqual(report["results"][0]["errors"], 0)
+
+    def test_failed_requests_stop_the_run(self):
+        missing = driver.Endpoint("missing", lambda: "/nu-exista/")
+        with self.assertRaisesMessage(RuntimeError, "404 x2"):
+            driver.run_endpoint(missing, requests=2, warmup=0)
+
+    def test_errors_are_a_regression_and_not_a_baseline(self):
+        row = {"name": "home", "p95_ms": 10.0, "queries_max": 5, "errors": 0}
+        report = {"results": [{**row, "errors": 3}]}
+
+        rows = driver.compare(report, {"results": [row]})
+        self.assertTrue(rows[0]["regression"])
+        with self.assertRaises(RuntimeError):
+            driver.save_baseline(report, "nu-se-salveaza")
+
+
+class SqlitePragmaTests(SimpleTestCase):
+    def pragmas(self, **settings_dict):
+        return sqlite._pragmas(SimpleNamespace(settings_dict=settings_dict))
+
+    @override_settings(SQLITE_PRODUCTION_PROFILE=False)
+    def test_checkout_keeps_its_journal_mode(self):
+        self.assertNotIn("journal_mode", self.pragmas())
+
+    @override_settings(SQLITE_PRODUCTION_PROFILE=True, SQLITE_PRAGMAS={"journal_mode": "WAL"})
+    def test_production_profile_and_alias_override(self):
+        self.assertEqual(self.pragmas(), {"journal_mode": "WAL"})
+        self.assertEqual(self.pragmas(PRAGMAS={"query_only": 1}), {"query_only": 1})
+
+
+class ReplicaRouterTests(SimpleTestCase):
+    def lag(self, value):
+        self.enterContext(mock.patch.dict(replica._lag_cache, clear=True))
+        self.enterContext(mock.patch.object(replica, "_measure_lag", return_value=value))
+
+    def test_fresh_replica_serves_reporting_reads(self):
+        self.lag(10)
+        with replica.reporting():
+            self.assertEqual(router.db_for_read(Document), "replica")
+            self.assertEqual(router.db_for_read(PageView), "analytics_replica")
+        self.assertEqual(router.db_for_read(Document), "default")
+
+    def test_missing_or_stale_replica_falls_back_to_primary(self):
+        for value in (None, replica.max_lag() + 1):
+            self.lag(value)
+            with replica.reporting():
+                self.assertEqual(router.db_for_read(Document), "default")
+                self.assertEqual(router.db_for_read(PageView), "analytics")
+
+    def test_writes_always_go_to_the_primary(self):
+        self.lag(10)
+        loaded = Document()
+        loaded._state.db = "replica"
+        with replica.reporting():
+            self.assertEqual(router.db_for_write(Document), "default")
+            self.assertEqual(router.db_for_write(PageView), "analytics")
+        self.assertEqual(router.db_for_write(Document, instance=loaded), "default")
+        self.assertFalse(router.allow_migrate("replica", "documents"))
+
+
+class PostgresProfileTests(SimpleTestCase):
+    TRIGRAM_MIGRATIONS = [
+        "accounts.migrations.0002_trigram_indexes",
+        "documents.migrations.0006_trigram_indexes",
+        "analytics.migrations.0003_trigram_indexes",
+        "website.migrations.0007_search_indexes",
+    ]
+
+    def test_settings_module_imports(self):
+        settings_postgres = importlib.import_module("vertix_site.settings_postgres")
+        for alias in ("default", "analytics"):
+            self.assertEqual(settings_postgres.DATABASES[alias]["ENGINE"], "django.db.backends.postgresql")
+        self.assertNotEqual(settings_postgres.DATABASES["default"]["NAME"], settings_postgres.DATABASES["analytics"]["NAME"])
+
+    def run_postgres_only(self, vendor):
+        editor = mock.MagicMock()
+        editor.connection.vendor = vendor
+        editor.connection.alias = "default"
+        editor.connection.ops.prepare_sql_script.side_effect = lambda sql: [sql]
+        for name in self.TRIGRAM_MIGRATIONS:
+            migration = importlib.import_module(name).Migration
+            app_label = name.split(".")[0]
+            for op in migration.operations:
+                if isinstance(op, postgres.PostgresOnlySQL):
+                    op.database_forwards(app_label, editor, None, None)
+        return [c.args[0] for c in editor.execute.call_args_list]
+
+    def test_trigram_migrations_are_noops_on_sqlite(self):
+        self.assertEqual(self.run_postgres_only("sqlite"), [])
+
+        statements = self.run_postgres_only("postgresql")
+        self.assertIn(
+            'CREATE INDEX IF NOT EXISTS "accounts_user_company_name_utrgm" ON "accounts_user" '
+            'USING gin ((UPPER(vx_unaccent("company_name"))) gin_trgm_ops);',
+            statements,
+        )
+
+
+class UnaccentLookupTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("ana@example.com", "x", company_name="Secțiune Ștanțare SRL")
+        User.objects.create_user("dan@example.com", "x", company_name="Sector 5_0% SRL")
+
+    def matches(self, q):
+        return list(User.objects.filter(company_name__uicontains=q).values_list("email", flat=True))
+
+    def test_matches_across_diacritics_and_case(self):
+        for q in ("sectiune", "SECȚIUNE", "stantare", "ştanţare"):
+            self.assertEqual(self.matches(q), ["ana@example.com"], q)
+
+    def test_pattern_characters_are_literal(self):
+        self.assertEqual(self.matches("5_0%"), ["dan@example.com"])
+        self.assertEqual(self.matches("%"), ["dan@example.com"])
+        self.assertEqual(self.matches("_"), ["dan@example.com"])
+
+
+class IndexAdvisorTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        ContactMessage.objects.bulk_create(
+            [ContactMessage(name=f"N{i}", email=f"c{i % 3}@example.com", message="x") for i in range(6)]
+        )
+
+    def capture(self, queryset):
+        capture = advisor.ShapeCapture()
+        with capture:
+            for _ in range(2):
+                list(queryset.all())
+        return list(capture.samples.values())
+
+    def test_captured_query_gets_an_equality_then_order_index(self):
+        samples = self.capture(ContactMessage.objects.filter(email="c1@example.com").order_by("-created_at"))
+        self.assertEqual([(s.alias, s.count) for s in samples], [("default", 2)])
+
+        [proposal] = advisor.propose(samples)
+        self.assertEqual(proposal.model, ContactMessage)
+        self.assertEqual(proposal.fields, ["email", "created_at"])
+        self.assertEqual(proposal.reasons, ["scan", "sort"])
+        self.assertEqual(proposal.index.fields, ["email", "created_at"])
+
+    def test_lookup_by_primary_key_needs_nothing(self):
+        pk = ContactMessage.objects.values_list("pk", flat=True).first()
+        self.assertEqual(advisor.propose(self.capture(ContactMessage.objects.filter(pk=pk))), [])
+
+    def test_capture_files_are_merged_by_shape(self):
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp)
+        path = Path(tmp) / "capture.jsonl"
+        for email in ("c1@example.com", "c2@example.com"):
+            samples = self.capture(ContactMessage.objects.filter(email=email))
+            advisor.append_capture(path, [s.__dict__ for s in samples])
+
+        [merged] = advisor.load_capture([path])
+        self.assertEqual((merged.count, merged.params), (4, ["c1@example.com"]))
+
+
+@plain_static_storage
+class ProfilerHeaderTests(TestCase):
+    databases = {"default", "analytics"}
+    HEADERS = ("Server-Timing", "X-Template-Profile", "X-Query-Count")
+
+    def headers(self):
+        response = self.client.get(reverse("home"))
+        self.assertEqual(response.status_code, 200)
+        return {name: response.get(name) for name in self.HEADERS}
+
+    @override_settings(TEMPLATE_PROFILER=False, DEBUG=False)
+    def test_nothing_is_exposed_when_disabled(self):
+        self.assertEqual(self.headers(), dict.fromkeys(self.HEADERS))
+
+    @override_settings(TEMPLATE_PROFILER=True, DEBUG=False)
+    def test_template_profile(self):
+        # test runner-ul înlocuiește Template._render (semnalul template_rendered) după install()
+        self.enterContext(mock.patch.object(Template, "_render", template_profiler._profiled_render(Template._render)))
+        headers = self.headers()
+        self.assertRegex(headers["Server-Timing"], r'^tpl;dur=[\d.]+;desc="templates"$')
+        self.assertIn("website/partials/_navbar.html;self=", headers["X-Template-Profile"])
+        self.assertIsNone(headers["X-Query-Count"])
+
+    @override_settings(TEMPLATE_PROFILER=False, DEBUG=True)
+    def test_query_count_only_in_debug(self):
+        headers = self.headers()
+        self.assertGreater(int(headers["X-Query-Count"]), 0)
+        self.assertRegex(headers["Server-Timing"], r'^sql;dur=[\d.]+;desc="\d+ queries"$')
+        self.assertIsNone(headers["X-Template-Profile"])
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import secrets
+import threading
+import time
+from typing import Optional, Tuple
+
+from django.db import router, transaction
+
+from .models import VersionStamp
+
+# cât de des verifică un proces versiunea din baza de date (secunde)
+CHECK_INTERVAL = 1.0
+
+
+def _db() -> str:
+    # mereu baza principală: o replică de raportare ar întoarce o versiune veche
+    return router.db_for_write(VersionStamp)
+
+
+def current(key: str) -> int:
+    return VersionStamp.objects.using(_db()).filter(key=key).values_list("token", flat=True).first() or 0
+
+
+def bump(key: str) -> Tuple[int, int]:
+    """
+    Versiune nouă pentru key, în tranzacția curentă (un rollback o anulează).
+    Întoarce (versiunea anterioară, versiunea nouă).
+    """
+    new = secrets.randbits(62) + 1
+    db = _db()
+    with transaction.atomic(using=db):
+        old = (
+            VersionStamp.objects.using(db).select_for_update()
+            .filter(key=key).values_list("token", flat=True).first()
+        )
+        VersionStamp.objects.using(db).update_or_create(key=key, defaults={"token": new})
+    return old or 0, new
+
+
+class VersionWatcher:
+    """
+    Versiunea partajată văzută de o structură din memoria procesului.
+    Baza de date se citește cel mult o dată la `interval` secunde, deci o
+    modificare făcută în alt proces e vizibilă după cel mult atât.
+
+        if watcher.stale():
+            rebuild()
+            watcher.synced()
+    """
+
+    def __init__(self, key: str, interval: Optional[float] = None):
+        self.key = key
+        self.interval = CHECK_INTERVAL if interval is None else interval
+        self.token: Optional[int] = None
+        self._pending: Optional[int] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def stale(self) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            if self.token is not None and now - self._checked_at < self.interval:
+                return False
+            # versiunea se citește înainte de reconstruire: o scriere concurentă
+            # produce o versiune nouă, deci cel mult o reconstruire în plus
+            found = current(self.key)
+            self._checked_at = now
+            if found == self.token:
+                return False
+            self._pending = found
+            return True
+
+    def synced(self) -> None:
+        with self._lock:
+            self.token = self._pending
+
+    def bump(self) -> int:
+        """
+        Procesul care scrie și-a actualizat deja structura: rămâne "la zi" doar
+        dacă nimeni altcineva nu a schimbat versiunea între timp.
+        """
+        old, new = bump(self.key)
+        with self._lock:
+            self.token = new if self.token is not None and self.token == old else None
+        return new
+
+    def reset(self) -> None:
+        with self._lock:
+            self.token = None
+
+    def current(self) -> int:
+        """
+        Versiunea (verificată cu aceeași limită de timp), de folosit în chei de cache.
+        """
+        if self.stale():
+            self.synced()
+        return self.token or 0
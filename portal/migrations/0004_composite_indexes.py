@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-19 17:04
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portal', '0003_alter_abuseevent_user'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='publicrequest',
+            index=models.Index(fields=['user', 'created_at'], name='portal_publ_user_id_ad24cc_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='publicrequest',
+            index=models.Index(fields=['created_at'], name='portal_publ_created_3232d8_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(fields=['created_by', 'created_at'], name='portal_tick_created_8debd7_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(fields=['assigned_to', 'created_at'], name='portal_tick_assigne_f53d6e_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(fields=['created_at'], name='portal_tick_created_615757_idx'),
+        ),
+    ]
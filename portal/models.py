@@ -5,7 +5,10 @@ from django.utils import timezone
 
 class AbuseEvent(models.Model):
     ip = models.GenericIPAddressField(null=True, blank=True)
-    user = models.ForeignKey(settings.AUTH_USER_MODEL, null=True, blank=True, on_delete=models.SET_NULL)
+    # în baza de analytics (analytics/routers.py): fără FK în DB spre User
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, null=True, blank=True, on_delete=models.DO_NOTHING, db_constraint=False
+    )
     path = models.CharField(max_length=255, blank=True)
     reason = models.CharField(max_length=120)
     user_agent = models.CharField(max_length=255, blank=True)
@@ -50,6 +53,13 @@ class Ticket(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            # listele din dashboard: per client / per tehnician, cele mai noi primele
+            models.Index(fields=["created_by", "created_at"]),
+            models.Index(fields=["assigned_to", "created_at"]),
+            # admin/manager: toate, după dată (propus de index_advisor)
+            models.Index(fields=["created_at"]),
+        ]
 
     def __str__(self):
         return f"{self.subject} ({self.status or '-'})"
@@ -114,6 +124,10 @@ class PublicRequest(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["user", "created_at"]),
+            models.Index(fields=["created_at"]),
+        ]
 
     def __str__(self):
         return f"{self.email} - {self.status or ''}".strip()
@@ -128,3 +142,11 @@ class PublicRequestAttachment(models.Model):
         return self.file.name
 
 
+
+# modelele de chat stau în models_chat.py; importul le înregistrează la încărcarea app-ului
+from .models_chat import (  # noqa: E402,F401
+    TicketMessage,
+    TicketMessageAttachment,
+    TicketMessageMention,
+    TicketMessageRead,
+)
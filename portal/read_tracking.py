@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import threading
+from typing import Dict, Optional, Tuple
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import connections, router, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from .chat_permissions import is_staff_user
+from .models_chat import TicketMessage, TicketMessageRead
+
+# ============================================================
+# Citire chat: "citit până la mesajul X" (TicketMessageRead)
+# ============================================================
+#
+# - scriere doar dacă mesajul e mai nou decât ce e deja salvat (_known)
+# - o singură instrucțiune INSERT ... ON CONFLICT DO UPDATE, după commit:
+#   marcajul e în bază înainte de următoarea cerere (badge-uri din orice proces)
+# - valoarea salvată nu scade niciodată (guard în ON CONFLICT)
+
+Key = Tuple[int, int, int]  # (user_id, content_type_id, object_id)
+
+# rânduri per INSERT (limita de parametri SQLite)
+BATCH_SIZE = 500
+# ultimul last_read_message_id cunoscut ca salvat; limitat ca mărime
+KNOWN_MAX = 50_000
+
+_lock = threading.Lock()
+_known: Dict[Key, int] = {}
+
+
+def _ct_id(target) -> int:
+    if isinstance(target, ContentType):
+        return target.pk
+    if isinstance(target, int):
+        return target
+    return ContentType.objects.get_for_model(target).pk
+
+
+def last_visible_id(user, ct_id: int, object_id: int) -> int:
+    """
+    Id-ul ultimului mesaj vizibil pentru user (0 dacă nu există), fără să încarce mesajul.
+    """
+    qs = TicketMessage.objects.filter(content_type_id=ct_id, object_id=object_id)
+    if not is_staff_user(user):
+        qs = qs.filter(visibility=TicketMessage.Visibility.PUBLIC)
+    return int(qs.aggregate(last=Max("id"))["last"] or 0)
+
+
+def _stored(key: Key) -> int:
+    with _lock:
+        if key in _known:
+            return _known[key]
+    user_id, ct_id, object_id = key
+    value = (
+        TicketMessageRead.objects
+        .filter(user_id=user_id, content_type_id=ct_id, object_id=object_id)
+        .values_list("last_read_message_id", flat=True)
+        .first()
+    )
+    value = int(value or 0)
+    _remember({key: value})
+    return value
+
+
+def _remember(values: Dict[Key, int]) -> None:
+    with _lock:
+        if len(_known) + len(values) > KNOWN_MAX:
+            _known.clear()
+        for key, value in values.items():
+            if value > _known.get(key, 0):
+                _known[key] = value
+
+
+def mark_read(user, target, object_id: int, last_message_id: Optional[int] = None) -> bool:
+    """
+    Marchează target-ul (model, ContentType sau id de ContentType) ca citit de user
+    până la last_message_id (implicit: ultimul mesaj vizibil pentru el).
+    Întoarce False dacă nu era nimic nou de salvat.
+    """
+    if not getattr(user, "is_authenticated", False):
+        return False
+
+    ct_id = _ct_id(target)
+    object_id = int(object_id)
+    if last_message_id is None:
+        last_message_id = last_visible_id(user, ct_id, object_id)
+    last_message_id = int(last_message_id or 0)
+    if not last_message_id:
+        return False
+
+    key = (int(user.pk), ct_id, object_id)
+    if _stored(key) >= last_message_id:
+        return False
+
+    # robust: un marcaj pierdut (ex. "database is locked") nu strică răspunsul
+    transaction.on_commit(
+        lambda: write({key: last_message_id}),
+        using=router.db_for_write(TicketMessageRead), robust=True,
+    )
+    return True
+
+
+# ============================================================
+# Scriere (upsert)
+# ============================================================
+
+def _upsert_sql(connection, count: int) -> str:
+    qn = connection.ops.quote_name
+    table = qn(TicketMessageRead._meta.db_table)
+    rows = ", ".join(["(%s, %s, %s, %s, %s)"] * count)
+    return (
+        f"INSERT INTO {table} ({qn('content_type_id')}, {qn('object_id')}, {qn('user_id')}, "
+        f"{qn('last_read_message_id')}, {qn('updated_at')}) VALUES {rows} "
+        f"ON CONFLICT ({qn('content_type_id')}, {qn('object_id')}, {qn('user_id')}) DO UPDATE SET "
+        f"{qn('last_read_message_id')} = EXCLUDED.{qn('last_read_message_id')}, "
+        f"{qn('updated_at')} = EXCLUDED.{qn('updated_at')} "
+        f"WHERE {table}.{qn('last_read_message_id')} IS NULL "
+        f"OR {table}.{qn('last_read_message_id')} < EXCLUDED.{qn('last_read_message_id')}"
+    )
+
+
+def write(values: Dict[Key, int]) -> int:
+    """
+    Upsert pentru {(user_id, content_type_id, object_id): last_read_message_id}.
+    Întoarce numărul de rânduri trimise.
+    """
+    if not values:
+        return 0
+
+    alias = router.db_for_write(TicketMessageRead)
+    connection = connections[alias]
+    now = connection.ops.adapt_datetimefield_value(timezone.now())
+    rows = list(values.items())
+
+    with transaction.atomic(using=alias):
+        with connection.cursor() as cursor:
+            for i in range(0, len(rows), BATCH_SIZE):
+                chunk = rows[i:i + BATCH_SIZE]
+                params = []
+                for (user_id, ct_id, object_id), last_id in chunk:
+                    params += [ct_id, object_id, user_id, last_id, now]
+                cursor.execute(_upsert_sql(connection, len(chunk)), params)
+
+    _remember(values)
+    return len(values)
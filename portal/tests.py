@@ -1,3 +1,216 @@
-from django.test import TestCase
+import os
+import shutil
+import tempfile
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from accounts.models import User
+from perf import versions
+from perf.testing import QueryBudgetTestMixin, assert_query_budget, plain_static_storage
+
+from . import read_tracking
+from .user_index import UserIndex
+from .models import PublicRequest, RequestStatus, Ticket
+from .models_chat import TicketMessage, TicketMessageAttachment, TicketMessageRead
+
+
+@plain_static_storage
+class QueryBudgetTests(QueryBudgetTestMixin, TestCase):
+    """
+    View-urile cu @query_budget, pe date cu mai multe rânduri: depășirea bugetului
+    sau o interogare repetată per rând (N+1) pică testul.
+    """
+
+    databases = {"default", "analytics"}
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user("admin@example.com", "x", role=User.Role.ADMIN, is_active=True)
+        cls.client_user = User.objects.create_user("client@example.com", "x", company_name="Client SRL", is_active=True)
+        status = RequestStatus.objects.create(name="Nou")
+        ticket_type = ContentType.objects.get_for_model(Ticket)
+        for i in range(10):
+            ticket = Ticket.objects.create(
+                created_by=cls.client_user, assigned_to=cls.admin, status=status,
+                subject=f"Tichet {i}", message="x",
+            )
+            PublicRequest.objects.create(email=f"c{i}@example.com", description="x", status=status)
+            TicketMessage.objects.create(content_type=ticket_type, object_id=ticket.pk, author=cls.client_user, body="x")
+
+    def test_dashboard(self):
+        self.client.force_login(self.admin)
+        with assert_query_budget(20, max_repeats=2):
+            response = self.client.get(reverse("portal_dashboard"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context["page_obj"]), 20)
+
+    def test_chat_unread_count(self):
+        self.client.force_login(self.client_user)
+        with assert_query_budget(10, max_repeats=2):
+            response = self.client.get(reverse("chat_unread_count"))
+        self.assertEqual(response.status_code, 200)
+
+        self.client.force_login(self.admin)
+        response = self.client.get(reverse("chat_unread_count"))
+        self.assertEqual(response.json()["unread_total"], 10)
+
+
+class ReadTrackingTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("client@example.com", "x", is_active=True)
+        cls.ticket = Ticket.objects.create(created_by=cls.user, subject="Tichet", message="x")
+        cls.messages = [
+            TicketMessage.objects.create(target=cls.ticket, author=cls.user, body=str(i)) for i in range(3)
+        ]
+
+    def setUp(self):
+        # _known e per proces: fiecare test pornește ca un worker nou
+        self.enterContext(mock.patch.dict(read_tracking._known, clear=True))
+
+    def stored(self):
+        return TicketMessageRead.objects.get(user=self.user, object_id=self.ticket.pk).last_read_message_id
+
+    def test_mark_is_written_on_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertTrue(read_tracking.mark_read(self.user, Ticket, self.ticket.pk))
+        self.assertEqual(self.stored(), self.messages[-1].pk)
+
+        # deja salvat: nicio scriere
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.assertFalse(read_tracking.mark_read(self.user, Ticket, self.ticket.pk))
+        self.assertEqual(callbacks, [])
+
+    def test_stored_value_never_goes_back(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            read_tracking.mark_read(self.user, Ticket, self.ticket.pk)
+        read_tracking._known.clear()  # alt proces, cu o cerere mai veche
+        with self.captureOnCommitCallbacks(execute=True):
+            read_tracking.mark_read(self.user, Ticket, self.ticket.pk, self.messages[0].pk)
+        self.assertEqual(self.stored(), self.messages[-1].pk)
+
+    def test_rolled_back_mark_is_not_remembered(self):
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            read_tracking.mark_read(self.user, Ticket, self.ticket.pk)
+            raise RuntimeError
+        self.assertFalse(TicketMessageRead.objects.exists())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertTrue(read_tracking.mark_read(self.user, Ticket, self.ticket.pk))
+        self.assertEqual(self.stored(), self.messages[-1].pk)
+
+
+@mock.patch.object(versions, "CHECK_INTERVAL", 0)
+class UserIndexTests(TestCase):
+    """
+    O instanță UserIndex separată = indexul din alt proces.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("ana@example.com", "x", company_name="Ana SRL", is_active=True)
+
+    def test_other_process_sees_new_and_deactivated_users(self):
+        other = UserIndex()
+        self.assertEqual([e.pk for e in other.search("ana")], [self.user.pk])
+
+        created = User.objects.create_user("andrei@example.com", "x", is_active=True)
+        self.assertEqual({e.pk for e in other.search("an")}, {self.user.pk, created.pk})
+
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual([e.pk for e in other.search("an")], [created.pk])
+
+
+@plain_static_storage
+class ChatAutocompleteTests(TestCase):
+    databases = {"default", "analytics"}
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user("owner@example.com", "x", is_active=True)
+        cls.outsider = User.objects.create_user("outsider@example.com", "x", is_active=True)
+        cls.ticket = Ticket.objects.create(created_by=cls.owner, subject="Tichet", message="x")
+
+    def autocomplete(self, user):
+        self.client.force_login(user)
+        return self.client.get(
+            reverse("chat_user_autocomplete"), {"q": "owner", "kind": "ticket", "object_id": self.ticket.pk},
+        )
+
+    def test_participant_gets_thread_audience(self):
+        response = self.autocomplete(self.owner)
+        self.assertEqual([r["id"] for r in response.json()["results"]], [self.owner.pk])
+
+    def test_outsider_cannot_probe_a_foreign_thread(self):
+        self.assertEqual(self.autocomplete(self.outsider).status_code, 403)
+
+
+class ProtectedMediaTests(TestCase):
+    databases = {"default", "analytics"}
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user("owner@example.com", "x", is_active=True)
+        cls.outsider = User.objects.create_user("outsider@example.com", "x", is_active=True)
+        cls.manager = User.objects.create_user("manager@example.com", "x", role=User.Role.MANAGER, is_active=True)
+        ticket = Ticket.objects.create(created_by=cls.owner, subject="Tichet", message="x")
+        public = TicketMessage.objects.create(target=ticket, author=cls.owner, body="x")
+        internal = TicketMessage.objects.create(
+            target=ticket, author=cls.manager, body="x", visibility=TicketMessage.Visibility.INTERNAL,
+        )
+        TicketMessageAttachment.objects.create(message=public, file="chat/raport.txt", original_name="raport.txt")
+        TicketMessageAttachment.objects.create(message=public, file="chat/pagina.html", original_name="pagina.html")
+        TicketMessageAttachment.objects.create(message=internal, file="chat/intern.txt", original_name="intern.txt")
+
+    def setUp(self):
+        self.media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media)
+        os.makedirs(os.path.join(self.media, "chat"))
+        for name in ("raport.txt", "pagina.html", "intern.txt"):
+            with open(os.path.join(self.media, "chat", name), "wb") as fh:
+                fh.write(b"0123456789")
+        self.enterContext(override_settings(MEDIA_ROOT=self.media, PROTECTED_MEDIA_SERVER="django"))
+
+    def get(self, user, name, **headers):
+        self.client.force_login(user)
+        return self.client.get(f"/media/chat/{name}", headers=headers)
+
+    def test_only_thread_participants_and_staff_get_the_file(self):
+        response = self.get(self.owner, "raport.txt")
+        self.assertEqual((response.status_code, b"".join(response.streaming_content)), (200, b"0123456789"))
+        self.assertEqual(response["Cache-Control"], "private, no-cache")
+        self.assertEqual(self.get(self.outsider, "raport.txt").status_code, 404)
+        self.assertEqual(self.get(self.manager, "raport.txt").status_code, 200)
+
+    def test_internal_attachment_is_hidden_from_the_client(self):
+        self.assertEqual(self.get(self.owner, "intern.txt").status_code, 404)
+        self.assertEqual(self.get(self.manager, "intern.txt").status_code, 200)
+
+    def test_anonymous_is_sent_to_login(self):
+        response = self.client.get("/media/chat/raport.txt")
+        self.assertEqual(response.status_code, 302)
+
+    def test_range_and_conditional_requests(self):
+        response = self.get(self.owner, "raport.txt", range="bytes=2-4")
+        self.assertEqual((response.status_code, b"".join(response.streaming_content)), (206, b"234"))
+        self.assertEqual(response["Content-Range"], "bytes 2-4/10")
+
+        self.assertEqual(self.get(self.owner, "raport.txt", range="bytes=20-").status_code, 416)
+        etag = response["ETag"]
+        self.assertEqual(self.get(self.owner, "raport.txt", if_none_match=etag).status_code, 304)
+
+    def test_active_content_is_only_downloaded(self):
+        response = self.get(self.owner, "pagina.html")
+        self.assertTrue(response["Content-Disposition"].startswith("attachment"))
+        self.assertTrue(self.get(self.owner, "raport.txt")["Content-Disposition"].startswith("inline"))
+
+    def test_nginx_serves_the_bytes(self):
+        with override_settings(PROTECTED_MEDIA_SERVER="nginx"):
+            response = self.get(self.owner, "raport.txt")
+        self.assertEqual(response["X-Accel-Redirect"], "/protected-media/chat/raport.txt")
+        self.assertEqual(response.content, b"")
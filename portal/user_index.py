@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import bisect
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set, Tuple
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from accounts.models import User
+from perf.versions import VersionWatcher
+from search.text import fold_text, tokenize
+
+from .chat_permissions import is_staff_user
+
+# ============================================================
+# Index în memorie pentru autocomplete @mention (per proces)
+# ============================================================
+#
+# Utilizatori activi cu email: email, firmă, CIF, normalizate cu fold_text
+# (lower + fără diacritice). Căutare prin bisect într-un vector sortat de termeni;
+# ordinea: început de câmp, început de cuvânt, apoi oriunde în text.
+# Ca website.catalog.CatalogIndex: procesul care salvează userul actualizează
+# indexul local, celelalte văd versiunea din baza de date (perf.versions) și îl reconstruiesc.
+
+VERSION_KEY = "portal:user-index:version"
+
+PREFIX, WORD, INFIX = 0, 1, 2
+
+# câmpurile care schimbă indexul; save(update_fields=["last_login"]) nu-l atinge
+INDEXED_FIELDS = {"email", "company_name", "company_cif", "role", "is_active"}
+
+
+@dataclass(frozen=True)
+class Entry:
+    # aceleași atribute ca User, pentru views_chat._user_label
+    pk: int
+    email: str
+    company_name: str
+    company_cif: str
+    role: str
+    text: str  # câmpurile normalizate, pentru potriviri în interior
+
+
+def _entry(u) -> Optional[Entry]:
+    email = (u.email or "").strip()
+    if not u.is_active or not email:
+        return None
+    company = (u.company_name or "").strip()
+    cif = (u.company_cif or "").strip()
+    return Entry(
+        pk=u.pk, email=email, company_name=company, company_cif=cif, role=u.role,
+        text="\n".join(fold_text(v) for v in (email, company, cif) if v),
+    )
+
+
+def _terms(entry: Entry) -> Set[Tuple[str, int]]:
+    out = set()
+    for value in (entry.email, entry.company_name, entry.company_cif):
+        folded = fold_text(value)
+        if not folded:
+            continue
+        out.add((folded, PREFIX))
+        for token in tokenize(value):
+            out.add((token, WORD))
+            # "RO12345678" se găsește și după "12345678"
+            digits = token[2:] if token.startswith("ro") else ""
+            if digits.isdigit():
+                out.add((digits, WORD))
+    return out
+
+
+class UserIndex:
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._watcher = VersionWatcher(VERSION_KEY)
+        self._entries: Dict[int, Entry] = {}
+        # vectori paraleli sortați după termen: (termen, rang, user_id)
+        self._keys: List[str] = []
+        self._rows: List[Tuple[int, int]] = []
+
+    # ---- construire ----
+    def _add(self, entry: Entry) -> None:
+        self._entries[entry.pk] = entry
+        for term, rank in _terms(entry):
+            i = bisect.bisect_left(self._keys, term)
+            self._keys.insert(i, term)
+            self._rows.insert(i, (rank, entry.pk))
+
+    def _remove(self, user_id: int) -> None:
+        if self._entries.pop(user_id, None) is None:
+            return
+        keep = [i for i, (_, pk) in enumerate(self._rows) if pk != user_id]
+        self._keys = [self._keys[i] for i in keep]
+        self._rows = [self._rows[i] for i in keep]
+
+    def _rebuild(self) -> None:
+        entries = [
+            e for e in (
+                _entry(u) for u in User.objects.filter(is_active=True)
+                .only("pk", "email", "company_name", "company_cif", "role", "is_active")
+                .iterator(chunk_size=2000)
+            ) if e
+        ]
+        pairs = sorted((term, rank, e.pk) for e in entries for term, rank in _terms(e))
+        self._entries = {e.pk: e for e in entries}
+        self._keys = [p[0] for p in pairs]
+        self._rows = [(p[1], p[2]) for p in pairs]
+
+    def _ensure_fresh(self) -> None:
+        if self._watcher.stale():
+            self._rebuild()
+            self._watcher.synced()
+
+    # ---- actualizare ----
+    def update(self, user) -> None:
+        with self._lock:
+            if self._watcher.token is not None:
+                self._remove(user.pk)
+                entry = _entry(user)
+                if entry:
+                    self._add(entry)
+            # rămânem "la zi" doar dacă indexul local era deja sincronizat
+            self._watcher.bump()
+
+    def remove(self, user_id: int) -> None:
+        with self._lock:
+            if self._watcher.token is not None:
+                self._remove(user_id)
+            self._watcher.bump()
+
+    def invalidate(self) -> None:
+        # după QuerySet.update() (fără post_save), ex. aprobarea din admin
+        with self._lock:
+            self._watcher.reset()
+            self._watcher.bump()
+
+    # ---- căutare ----
+    def search(self, q: str, audience: Optional[Set[int]] = None, limit: int = 10) -> List[Entry]:
+        """
+        audience = id-urile participanților la thread; staff-ul vede orice thread
+        și e mereu inclus. None = fără restricție.
+        """
+        q = fold_text(q).lstrip("@")
+        if not q:
+            return []
+
+        def allowed(e: Entry) -> bool:
+            return audience is None or e.pk in audience or is_staff_user(e)
+
+        with self._lock:
+            self._ensure_fresh()
+            best: Dict[int, int] = {}
+            i = bisect.bisect_left(self._keys, q)
+            while i < len(self._keys) and self._keys[i].startswith(q):
+                rank, pk = self._rows[i]
+                if rank < best.get(pk, INFIX + 1):
+                    best[pk] = rank
+                i += 1
+
+            hits = [(rank, self._entries[pk]) for pk, rank in best.items()]
+            hits = [(rank, e) for rank, e in hits if allowed(e)]
+            if len(hits) < limit:
+                for e in self._entries.values():
+                    if e.pk not in best and q in e.text and allowed(e):
+                        hits.append((INFIX, e))
+
+        hits.sort(key=lambda h: (h[0], h[1].email))
+        return [e for _, e in hits[:limit]]
+
+
+user_index = UserIndex()
+
+
+def thread_audience(target) -> Set[int]:
+    """
+    Userii (ne-staff) care văd thread-ul: autorul / clientul și tehnicianul alocat.
+    """
+    from .models import PublicRequest, Ticket
+
+    ids: Set[Optional[int]] = set()
+    if isinstance(target, Ticket):
+        ids |= {target.created_by_id, target.assigned_to_id}
+    elif isinstance(target, PublicRequest):
+        ids.add(target.user_id)
+        if target.assigned_to_id:
+            ids.add(target.assigned_to.user_id)
+    return {i for i in ids if i}
+
+
+def can_view_thread(user, target) -> bool:
+    return is_staff_user(user) or user.pk in thread_audience(target)
+
+
+# ============================================================
+# Semnale
+# ============================================================
+
+@receiver(post_save, sender=User, dispatch_uid="portal_user_index_save")
+def _user_saved(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or (update_fields and not INDEXED_FIELDS & set(update_fields)):
+        return
+    user_index.update(instance)
+
+
+@receiver(post_delete, sender=User, dispatch_uid="portal_user_index_delete")
+def _user_deleted(sender, instance, **kwargs):
+    user_index.remove(instance.pk)
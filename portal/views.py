@@ -20,6 +20,9 @@ from openpyxl.styles import Font, Alignment
 from openpyxl.utils import get_column_letter
 
 from accounts.models import User
+from perf.queries import query_budget
+from perf.replica import reporting
+from search.api import is_indexed, search_targets
 from website.site_settings import get_site_settings
 
 from .chat_permissions import is_staff_user
@@ -38,6 +41,7 @@ from .models import (
 )
 from .models_chat import TicketMessage, TicketMessageRead
 from .permissions import role_required
+from .read_tracking import mark_read
 
 
 # ============================================================
@@ -47,26 +51,7 @@ def mark_target_read(request, target_model, target_pk: int) -> None:
     """
     Marchează target-ul ca citit până la ultimul mesaj vizibil pentru user.
     """
-    ct = ContentType.objects.get_for_model(target_model)
-
-    msg_qs = TicketMessage.objects.filter(content_type=ct, object_id=target_pk)
-    if not is_staff_user(request.user):
-        msg_qs = msg_qs.filter(visibility=TicketMessage.Visibility.PUBLIC)
-
-    last_msg = msg_qs.order_by("-id").first()
-    if not last_msg:
-        return
-
-    read_obj, _ = TicketMessageRead.objects.get_or_create(
-        content_type=ct,
-        object_id=target_pk,
-        user=request.user,
-        defaults={"updated_at": timezone.now()},
-    )
-
-    read_obj.last_read_message = last_msg
-    read_obj.updated_at = timezone.now()
-    read_obj.save(update_fields=["last_read_message", "updated_at"])
+    mark_read(request.user, target_model, target_pk)
 
 
 def get_client_ip(request) -> Optional[str]:
@@ -390,13 +375,13 @@ def _get_dashboard_items(request) -> Dict[str, Any]:
     role = request.user.role
 
     if role == User.Role.CLIENT:
-        tickets_qs = Ticket.objects.filter(created_by=request.user).select_related("created_by", "assigned_to")
+        tickets_qs = Ticket.objects.filter(created_by=request.user).select_related("created_by", "assigned_to", "status")
         public_qs = PublicRequest.objects.filter(user=request.user).select_related("user", "status", "assigned_to")
     elif role == User.Role.TEHNICIAN:
-        tickets_qs = Ticket.objects.filter(assigned_to=request.user).select_related("created_by", "assigned_to")
+        tickets_qs = Ticket.objects.filter(assigned_to=request.user).select_related("created_by", "assigned_to", "status")
         public_qs = PublicRequest.objects.all().select_related("user", "status", "assigned_to")
     else:
-        tickets_qs = Ticket.objects.all().select_related("created_by", "assigned_to")
+        tickets_qs = Ticket.objects.all().select_related("created_by", "assigned_to", "status")
         public_qs = PublicRequest.objects.all().select_related("user", "status", "assigned_to")
 
     show_public = request.GET.get("public", "1") == "1"
@@ -448,6 +433,7 @@ def _get_dashboard_items(request) -> Dict[str, Any]:
         show_intern = (f_type == "INTERN")
 
     default_public_status = RequestStatus.objects.filter(name__iexact="Neprocesat").first()
+    default_status_name = default_public_status.name if default_public_status else "Neprocesat"
 
     items: List[Dict[str, Any]] = []
 
@@ -466,7 +452,7 @@ def _get_dashboard_items(request) -> Dict[str, Any]:
                 "nr": f"T-{t.id}",
                 "client_name": _user_name(t.created_by),
                 "client_phone": _user_phone(t.created_by),
-                "status_name": t.get_status_display(),
+                "status_name": (t.status.name if t.status else default_status_name),
                 "assigned_name": (t.assigned_to.email if t.assigned_to else ""),
                 "created_at": t.created_at,
                 "pk": t.pk,
@@ -489,7 +475,7 @@ def _get_dashboard_items(request) -> Dict[str, Any]:
                 "nr": f"P-{r.id}",
                 "client_name": r.company or r.email,
                 "client_phone": r.phone or "-",
-                "status_name": (r.status.name if r.status else (default_public_status.name if default_public_status else "Neprocesat")),
+                "status_name": (r.status.name if r.status else default_status_name),
                 "assigned_name": assigned_name,
                 "created_at": r.created_at,
                 "pk": r.pk,
@@ -499,11 +485,17 @@ def _get_dashboard_items(request) -> Dict[str, Any]:
     # -----------------------------
     # 2) Filtrare
     # -----------------------------
+    # q caută și în indexul full-text (subiect, descriere, mesaje chat),
+    # pe lângă coloanele afișate în listă
+    search_hits = None
+    if q and (is_indexed("ticket") or is_indexed("public")):
+        search_hits = search_targets(q, ["ticket", "public"])
+
     def match(it: Dict[str, Any]) -> bool:
         if f_type in {"PUBLIC", "CLIENT", "INTERN"} and it.get("source") != f_type:
             return False
 
-        if q:
+        if q and not (search_hits and (it.get("kind"), it.get("pk")) in search_hits):
             hay = " ".join([
                 str(it.get("source", "")),
                 str(it.get("nr", "")),
@@ -594,6 +586,7 @@ def _get_dashboard_items(request) -> Dict[str, Any]:
 # ============================================================
 
 @login_required
+@query_budget(20)
 def dashboard(request):
     data = _get_dashboard_items(request)
     items = data["items"]
@@ -632,6 +625,8 @@ def dashboard(request):
 # ============================================================
 
 @login_required
+@query_budget(15)
+@reporting()
 def portal_export_xlsx(request):
     data = _get_dashboard_items(request)
     items = data["items"]
@@ -5,12 +5,16 @@ from typing import Optional, Set, Tuple
 
 from django.contrib.auth.decorators import login_required
 from django.contrib.contenttypes.models import ContentType
-from django.db.models import Max, Q
+from django.db import transaction
+from django.db.models import Max
 from django.http import HttpResponseForbidden, JsonResponse
 from django.shortcuts import get_object_or_404, redirect
 from django.utils import timezone
 
 from accounts.models import User
+from notifications.outbox import notify_mention
+from perf.queries import query_budget
+
 from .chat_permissions import is_staff_user
 from .models import PublicRequest, Ticket
 from .models_chat import (
@@ -19,6 +23,8 @@ from .models_chat import (
     TicketMessageMention,
     TicketMessageRead,
 )
+from .read_tracking import mark_read
+from .user_index import can_view_thread, thread_audience, user_index
 
 # Mention = email, ex: "@client@firma.ro"
 MENTION_RE = re.compile(r"@([A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,})")
@@ -70,19 +76,8 @@ def mark_target_read(user, target, last_msg: Optional[TicketMessage]) -> None:
     """
     Marchează target ca citit până la last_msg.
     """
-    ct, obj_id = _ct_and_object_id(target)
-
-    read_obj, _ = TicketMessageRead.objects.get_or_create(
-        content_type=ct,
-        object_id=obj_id,
-        user=user,
-        defaults={"updated_at": timezone.now()},
-    )
-
     if last_msg:
-        read_obj.last_read_message = last_msg
-        read_obj.updated_at = timezone.now()
-        read_obj.save(update_fields=["last_read_message", "updated_at"])
+        mark_read(user, target.__class__, target.pk, last_msg.pk)
 
 
 def _user_label(u: User) -> str:
@@ -147,34 +142,39 @@ def chat_post(request, kind: str, object_id: int):
         except (ValueError, TicketMessage.DoesNotExist):
             reply_to = None
 
-    # creare mesaj
-    msg = TicketMessage.objects.create(
-        content_type=ct,
-        object_id=obj_id,
-        author=request.user,
-        body=body,
-        reply_to=reply_to,
-        visibility=visibility,
-    )
-
-    # atașamente
-    for f in request.FILES.getlist("attachments"):
-        TicketMessageAttachment.objects.create(
-            message=msg,
-            file=f,
-            original_name=getattr(f, "name", "") or "",
-            content_type=getattr(f, "content_type", "") or "",
-            size=int(getattr(f, "size", 0) or 0),
+    # mesaj + atașamente + mențiuni + notificări: totul sau nimic
+    with transaction.atomic():
+        # creare mesaj
+        msg = TicketMessage.objects.create(
+            content_type=ct,
+            object_id=obj_id,
+            author=request.user,
+            body=body,
+            reply_to=reply_to,
+            visibility=visibility,
         )
 
-    # mentions (după email)
-    emails = _extract_mentions(body)
-    if emails:
-        mentioned = User.objects.filter(email__in=list(emails), is_active=True)
-        TicketMessageMention.objects.bulk_create(
-            [TicketMessageMention(message=msg, mentioned_user=u) for u in mentioned],
-            ignore_conflicts=True,
-        )
+        # atașamente
+        for f in request.FILES.getlist("attachments"):
+            TicketMessageAttachment.objects.create(
+                message=msg,
+                file=f,
+                original_name=getattr(f, "name", "") or "",
+                content_type=getattr(f, "content_type", "") or "",
+                size=int(getattr(f, "size", 0) or 0),
+            )
+
+        # mentions (după email)
+        emails = _extract_mentions(body)
+        if emails:
+            mentioned = list(User.objects.filter(email__in=list(emails), is_active=True))
+            TicketMessageMention.objects.bulk_create(
+                [TicketMessageMention(message=msg, mentioned_user=u) for u in mentioned],
+                ignore_conflicts=True,
+            )
+            # doar cine vede thread-ul primește email
+            audience = thread_audience(target)
+            notify_mention(msg, [u for u in mentioned if is_staff_user(u) or u.pk in audience])
 
     # autorul a citit până la mesajul lui
     mark_target_read(request.user, target, msg)
@@ -192,6 +192,7 @@ def chat_post(request, kind: str, object_id: int):
 
 
 @login_required
+@query_budget(10)
 def chat_unread_count(request):
     """
     Badge: număr de target-uri cu mesaje necitite (vizibile) pentru user.
@@ -244,26 +245,28 @@ def chat_user_autocomplete(request):
     if len(q) < 1:
         return JsonResponse({"results": []})
 
-    qs = (
-        User.objects
-        .filter(is_active=True)
-        .filter(
-            Q(email__icontains=q) |
-            Q(company_name__icontains=q) |
-            Q(company_cif__icontains=q)
-        )
-        .order_by("email")[:10]
-    )
+    # doar cine vede thread-ul (participanții + staff); fără target: doar staff
+    audience = set()
+    kind = request.GET.get("kind")
+    object_id = request.GET.get("object_id")
+    if kind and (object_id or "").isdigit():
+        target = _resolve_target(kind, int(object_id))
+        if isinstance(target, HttpResponseForbidden):
+            return target
+        # altfel oricine ar afla, după id, cine participă la un thread străin
+        if not can_view_thread(request.user, target):
+            return HttpResponseForbidden()
+        audience = thread_audience(target)
 
     results = []
-    for u in qs:
-        email = (getattr(u, "email", "") or "").strip()
+    for u in user_index.search(q, audience=audience, limit=10):
+        email = u.email
         if not email:
             # fără email nu putem menționa corect (regex-ul tău e pe email)
             continue
 
         results.append({
-            "id": u.id,
+            "id": u.pk,
             "label": _user_label(u),
             "handle": email,   # ✅ IMPORTANT: JS inserează asta
             "email": email,
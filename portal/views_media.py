@@ -0,0 +1,244 @@
+from __future__ import annotations
+
+import mimetypes
+import os
+import re
+from typing import Optional, Tuple
+from urllib.parse import quote
+
+from django.conf import settings
+from django.contrib.auth.decorators import login_required
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response
+from django.utils.http import content_disposition_header, http_date, parse_http_date_safe
+from django.views.decorators.http import require_safe
+
+from documents.models import Document
+from documents.permissions import can_view_document
+
+from .chat_permissions import message_queryset_for_user
+from .models import PublicRequestAttachment
+from .models_chat import TicketMessage, TicketMessageAttachment
+from .user_index import can_view_thread
+
+# ============================================================
+# Media protejată (atașamente chat, fișiere cereri, documente generate)
+# ============================================================
+#
+# Django verifică doar dreptul de acces; octeții îi trimite web server-ul:
+#   PROTECTED_MEDIA_SERVER = "nginx"    -> X-Accel-Redirect: PROTECTED_MEDIA_INTERNAL_URL + cale
+#   PROTECTED_MEDIA_SERVER = "sendfile" -> X-Sendfile: cale absolută (Apache mod_xsendfile, lighttpd)
+#   PROTECTED_MEDIA_SERVER = "django"   -> FileResponse din Python (dev), cu Range și 304
+
+# prefixe din MEDIA_ROOT servite doar prin view-ul de mai jos (restul rămâne public)
+PROTECTED_PREFIXES = ("chat/", "requests/", "generated_docs/")
+
+# tipuri afișate în browser; restul (html, svg etc.) doar ca descărcare
+INLINE_TYPES = {"image/png", "image/jpeg", "image/gif", "image/webp", "application/pdf", "text/plain"}
+
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def protected_url_pattern() -> str:
+    media = settings.MEDIA_URL.strip("/")
+    prefixes = "|".join(re.escape(p.rstrip("/")) for p in PROTECTED_PREFIXES)
+    return rf"^{re.escape(media)}/(?P<path>(?:{prefixes})/.+)$"
+
+
+# ============================================================
+# Permisiuni
+# ============================================================
+
+def _chat_attachment(user, path: str) -> Optional[str]:
+    att = (
+        TicketMessageAttachment.objects
+        .select_related("message")
+        .filter(file=path)
+        .first()
+    )
+    if att is None:
+        return None
+    msg = att.message
+    # vizibilitate (INTERNAL doar pentru staff) + acces la thread
+    visible = message_queryset_for_user(TicketMessage.objects.filter(pk=msg.pk), user).exists()
+    if not visible:
+        return None
+    target = msg.target
+    if target is None or not can_view_thread(user, target):
+        return None
+    return att.original_name or os.path.basename(path)
+
+
+def _request_attachment(user, path: str) -> Optional[str]:
+    att = (
+        PublicRequestAttachment.objects
+        .select_related("request", "request__assigned_to")
+        .filter(file=path)
+        .first()
+    )
+    if att is None:
+        return None
+    if not can_view_thread(user, att.request):
+        return None
+    return os.path.basename(path)
+
+
+def _generated_document(user, path: str) -> Optional[str]:
+    doc = Document.objects.filter(docx_file=path).first() or Document.objects.filter(pdf_file=path).first()
+    if doc is None or not can_view_document(user, doc):
+        return None
+    return os.path.basename(path)
+
+
+CHECKS = {
+    "chat/": _chat_attachment,
+    "requests/": _request_attachment,
+    "generated_docs/": _generated_document,
+}
+
+
+def allowed_filename(user, path: str) -> Optional[str]:
+    """
+    Numele de descărcare dacă userul are acces la fișier, altfel None.
+    """
+    for prefix, check in CHECKS.items():
+        if path.startswith(prefix):
+            return check(user, path)
+    return None
+
+
+# ============================================================
+# Livrare
+# ============================================================
+
+def _content_disposition(response, filename: str, content_type: str) -> None:
+    response["Content-Disposition"] = content_disposition_header(content_type not in INLINE_TYPES, filename)
+
+
+def _parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Un singur interval "bytes=a-b" / "bytes=a-" / "bytes=-n" -> (start, end inclusiv).
+    None = antet ignorat (răspuns complet); (-1, -1) = nesatisfăcător (416).
+    """
+    m = RANGE_RE.match(header.strip())
+    if not m or m.groups() == ("", ""):
+        return None
+    first, last = m.groups()
+    if first == "":
+        length = int(last)
+        if length == 0:
+            return -1, -1
+        return max(0, size - length), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or (last and int(last) < start):
+        return -1, -1
+    return start, end
+
+
+def _if_range_matches(request, etag: str, mtime: int) -> bool:
+    value = request.META.get("HTTP_IF_RANGE")
+    if not value:
+        return True
+    if value.startswith(('"', "W/")):
+        return value == etag
+    since = parse_http_date_safe(value)
+    return since is not None and mtime <= since
+
+
+class _RangeFile:
+    """
+    Citire limitată la [start, start + length) pentru FileResponse (fără tell/seek:
+    Content-Length îl setăm noi).
+    """
+
+    def __init__(self, f, start: int, length: int):
+        self._f = f
+        self._f.seek(start)
+        self._remaining = length
+
+    def read(self, size: int = -1) -> bytes:
+        if self._remaining <= 0:
+            return b""
+        if size < 0 or size > self._remaining:
+            size = self._remaining
+        data = self._f.read(size)
+        self._remaining -= len(data)
+        return data
+
+    def close(self) -> None:
+        self._f.close()
+
+
+def serve_file(request, full_path: str, filename: str, content_type: str):
+    st = os.stat(full_path)
+    mtime = int(st.st_mtime)
+    etag = f'"{st.st_mtime_ns:x}-{st.st_size:x}"'
+
+    # If-None-Match / If-Modified-Since -> 304, If-Match / If-Unmodified-Since -> 412
+    response = get_conditional_response(request, etag=etag, last_modified=mtime)
+    if response is None:
+        byte_range = None
+        if "HTTP_RANGE" in request.META and _if_range_matches(request, etag, mtime):
+            byte_range = _parse_range(request.META["HTTP_RANGE"], st.st_size)
+
+        if byte_range == (-1, -1):
+            response = HttpResponse(status=416)
+            response["Content-Range"] = f"bytes */{st.st_size}"
+        elif byte_range:
+            start, end = byte_range
+            length = end - start + 1
+            response = FileResponse(_RangeFile(open(full_path, "rb"), start, length), status=206,
+                                    content_type=content_type)
+            response["Content-Length"] = str(length)
+            response["Content-Range"] = f"bytes {start}-{end}/{st.st_size}"
+        else:
+            # fișierul întreg: wsgi.file_wrapper (sendfile) dacă serverul îl are
+            response = FileResponse(open(full_path, "rb"), content_type=content_type)
+
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(mtime)
+    response["Accept-Ranges"] = "bytes"
+    if response.status_code in (200, 206):
+        _content_disposition(response, filename, content_type)
+    return response
+
+
+def _offload(full_path: str, path: str, content_type: str, server: str):
+    response = HttpResponse(content_type=content_type)
+    if server == "nginx":
+        # location internal; nginx tratează singur Range / If-* / sendfile
+        internal = getattr(settings, "PROTECTED_MEDIA_INTERNAL_URL", "/protected-media/")
+        response["X-Accel-Redirect"] = internal.rstrip("/") + "/" + quote(path)
+    else:
+        response["X-Sendfile"] = full_path
+    return response
+
+
+@require_safe
+@login_required
+def protected_media(request, path: str):
+    filename = allowed_filename(request.user, path)
+    # inexistent sau fără drept de acces: același 404 (nu confirmăm că fișierul există)
+    if filename is None:
+        raise Http404("Fișier inexistent.")
+    try:
+        full_path = safe_join(settings.MEDIA_ROOT, path)
+    except SuspiciousFileOperation:
+        raise Http404("Fișier inexistent.")
+    if not os.path.isfile(full_path):
+        raise Http404("Fișier inexistent.")
+
+    content_type = mimetypes.guess_type(filename)[0] or mimetypes.guess_type(path)[0] or "application/octet-stream"
+    server = getattr(settings, "PROTECTED_MEDIA_SERVER", "django")
+    if server in ("nginx", "sendfile"):
+        response = _offload(full_path, path, content_type, server)
+        _content_disposition(response, filename, content_type)
+    else:
+        response = serve_file(request, full_path, filename, content_type)
+
+    # doar cache-ul browserului, niciodată un proxy partajat
+    response["Cache-Control"] = "private, no-cache"
+    return response
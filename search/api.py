@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from django.db import transaction
+from django.db.models import Case, IntegerField, When
+from django.utils import timezone
+
+from .backends import Hit, get_backend
+from .models import SearchEntry
+from .registry import KINDS, IndexedKind
+from .text import fold_text, tokenize
+
+DEFAULT_LIMIT = 500
+
+
+# ============================================================
+# Indexare
+# ============================================================
+
+def index_object(kind: IndexedKind, obj) -> None:
+    """
+    Scrie (sau rescrie) intrarea pentru un obiect. Obiectele fără text se scot din index.
+    """
+    title, body = kind.extract(obj)
+    title, body = fold_text(title), fold_text(body)
+
+    if not title and not body:
+        remove_object(kind, obj.pk)
+        return
+
+    parent_kind, parent_id = kind.parent(obj) if kind.parent else ("", None)
+
+    with transaction.atomic():
+        entry, _ = SearchEntry.objects.update_or_create(
+            kind=kind.kind,
+            object_id=obj.pk,
+            defaults={
+                "title": title,
+                "body": body,
+                "parent_kind": parent_kind or "",
+                "parent_id": parent_id,
+                "updated_at": timezone.now(),
+            },
+        )
+        get_backend().upsert(entry)
+
+
+def index_many(kind: IndexedKind, objs: Sequence) -> None:
+    """
+    Varianta bulk a index_object (importuri): o citire, bulk_create / bulk_update
+    și o singură actualizare de backend pentru tot lotul.
+    """
+    now = timezone.now()
+    rows, empty = {}, []
+    for obj in objs:
+        title, body = kind.extract(obj)
+        title, body = fold_text(title), fold_text(body)
+        if not title and not body:
+            empty.append(obj.pk)
+            continue
+        parent_kind, parent_id = kind.parent(obj) if kind.parent else ("", None)
+        rows[obj.pk] = (title, body, parent_kind or "", parent_id)
+
+    with transaction.atomic():
+        for pk in empty:
+            remove_object(kind, pk)
+
+        existing = {
+            e.object_id: e
+            for e in SearchEntry.objects.filter(kind=kind.kind, object_id__in=list(rows))
+        }
+        to_create, to_update = [], []
+        for object_id, (title, body, parent_kind, parent_id) in rows.items():
+            entry = existing.get(object_id) or SearchEntry(kind=kind.kind, object_id=object_id)
+            entry.title, entry.body = title, body
+            entry.parent_kind, entry.parent_id, entry.updated_at = parent_kind, parent_id, now
+            (to_update if entry.pk else to_create).append(entry)
+
+        SearchEntry.objects.bulk_create(to_create, batch_size=500)
+        SearchEntry.objects.bulk_update(
+            to_update, ["title", "body", "parent_kind", "parent_id", "updated_at"], batch_size=500,
+        )
+        get_backend().upsert_many(to_create + to_update)
+
+
+def remove_object(kind: IndexedKind, object_id: int) -> None:
+    with transaction.atomic():
+        ids = list(SearchEntry.objects.filter(kind=kind.kind, object_id=object_id).values_list("pk", flat=True))
+        if not ids:
+            return
+        SearchEntry.objects.filter(pk__in=ids).delete()
+        get_backend().delete(ids)
+
+
+def reindex(kinds: Optional[Iterable[str]] = None, chunk_size: int = 500) -> Dict[str, int]:
+    """
+    Reconstruiește indexul pentru tipurile date (implicit toate).
+    """
+    backend = get_backend()
+    selected = [KINDS[k] for k in (kinds or KINDS.keys())]
+    counts = {}
+
+    for kind in selected:
+        with transaction.atomic():
+            old_ids = list(SearchEntry.objects.filter(kind=kind.kind).values_list("pk", flat=True))
+            backend.delete(old_ids)
+            SearchEntry.objects.filter(kind=kind.kind).delete()
+
+        n = 0
+        for obj in kind.get_queryset().order_by("pk").iterator(chunk_size=chunk_size):
+            index_object(kind, obj)
+            n += 1
+        counts[kind.kind] = n
+
+    return counts
+
+
+# ============================================================
+# Căutare
+# ============================================================
+
+def search(q: str, kinds: Sequence[str] = (), limit: Optional[int] = DEFAULT_LIMIT, within=None) -> List[Hit]:
+    """
+    Căutare ordonată după relevanță; insensibilă la diacritice și majuscule.
+    Fiecare cuvânt din q e tratat ca prefix și toate trebuie să apară.
+    within: id-urile permise (queryset sau iterabil), aplicate înainte de limit.
+    """
+    tokens = tokenize(q)
+    if not tokens:
+        return []
+    return get_backend().query(tokens, list(kinds), limit, within=within)
+
+
+def search_ids(kind: str, q: str, limit: Optional[int] = DEFAULT_LIMIT, within=None) -> List[int]:
+    return [h.object_id for h in search(q, [kind], limit, within=within)]
+
+
+def search_targets(q: str, kinds: Sequence[str], limit: int = DEFAULT_LIMIT) -> Set[Tuple[str, int]]:
+    """
+    (kind, pk) pentru target-uri găsite direct sau prin mesajele de chat din ele.
+    """
+    out = set()
+    for h in search(q, list(kinds) + ["message"], limit):
+        if h.kind == "message":
+            if h.parent_kind in kinds and h.parent_id:
+                out.add((h.parent_kind, int(h.parent_id)))
+        else:
+            out.add((h.kind, h.object_id))
+    return out
+
+
+def is_indexed(kind: str) -> bool:
+    """
+    Indexul are intrări pentru acest tip (altfel view-urile folosesc filtrele vechi).
+    """
+    return SearchEntry.objects.filter(kind=kind).exists()
+
+
+def order_by_ids(qs, ids: Sequence[int]):
+    """
+    Păstrează ordinea de relevanță pe un queryset filtrat cu pk__in=ids.
+    """
+    if not ids:
+        return qs
+    rank = Case(*[When(pk=pk, then=i) for i, pk in enumerate(ids)], output_field=IntegerField())
+    return qs.order_by(rank)
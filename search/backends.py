@@ -0,0 +1,321 @@
+from __future__ import annotations
+
+import bisect
+import json
+import math
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from django.conf import settings
+from django.db import connection, connections, router
+from django.db.models import QuerySet
+
+from .models import SearchEntry
+from .text import tokenize
+
+FTS_TABLE = "search_fts"
+# indexul Python: cât de des verifică un proces tabelul pentru scrierile altor procese
+SYNC_INTERVAL = 1.0  # secunde
+SYNC_OVERLAP = 60  # secunde recitite sub ultimul updated_at văzut
+TITLE_WEIGHT = 10.0
+
+
+@dataclass(frozen=True)
+class Hit:
+    kind: str
+    object_id: int
+    score: float
+    parent_kind: str = ""
+    parent_id: Optional[int] = None
+
+
+# ============================================================
+# SQLite FTS5
+# ============================================================
+
+class Fts5Backend:
+    """
+    Tabel virtual FTS5 (creat în migrarea 0001), rowid = SearchEntry.id.
+    Ranking: bm25, cu titlul ponderat mai mult decât corpul.
+    """
+    name = "fts5"
+
+    def upsert(self, entry) -> None:
+        with connection.cursor() as c:
+            c.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [entry.pk])
+            c.execute(
+                f"INSERT INTO {FTS_TABLE}(rowid, title, body) VALUES (%s, %s, %s)",
+                [entry.pk, entry.title, entry.body],
+            )
+
+    def upsert_many(self, entries: Sequence) -> None:
+        if not entries:
+            return
+        with connection.cursor() as c:
+            c.executemany(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [[e.pk] for e in entries])
+            c.executemany(
+                f"INSERT INTO {FTS_TABLE}(rowid, title, body) VALUES (%s, %s, %s)",
+                [[e.pk, e.title, e.body] for e in entries],
+            )
+
+    def delete(self, entry_ids: Iterable[int]) -> None:
+        ids = list(entry_ids)
+        if not ids:
+            return
+        with connection.cursor() as c:
+            c.execute(
+                f"DELETE FROM {FTS_TABLE} WHERE rowid IN ({', '.join(['%s'] * len(ids))})",
+                ids,
+            )
+
+    def clear(self) -> None:
+        with connection.cursor() as c:
+            c.execute(f"DELETE FROM {FTS_TABLE}")
+
+    def query(self, tokens: Sequence[str], kinds: Sequence[str], limit: Optional[int], within=None) -> List[Hit]:
+        # fiecare token ca prefix; toate trebuie să apară (AND implicit)
+        match = " ".join(f'"{t}"*' for t in tokens)
+        sql = (
+            f"SELECT e.kind, e.object_id, e.parent_kind, e.parent_id, "
+            f"bm25({FTS_TABLE}, {TITLE_WEIGHT}, 1.0) AS score "
+            f"FROM {FTS_TABLE} JOIN search_searchentry e ON e.id = {FTS_TABLE}.rowid "
+            f"WHERE {FTS_TABLE} MATCH %s"
+        )
+        params: list = [match]
+        if kinds:
+            sql += f" AND e.kind IN ({', '.join(['%s'] * len(kinds))})"
+            params += list(kinds)
+        if within is not None:
+            # filtrul de acces intră în interogare, înainte de LIMIT
+            if isinstance(within, QuerySet):
+                sub_sql, sub_params = within.values("pk").query.sql_with_params()
+                sql += f" AND e.object_id IN ({sub_sql})"
+                params += list(sub_params)
+            else:
+                sql += " AND e.object_id IN (SELECT value FROM json_each(%s))"
+                params.append(json.dumps(sorted(within)))
+        sql += " ORDER BY score"
+        if limit is not None:
+            sql += " LIMIT %s"
+            params.append(limit)
+
+        # citire: poate merge pe replica de raportare (perf.replica.reporting)
+        with connections[router.db_for_read(SearchEntry)].cursor() as c:
+            c.execute(sql, params)
+            rows = c.fetchall()
+
+        # bm25 în SQLite: mai mic = mai relevant
+        return [Hit(kind=r[0], object_id=int(r[1]), score=-float(r[4]), parent_kind=r[2], parent_id=r[3]) for r in rows]
+
+
+# ============================================================
+# Fallback: index inversat în memorie (per proces)
+# ============================================================
+
+class PythonIndexBackend:
+    """
+    Index inversat construit din SearchEntry, ținut în memorie.
+    Procesul care scrie îl actualizează incremental; celelalte procese
+    se sincronizează din tabel (cel mult o dată la SYNC_INTERVAL secunde):
+    reindexează doar intrările cu updated_at nou și scot intrările șterse.
+    """
+    name = "python"
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._built = False
+        self._synced_at = None   # cel mai nou updated_at văzut
+        self._checked_at = 0.0   # time.monotonic() la ultima verificare
+        self._postings: Dict[str, Dict[int, float]] = defaultdict(dict)
+        self._vocab: List[str] = []
+        self._docs: Dict[int, tuple] = {}
+        self._lengths: Dict[int, float] = {}
+        self._terms: Dict[int, List[str]] = {}
+
+    # ---- construire ----
+    def _index_entry(self, entry) -> None:
+        tf: Dict[str, float] = defaultdict(float)
+        for t in tokenize(entry.title):
+            tf[t] += TITLE_WEIGHT
+        for t in tokenize(entry.body):
+            tf[t] += 1.0
+        for t, w in tf.items():
+            if t not in self._postings:
+                bisect.insort(self._vocab, t)
+            self._postings[t][entry.pk] = w
+        self._docs[entry.pk] = (entry.kind, int(entry.object_id), entry.parent_kind, entry.parent_id)
+        self._lengths[entry.pk] = sum(tf.values()) or 1.0
+        self._terms[entry.pk] = list(tf)
+
+    def _unindex(self, entry_id: int) -> None:
+        if self._docs.pop(entry_id, None) is None:
+            return
+        self._lengths.pop(entry_id, None)
+        for t in self._terms.pop(entry_id, []):
+            self._postings[t].pop(entry_id, None)
+            if not self._postings[t]:
+                del self._postings[t]
+                i = bisect.bisect_left(self._vocab, t)
+                if i < len(self._vocab) and self._vocab[i] == t:
+                    self._vocab.pop(i)
+
+    def _seen(self, updated_at) -> None:
+        if updated_at and (self._synced_at is None or updated_at > self._synced_at):
+            self._synced_at = updated_at
+
+    def _rebuild(self) -> None:
+        self._postings = defaultdict(dict)
+        self._vocab = []
+        self._docs = {}
+        self._lengths = {}
+        self._terms = {}
+        self._synced_at = None
+        for entry in SearchEntry.objects.order_by("pk").iterator(chunk_size=2000):
+            self._index_entry(entry)
+            self._seen(entry.updated_at)
+        self._built = True
+
+    def _sync(self) -> None:
+        """
+        Aduce indexul la zi cu tabelul: intrările modificate de alte procese
+        (updated_at mai nou, cu o fereastră de suprapunere pentru tranzacțiile
+        care au făcut commit în altă ordine) și, dacă numărul diferă, cele șterse.
+        """
+        if self._synced_at is not None:
+            since = self._synced_at - timedelta(seconds=SYNC_OVERLAP)
+            for entry in SearchEntry.objects.filter(updated_at__gte=since).order_by("pk").iterator(chunk_size=2000):
+                self._unindex(entry.pk)
+                self._index_entry(entry)
+                self._seen(entry.updated_at)
+
+        if SearchEntry.objects.count() != len(self._docs):
+            live = set(SearchEntry.objects.values_list("pk", flat=True).iterator(chunk_size=5000))
+            for pk in [pk for pk in self._docs if pk not in live]:
+                self._unindex(pk)
+            missing = sorted(live.difference(self._docs))
+            for i in range(0, len(missing), 2000):
+                for entry in SearchEntry.objects.filter(pk__in=missing[i:i + 2000]):
+                    self._index_entry(entry)
+                    self._seen(entry.updated_at)
+
+    def _ensure_fresh(self) -> None:
+        now = time.monotonic()
+        if not self._built:
+            self._rebuild()
+        elif now - self._checked_at >= SYNC_INTERVAL:
+            self._sync()
+        else:
+            return
+        self._checked_at = now
+
+    # ---- API backend ----
+    def upsert(self, entry) -> None:
+        with self._lock:
+            if self._built:
+                self._unindex(entry.pk)
+                self._index_entry(entry)
+                self._seen(entry.updated_at)
+
+    def upsert_many(self, entries: Sequence) -> None:
+        with self._lock:
+            if self._built:
+                for entry in entries:
+                    self._unindex(entry.pk)
+                    self._index_entry(entry)
+                    self._seen(entry.updated_at)
+
+    def delete(self, entry_ids: Iterable[int]) -> None:
+        with self._lock:
+            if self._built:
+                for pk in entry_ids:
+                    self._unindex(pk)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._built = False
+
+    def _expand(self, token: str) -> List[str]:
+        i = bisect.bisect_left(self._vocab, token)
+        out = []
+        while i < len(self._vocab) and self._vocab[i].startswith(token):
+            out.append(self._vocab[i])
+            i += 1
+        return out
+
+    def query(self, tokens: Sequence[str], kinds: Sequence[str], limit: Optional[int], within=None) -> List[Hit]:
+        if isinstance(within, QuerySet):
+            within = set(within.values_list("pk", flat=True))
+        elif within is not None:
+            within = set(within)
+
+        with self._lock:
+            self._ensure_fresh()
+            n_docs = len(self._docs) or 1
+            avg_len = (sum(self._lengths.values()) / n_docs) if self._lengths else 1.0
+
+            scores: Optional[Dict[int, float]] = None
+            for token in tokens:
+                token_scores: Dict[int, float] = defaultdict(float)
+                for term in self._expand(token):
+                    postings = self._postings[term]
+                    idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+                    for entry_id, tf in postings.items():
+                        # BM25 (k1=1.2, b=0.75)
+                        norm = tf + 1.2 * (0.25 + 0.75 * self._lengths[entry_id] / avg_len)
+                        token_scores[entry_id] = max(token_scores[entry_id], idf * tf * 2.2 / norm)
+
+                if scores is None:
+                    scores = dict(token_scores)
+                else:
+                    scores = {k: v + token_scores[k] for k, v in scores.items() if k in token_scores}
+                if not scores:
+                    return []
+
+            hits = []
+            for entry_id, score in (scores or {}).items():
+                kind, object_id, parent_kind, parent_id = self._docs[entry_id]
+                if kinds and kind not in kinds:
+                    continue
+                if within is not None and object_id not in within:
+                    continue
+                hits.append(Hit(kind, object_id, score, parent_kind, parent_id))
+
+        hits.sort(key=lambda h: h.score, reverse=True)
+        return hits[:limit]
+
+
+# ============================================================
+# Alegere backend
+# ============================================================
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def fts5_available() -> bool:
+    if connection.vendor != "sqlite":
+        return False
+    with connection.cursor() as c:
+        c.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name = %s", [FTS_TABLE])
+        return c.fetchone() is not None
+
+
+def get_backend():
+    """
+    SEARCH_BACKEND = "auto" (implicit) | "fts5" | "python".
+    "auto" folosește FTS5 dacă tabelul virtual există, altfel indexul Python.
+    """
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                choice = getattr(settings, "SEARCH_BACKEND", "auto")
+                if choice == "fts5" or (choice == "auto" and fts5_available()):
+                    _backend = Fts5Backend()
+                else:
+                    _backend = PythonIndexBackend()
+    return _backend
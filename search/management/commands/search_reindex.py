@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from search.api import reindex
+from search.backends import get_backend
+from search.registry import KINDS
+
+
+class Command(BaseCommand):
+    help = "Reconstruiește indexul full-text (documente, tichete, cereri publice, mesaje, produse)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--kind", action="append", dest="kinds", default=[],
+            help=f"Doar anumite tipuri ({', '.join(KINDS)}). Se poate repeta.",
+        )
+
+    def handle(self, *args, **options):
+        unknown = [k for k in options["kinds"] if k not in KINDS]
+        if unknown:
+            raise CommandError(f"Tip necunoscut: {', '.join(unknown)}")
+
+        counts = reindex(options["kinds"] or None)
+        for kind, n in counts.items():
+            self.stdout.write(f"{kind}: {n}")
+        self.stdout.write(self.style.SUCCESS(f"Index reconstruit (backend: {get_backend().name})."))
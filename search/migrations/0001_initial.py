@@ -0,0 +1,62 @@
+# Generated by Django 5.2.18 on 2026-10-19 16:22
+
+import logging
+
+import django.utils.timezone
+from django.db import OperationalError, migrations, models
+
+logger = logging.getLogger("search")
+
+
+FTS_TABLE = "search_fts"
+
+
+def create_fts_table(apps, schema_editor):
+    """
+    Tabel virtual FTS5 doar pe SQLite; dacă build-ul SQLite nu are FTS5,
+    căutarea folosește indexul Python (search.backends.PythonIndexBackend).
+    """
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    try:
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} "
+            f"USING fts5(title, body, tokenize = 'unicode61 remove_diacritics 2')"
+        )
+    except OperationalError as exc:
+        # ex. "no such module: fts5"
+        logger.warning("FTS5 indisponibil (%s); căutarea folosește indexul Python.", exc)
+
+
+def drop_fts_table(apps, schema_editor):
+    if schema_editor.connection.vendor == "sqlite":
+        schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(max_length=20)),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('parent_kind', models.CharField(blank=True, max_length=20)),
+                ('parent_id', models.PositiveBigIntegerField(blank=True, null=True)),
+                ('title', models.TextField(blank=True)),
+                ('body', models.TextField(blank=True)),
+                ('updated_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['parent_kind', 'parent_id'], name='search_sear_parent__7b6c55_idx')],
+                'unique_together': {('kind', 'object_id')},
+            },
+        ),
+        migrations.RunPython(create_fts_table, drop_fts_table),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-19 17:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='searchentry',
+            index=models.Index(fields=['updated_at'], name='search_sear_updated_16c4e0_idx'),
+        ),
+    ]
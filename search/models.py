@@ -0,0 +1,31 @@
+from django.db import models
+from django.utils import timezone
+
+
+class SearchEntry(models.Model):
+    """
+    Un rând per obiect indexat (Document / Ticket / PublicRequest / mesaj / produs).
+    Textul e deja normalizat (fără diacritice); tabelul FTS5 "search_fts"
+    folosește același id ca rowid.
+    """
+    kind = models.CharField(max_length=20)
+    object_id = models.PositiveBigIntegerField()
+
+    # pentru mesaje: target-ul (ticket / public) din care fac parte
+    parent_kind = models.CharField(max_length=20, blank=True)
+    parent_id = models.PositiveBigIntegerField(null=True, blank=True)
+
+    title = models.TextField(blank=True)
+    body = models.TextField(blank=True)
+    updated_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        unique_together = [("kind", "object_id")]
+        indexes = [
+            models.Index(fields=["parent_kind", "parent_id"]),
+            # sincronizarea indexului Python între procese (search.backends)
+            models.Index(fields=["updated_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.kind}:{self.object_id}"
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
+
+from django.apps import apps
+
+
+@dataclass(frozen=True)
+class IndexedKind:
+    """
+    Un tip de obiect indexat: modelul + funcția care produce (title, body)
+    și, opțional, target-ul părinte (pentru mesaje de chat).
+    """
+    kind: str
+    model_label: str
+    extract: Callable
+    parent: Optional[Callable] = None
+    queryset: Optional[Callable] = None
+
+    @property
+    def model(self):
+        return apps.get_model(self.model_label)
+
+    def get_queryset(self):
+        if self.queryset:
+            return self.queryset(self.model)
+        return self.model._default_manager.all()
+
+
+def _join(*parts) -> str:
+    return " ".join(str(p) for p in parts if p not in (None, ""))
+
+
+def _flatten_json(value) -> str:
+    if isinstance(value, dict):
+        return _join(*(_flatten_json(v) for v in value.values()))
+    if isinstance(value, (list, tuple)):
+        return _join(*(_flatten_json(v) for v in value))
+    return "" if value is None else str(value)
+
+
+def _user_text(u) -> str:
+    if not u:
+        return ""
+    return _join(u.email, getattr(u, "company_name", ""), getattr(u, "company_cif", ""))
+
+
+# ----------------------------
+# Extractori (title, body)
+# ----------------------------
+
+def _document(doc) -> Tuple[str, str]:
+    title = _join(doc.number, doc.doc_type.name)
+    body = _join(_user_text(doc.client_user), _user_text(doc.owner), _flatten_json(doc.data_json))
+    return title, body
+
+
+def _ticket(t) -> Tuple[str, str]:
+    return _join(f"T-{t.pk}", t.subject), _join(t.message, _user_text(t.created_by))
+
+
+def _public_request(r) -> Tuple[str, str]:
+    return _join(f"P-{r.pk}", r.company, r.email), _join(r.company_cif, r.phone, r.description)
+
+
+def _message(m) -> Tuple[str, str]:
+    if m.is_deleted:
+        return "", ""
+    return "", m.body or ""
+
+
+def _message_parent(m) -> Tuple[str, Optional[int]]:
+    model = m.content_type.model if m.content_type_id else ""
+    kind = {"ticket": "ticket", "publicrequest": "public"}.get(model, model)
+    return kind, m.object_id
+
+
+def _product(p) -> Tuple[str, str]:
+    specs = _join(*(f"{k} {v}" for k, v in (p.specs or {}).items())) if isinstance(p.specs, dict) else ""
+    return (
+        _join(p.title, p.sku),
+        _join(p.brand.name if p.brand_id else "", p.category.name if p.category_id else "",
+              p.short_description, p.description, specs),
+    )
+
+
+KINDS: Dict[str, IndexedKind] = {}
+
+
+def register(kind: IndexedKind) -> None:
+    KINDS[kind.kind] = kind
+
+
+register(IndexedKind(
+    "document", "documents.Document", _document,
+    queryset=lambda M: M.objects.select_related("doc_type", "client_user", "owner"),
+))
+register(IndexedKind(
+    "ticket", "portal.Ticket", _ticket,
+    queryset=lambda M: M.objects.select_related("created_by"),
+))
+register(IndexedKind("public", "portal.PublicRequest", _public_request))
+register(IndexedKind(
+    "message", "portal.TicketMessage", _message, parent=_message_parent,
+    queryset=lambda M: M.objects.select_related("content_type"),
+))
+register(IndexedKind(
+    "product", "website.Product", _product,
+    queryset=lambda M: M.objects.select_related("brand", "category"),
+))
+
+
+def kind_for_model(model) -> Optional[IndexedKind]:
+    label = model._meta.label
+    for k in KINDS.values():
+        if k.model_label == label:
+            return k
+    return None
@@ -0,0 +1,27 @@
+from django.db.models.signals import post_delete, post_save
+
+from .api import index_object, remove_object
+from .registry import KINDS
+
+
+def _on_save(sender, instance, raw=False, **kwargs):
+    if raw:  # loaddata
+        return
+    kind = _KIND_BY_SENDER.get(sender)
+    if kind:
+        index_object(kind, instance)
+
+
+def _on_delete(sender, instance, **kwargs):
+    kind = _KIND_BY_SENDER.get(sender)
+    if kind:
+        remove_object(kind, instance.pk)
+
+
+_KIND_BY_SENDER = {}
+
+# indexare incrementală: fiecare model înregistrat în registry
+for _kind in KINDS.values():
+    _KIND_BY_SENDER[_kind.model] = _kind
+    post_save.connect(_on_save, sender=_kind.model, dispatch_uid=f"search-save-{_kind.kind}")
+    post_delete.connect(_on_delete, sender=_kind.model, dispatch_uid=f"search-delete-{_kind.kind}")
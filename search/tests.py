@@ -0,0 +1,83 @@
+from unittest import mock
+
+from django.test import TestCase
+from django.urls import reverse
+
+from accounts.models import User
+from documents.models import Document, DocumentType
+from documents.services.access import filter_accessible
+from perf.testing import plain_static_storage
+
+from . import backends
+from .api import search_ids
+from .backends import PythonIndexBackend
+from .models import SearchEntry
+
+
+class SearchTestMixin:
+    @classmethod
+    def setUpTestData(cls):
+        cls.tech = User.objects.create_user("tech@example.com", "x", role=User.Role.TEHNICIAN, is_active=True)
+        cls.client_user = User.objects.create_user("client@example.com", "x", company_name="Client SRL", is_active=True)
+        cls.doc_type = DocumentType.objects.create(code="work_order", name="Ordin de lucru", series="OL")
+        # toate documentele se potrivesc; al tehnicianului e ultimul creat
+        cls.docs = [
+            Document.objects.create(doc_type=cls.doc_type, number=f"OL-{i:05d}",
+                                    client_user=cls.client_user, data_json={"echipament": "Pompă"})
+            for i in range(1, 6)
+        ]
+        cls.docs[-1].technicians.add(cls.tech)
+
+
+@plain_static_storage
+class AccessFilterBeforeLimitTests(SearchTestMixin, TestCase):
+    databases = {"default", "analytics"}
+
+    def test_within_ids_applied_before_limit(self):
+        own = self.docs[-1].pk
+        self.assertEqual(search_ids("document", "pompa", limit=2, within=[own]), [own])
+
+    def test_within_queryset_applied_before_limit(self):
+        within = filter_accessible(Document.objects.all(), self.tech)
+        self.assertEqual(search_ids("document", "pompa", limit=1, within=within), [self.docs[-1].pk])
+
+    def test_python_backend_applies_within(self):
+        backend = PythonIndexBackend()
+        hits = backend.query(["pompa"], ["document"], 1, within={self.docs[-1].pk})
+        self.assertEqual([h.object_id for h in hits], [self.docs[-1].pk])
+
+    def test_document_list_finds_documents_outside_global_limit(self):
+        self.client.force_login(self.tech)
+        # limita globală = 1: documentul tehnicianului nu e primul în clasament
+        with mock.patch.object(search_ids, "__defaults__", (1, None)):
+            response = self.client.get(reverse("documents:list"), {"q": "pompa"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([d.pk for d in response.context["page_obj"]], [self.docs[-1].pk])
+
+
+@mock.patch.object(backends, "SYNC_INTERVAL", 0)
+class PythonIndexSyncTests(SearchTestMixin, TestCase):
+    """
+    Două instanțe = două procese: scrierile uneia ajung în cealaltă prin tabel.
+    """
+
+    def test_other_process_picks_up_new_and_deleted_entries(self):
+        writer, reader = PythonIndexBackend(), PythonIndexBackend()
+        self.assertEqual(len(reader.query(["compresor"], [], None)), 0)
+
+        entry = SearchEntry.objects.create(kind="document", object_id=999, title="compresor", body="")
+        writer.upsert(entry)
+        self.assertEqual([h.object_id for h in reader.query(["compresor"], [], None)], [999])
+
+        SearchEntry.objects.filter(pk=entry.pk).delete()
+        writer.delete([entry.pk])
+        self.assertEqual(reader.query(["compresor"], [], None), [])
+
+    def test_sync_does_not_rebuild_whole_index(self):
+        reader = PythonIndexBackend()
+        reader.query(["pompa"], [], None)
+
+        with mock.patch.object(reader, "_rebuild") as rebuild:
+            SearchEntry.objects.create(kind="document", object_id=998, title="ventil", body="")
+            self.assertEqual(len(reader.query(["ventil"], [], None)), 1)
+        rebuild.assert_not_called()
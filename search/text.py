@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+import re
+import unicodedata
+from typing import List
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def fold_text(value) -> str:
+    """
+    Normalizare pentru căutare: lower + fără diacritice (ș -> s, ț -> t etc.).
+    """
+    s = unicodedata.normalize("NFKD", str(value or ""))
+    s = "".join(ch for ch in s if not unicodedata.combining(ch))
+    return " ".join(s.lower().split())
+
+
+def tokenize(value) -> List[str]:
+    """
+    Tokenuri alfanumerice din text normalizat ("OL-00012" -> ["ol", "00012"]).
+    """
+    return TOKEN_RE.findall(fold_text(value))
@@ -33,10 +33,16 @@ INSTALLED_APPS = [
     "jazzmin",
     "analytics",
     "documents",
+    "search",
+    "perf",
+    "notifications",
 
 ]
 
 MIDDLEWARE = [
+    "perf.middleware.TemplateProfilerMiddleware",  # primul: măsoară tot lanțul de randare
+    "perf.middleware.QueryBudgetMiddleware",
+    "perf.middleware.QueryCaptureMiddleware",
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -55,8 +61,14 @@ TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [BASE_DIR / "templates"],
-        'APP_DIRS': True,
         'OPTIONS': {
+            # template-uri compilate o singură dată per proces (și în DEBUG; runserver le reîncarcă la modificare)
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
             'context_processors': [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
@@ -78,9 +90,59 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
-    }
+        # tranzacțiile de scriere iau lock-ul la BEGIN (fără upgrade SHARED -> RESERVED care eșuează imediat)
+        'OPTIONS': {'transaction_mode': 'IMMEDIATE'},
+        'CONN_MAX_AGE': 60,
+        'CONN_HEALTH_CHECKS': True,
+    },
+    # telemetrie (PageView, AbuseEvent, BlockedIP): lock de scriere separat de tichete/documente
+    # python manage.py migrate --database analytics
+    'analytics': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'analytics.sqlite3',
+        'OPTIONS': {'transaction_mode': 'IMMEDIATE'},
+        'CONN_MAX_AGE': 60,
+        'CONN_HEALTH_CHECKS': True,
+    },
+    # replici de raportare (perf/replica.py): snapshot-uri reîmprospătate cu
+    # python manage.py refresh_replica --every 300 ; cu Postgres: replica fizică, fără snapshot
+    'replica': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'replica.sqlite3',
+        'CONN_MAX_AGE': 0,  # fiecare cerere vede ultimul snapshot
+        'PRAGMAS': {'query_only': 1, 'cache_size': -65536, 'mmap_size': 268435456, 'temp_store': 'MEMORY'},
+        'TEST': {'MIRROR': 'default'},
+    },
+    'analytics_replica': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'analytics_replica.sqlite3',
+        'CONN_MAX_AGE': 0,
+        'PRAGMAS': {'query_only': 1, 'cache_size': -65536, 'mmap_size': 268435456, 'temp_store': 'MEMORY'},
+        'TEST': {'MIRROR': 'analytics'},
+    },
 }
 
+# primul router decide citirile din reporting() (exporturi, rapoarte analytics)
+DATABASE_ROUTERS = ['perf.replica.ReplicaRouter', 'analytics.routers.AnalyticsRouter']
+
+# alias principal -> replică; peste REPORTING_MAX_LAG secunde se citește din baza principală
+REPORTING_REPLICAS = {'default': 'replica', 'analytics': 'analytics_replica'}
+REPORTING_MAX_LAG = 900
+
+# pragma-uri aplicate la fiecare conexiune nouă (perf/sqlite.py); per alias: DATABASES[alias]["PRAGMAS"].
+# Doar cu SQLITE_PRODUCTION_PROFILE: WAL rămâne setat în fișierul bazei (+ fișierele -wal / -shm)
+SQLITE_PRODUCTION_PROFILE = not DEBUG
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": 5000,
+    "cache_size": -65536,
+    "mmap_size": 268435456,
+    "temp_store": "MEMORY",
+}
+# reîncercări (backoff exponențial) la "database is locked", doar unde e sigur
+SQLITE_LOCK_RETRIES = 5
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -132,12 +194,52 @@ LOCALE_PATHS = [BASE_DIR / "locale"]
 STATIC_URL = "static/"
 STATICFILES_DIRS = []
 STATIC_ROOT = BASE_DIR / "staticfiles"
+# collectstatic: CSS minificat, imagini optimizate, nume cu hash + .gz/.br (website/publish/assets.py)
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "website.publish.assets.VertixStaticStorage"},
+}
 MAX_UPLOAD_SIZE = 200 * 1024 * 1024  # 200MB
 
 DATA_UPLOAD_MAX_MEMORY_SIZE = MAX_UPLOAD_SIZE  # protejează request body
 FILE_UPLOAD_MAX_MEMORY_SIZE = MAX_UPLOAD_SIZE  # fișiere > prag merg în temp
 MEDIA_URL = "media/"
 MEDIA_ROOT = BASE_DIR / "media"
+# media/chat/, media/requests/, media/generated_docs/ trec prin portal/views_media.py (drept de acces);
+# fișierele le trimite web server-ul: "nginx" (X-Accel-Redirect), "sendfile" (X-Sendfile) sau "django" (dev)
+PROTECTED_MEDIA_SERVER = "django"  # în prod: "nginx"
+PROTECTED_MEDIA_INTERNAL_URL = "/protected-media/"
+
+# Fișiere publice generate (sitemap.xml, feed-uri), servite direct de nginx
+SITE_URL = "http://localhost:8000"  # în prod: domeniul public, fără "/" la final
+PUBLISH_ROOT = BASE_DIR / "public"
+# pagini publice pre-randate în PUBLISH_ROOT (python manage.py export_static);
+# modificările intră în coadă, golită de publish_worker --every 30
+STATIC_EXPORT = False  # în prod: True
+
+# profiler randare template-uri (perf/): antete Server-Timing / X-Template-Profile + log "perf.templates"
+TEMPLATE_PROFILER = DEBUG
+TEMPLATE_PROFILER_SLOW_MS = 50
+
+# interogări SQL per cerere (perf/): antete X-Query-* în DEBUG, N+1 = același șablon de > N ori,
+# QUERY_BUDGET_STRICT = True face ca view-urile cu @query_budget depășit să ridice excepție (teste)
+QUERY_BUDGET = DEBUG
+QUERY_BUDGET_STRICT = False
+QUERY_NPLUSONE_THRESHOLD = 5
+# eșantionare pentru python manage.py index_advisor --capture (0 = oprit; ex. 0.01 = 1% din cereri)
+QUERY_CAPTURE_RATE = 0
+QUERY_CAPTURE_FILE = BASE_DIR / 'perf' / 'captures' / 'queries.jsonl'
+
+# Notificări email (notifications/): outbox scris în tranzacția evenimentului,
+# trimis de python manage.py notifications_worker --every 30.
+# Teste / local: "django.core.mail.backends.locmem.EmailBackend" sau
+# "django.core.mail.backends.filebased.EmailBackend" (+ EMAIL_FILE_PATH)
+EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
+DEFAULT_FROM_EMAIL = "Vertix <no-reply@localhost>"
+NOTIFICATIONS_DIGEST_DELAY = 60  # secunde: evenimentele din fereastră ajung într-un singur email
+NOTIFICATIONS_MAX_ATTEMPTS = 8
+NOTIFICATIONS_RETRY_BASE = 60  # secunde; dublat la fiecare încercare
+NOTIFICATIONS_RETRY_CAP = 6 * 3600
 AUTH_USER_MODEL = "accounts.User"
 
 LOGIN_URL = "login"
@@ -0,0 +1,34 @@
+"""
+Profil PostgreSQL: DJANGO_SETTINGS_MODULE=vertix_site.settings_postgres
+
+Necesită psycopg[binary,pool] și extensiile pg_trgm + unaccent (le creează migrările;
+ambele sunt "trusted" din PG 13, deci ajunge owner-ul bazei).
+Același cod și aceleași migrări ca pe SQLite; pe Postgres se adaugă indexurile trigram.
+"""
+
+from .settings import *  # noqa: F401,F403
+
+_PG = {
+    'ENGINE': 'django.db.backends.postgresql',
+    'HOST': 'localhost',
+    'PORT': 5432,
+    'USER': 'vertix',
+    'PASSWORD': 'vertix',
+    # pool psycopg 3 (Django 5.1+): conexiuni refolosite între cereri, fără CONN_MAX_AGE
+    'CONN_MAX_AGE': 0,
+    'OPTIONS': {
+        'pool': {'min_size': 2, 'max_size': 10, 'timeout': 10},
+        'connect_timeout': 5,
+    },
+}
+
+DATABASES = {
+    'default': {**_PG, 'NAME': 'vertix'},
+    # bază separată: django_migrations e per bază, iar router-ul de analytics migrează doar aici
+    'analytics': {**_PG, 'NAME': 'vertix_analytics'},
+    # replică fizică (hot standby), opțional:
+    # 'replica': {**_PG, 'NAME': 'vertix', 'HOST': 'replica.local', 'TEST': {'MIRROR': 'default'}},
+}
+
+# fără snapshot-uri SQLite; cu 'replica' configurat: {'default': 'replica'}
+REPORTING_REPLICAS = {}
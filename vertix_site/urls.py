@@ -1,13 +1,16 @@
 from django.conf import settings
 from django.conf.urls.i18n import i18n_patterns
 from django.conf.urls.static import static
-from django.urls import path, include
+from django.urls import path, include, re_path
 from django.views.generic import RedirectView
+from portal.views_media import protected_media, protected_url_pattern
 from website.admin_site import vertix_admin_site
 
 urlpatterns = [
     path("", RedirectView.as_view(url="/ro/", permanent=False)),  # <-- ADĂUGAT
     path("i18n/", include("django.conf.urls.i18n")),
+    # înaintea static() din DEBUG: atașamentele / documentele trec prin verificarea de acces
+    re_path(protected_url_pattern(), protected_media, name="protected_media"),
 ]
 
 urlpatterns += i18n_patterns(
@@ -49,7 +49,7 @@ class JobAdmin(admin.ModelAdmin):
 class ContactMessageAdmin(admin.ModelAdmin):
     list_display = ("name", "email", "phone", "company", "is_read", "created_at")
     list_filter = ("is_read", "created_at")
-    search_fields = ("name", "email", "company", "phone", "message")
+    search_fields = ("name__uicontains", "email", "company__uicontains", "phone", "message__uicontains")
     readonly_fields = ("created_at",)
     date_hierarchy = "created_at"
     ordering = ("-created_at",)
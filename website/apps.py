@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class WebsiteConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'website'
+
+    def ready(self):
+        from .signals import connect_dashboard_signals, connect_export_signals
+        connect_dashboard_signals()
+        connect_export_signals()
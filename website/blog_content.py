@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import re
+from html import escape
+from html.parser import HTMLParser
+from typing import Dict, List
+from urllib.parse import urlsplit
+
+from django.core.cache import cache
+from django.db.models import Count
+from django.db.models.functions import TruncMonth
+from django.utils.html import strip_tags
+from django.utils.safestring import mark_safe
+from django.utils.text import Truncator
+
+from . import blog_nav
+
+EXCERPT_CHARS = 140
+CACHE_TTL = 60 * 60 * 24
+# în cheia HTML-ului din cache: o schimbare a regulilor de mai jos re-sanitizează tot
+SANITIZER_VERSION = 2
+
+# ============================================================
+# HTML sanitizat (conținut TinyMCE)
+# ============================================================
+
+# ce produce editorul (TinyMCE cu pluginurile "image" și "media" din settings)
+ALLOWED_TAGS = {
+    "p", "br", "hr", "div", "span", "h1", "h2", "h3", "h4", "h5", "h6",
+    "strong", "b", "em", "i", "u", "s", "sub", "sup", "small", "mark",
+    "a", "ul", "ol", "li", "blockquote", "code", "pre",
+    "img", "figure", "figcaption", "video", "audio", "source", "iframe",
+    "table", "thead", "tbody", "tfoot", "tr", "th", "td", "caption",
+}
+VOID_TAGS = {"br", "hr", "img", "source"}
+# conținutul acestor taguri se aruncă de tot
+DROP_CONTENT_TAGS = {"script", "style", "object", "embed", "template", "noscript"}
+# <iframe> doar prin https, de la aceste host-uri (embed-urile pluginului "media");
+# restul se aruncă, cu tot cu conținut
+EMBED_HOSTS = {
+    "www.youtube.com", "youtube.com", "www.youtube-nocookie.com",
+    "player.vimeo.com", "www.google.com", "maps.google.com",
+}
+
+ALLOWED_ATTRS = {
+    "*": {"class", "style", "title"},
+    "a": {"href", "target", "rel"},
+    "img": {"src", "alt", "width", "height", "loading"},
+    "iframe": {"src", "width", "height", "allow", "allowfullscreen", "frameborder", "referrerpolicy"},
+    "video": {"src", "poster", "width", "height", "controls", "loop", "muted", "playsinline", "preload"},
+    "audio": {"src", "controls", "loop", "preload"},
+    "source": {"src", "type"},
+    "td": {"colspan", "rowspan"},
+    "th": {"colspan", "rowspan", "scope"},
+    "ol": {"start", "type"},
+}
+URL_ATTRS = {"href", "src", "poster"}
+SAFE_URL_RE = re.compile(r"^(https?:|mailto:|tel:|/|#|[^:]*$)", re.IGNORECASE)
+# imagini lipite în editor (fără SVG: poate conține script)
+DATA_IMAGE_RE = re.compile(r"^data:image/(png|jpe?g|gif|webp);base64,[a-z0-9+/=\s]*$", re.IGNORECASE)
+UNSAFE_STYLE_RE = re.compile(r"expression|javascript:|url\s*\(|@import|behavior", re.IGNORECASE)
+
+
+def _safe_url(tag: str, url: str) -> bool:
+    if tag == "img" and DATA_IMAGE_RE.match(url):
+        return True
+    return bool(SAFE_URL_RE.match(url))
+
+
+def _allowed_embed(attrs) -> bool:
+    src = urlsplit(dict(attrs).get("src") or "")
+    return src.scheme == "https" and (src.hostname or "") in EMBED_HOSTS
+
+
+class _Sanitizer(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.out: List[str] = []
+        self.open: List[str] = []
+        self.drop_depth = 0
+
+    def _attrs(self, tag, attrs) -> str:
+        allowed = ALLOWED_ATTRS["*"] | ALLOWED_ATTRS.get(tag, set())
+        parts = []
+        for name, value in attrs:
+            name = name.lower()
+            value = value or ""
+            if name not in allowed:
+                continue
+            if name in URL_ATTRS and not _safe_url(tag, value.strip()):
+                continue
+            if name == "style" and UNSAFE_STYLE_RE.search(value):
+                continue
+            parts.append(f' {name}="{escape(value, quote=True)}"')
+        names = {n.lower() for n, _ in attrs}
+        if tag == "a" and "target" in names and "rel" not in names:
+            parts.append(' rel="noopener noreferrer"')
+        return "".join(parts)
+
+    def handle_starttag(self, tag, attrs):
+        if tag in DROP_CONTENT_TAGS or (tag == "iframe" and (self.drop_depth or not _allowed_embed(attrs))):
+            self.drop_depth += 1
+            return
+        if self.drop_depth or tag not in ALLOWED_TAGS:
+            return
+        self.out.append(f"<{tag}{self._attrs(tag, attrs)}>")
+        if tag not in VOID_TAGS:
+            self.open.append(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        if self.drop_depth or tag not in ALLOWED_TAGS:
+            return
+        self.out.append(f"<{tag}{self._attrs(tag, attrs)}>")
+
+    def handle_endtag(self, tag):
+        if tag in DROP_CONTENT_TAGS or (tag == "iframe" and self.drop_depth):
+            self.drop_depth = max(0, self.drop_depth - 1)
+            return
+        if self.drop_depth or tag not in self.open:
+            return
+        # închidem și tagurile rămase deschise în interior
+        while self.open:
+            t = self.open.pop()
+            self.out.append(f"</{t}>")
+            if t == tag:
+                break
+
+    def handle_data(self, data):
+        if not self.drop_depth:
+            self.out.append(escape(data, quote=False))
+
+    def result(self) -> str:
+        while self.open:
+            self.out.append(f"</{self.open.pop()}>")
+        return "".join(self.out)
+
+
+def sanitize_html(html: str) -> str:
+    """
+    Allowlist de taguri / atribute pentru HTML-ul din editor (fără script, on*, javascript:).
+    """
+    parser = _Sanitizer()
+    parser.feed(html or "")
+    parser.close()
+    return parser.result()
+
+
+# ============================================================
+# Cache per articol (id + updated_at)
+# ============================================================
+
+def _stamp(post) -> str:
+    return post.updated_at.strftime("%Y%m%d%H%M%S%f") if post.updated_at else "0"
+
+
+def _key(kind: str, post) -> str:
+    return f"blog:{kind}:{post.pk}:{_stamp(post)}"
+
+
+def make_excerpt(short: str, content: str) -> str:
+    text = short or " ".join(strip_tags(content or "").split())
+    return Truncator(text).chars(EXCERPT_CHARS)
+
+
+def attach_excerpts(posts) -> None:
+    """
+    Setează post.excerpt pentru o pagină de articole încărcate fără "content".
+    Conținutul se citește (o singură interogare) doar pentru intrările lipsă din cache.
+    """
+    from .models import BlogPost
+
+    posts = list(posts)
+    keys = {_key("excerpt", p): p for p in posts}
+    cached = cache.get_many(list(keys))
+
+    missing = {k: p for k, p in keys.items() if k not in cached}
+    if missing:
+        contents = dict(
+            BlogPost.objects.filter(pk__in=[p.pk for p in missing.values()]).values_list("pk", "content")
+        )
+        fresh = {k: make_excerpt(p.short, contents.get(p.pk, "")) for k, p in missing.items()}
+        cache.set_many(fresh, CACHE_TTL)
+        cached.update(fresh)
+
+    for k, p in keys.items():
+        p.excerpt = cached[k]
+
+
+def rendered_content(post) -> str:
+    """
+    HTML sanitizat pentru blog_detail, din cache (cheia se schimbă la fiecare editare).
+    """
+    key = f"{_key('html', post)}:{SANITIZER_VERSION}"
+    html = cache.get(key)
+    if html is None:
+        html = sanitize_html(post.content)
+        cache.set(key, html, CACHE_TTL)
+    return mark_safe(html)
+
+
+# ============================================================
+# Arhivă pe luni
+# ============================================================
+
+def month_archive() -> List[Dict]:
+    """
+    [{"month": date, "count": n}, ...] descrescător; recalculată doar după modificări pe blog.
+    """
+    from .models import BlogPost
+
+    key = f"blog:archive:{blog_nav.version()}"
+    months = cache.get(key)
+    if months is None:
+        months = list(
+            BlogPost.objects.filter(is_published=True)
+            .annotate(month=TruncMonth("published_at"))
+            .values("month")
+            .annotate(count=Count("id"))
+            .order_by("-month")
+        )
+        cache.set(key, months, blog_nav.CACHE_TTL)
+    return months
@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import math
+from collections import Counter
+from typing import Dict, List, Optional
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q
+from django.utils.html import strip_tags
+
+from perf.versions import VersionWatcher
+from search.text import tokenize
+
+VERSION_KEY = "blog:nav:version"
+RELATED_COUNT = 4
+# cardurile sunt legate de versiune; TTL doar ca limită de memorie
+CACHE_TTL = 3600
+
+# cuvinte prea comune ca să conteze la similaritate
+STOPWORDS = {
+    "and", "are", "ale", "cea", "cel", "cele", "cei", "care", "cum", "cand", "catre",
+    "din", "dar", "daca", "decat", "doar", "este", "fie", "for", "fost", "intr", "intre",
+    "iar", "lui", "mai", "mult", "noi", "nostru", "noastra", "pentru", "prin", "pot",
+    "poate", "sau", "sunt", "sub", "spre", "the", "unde", "unei", "unui", "unor", "vor",
+    "with", "sale", "asa", "acest", "aceasta", "aceste", "acum", "avem", "fara",
+}
+
+
+# versiunea e în baza de date (perf.versions): toate procesele văd modificarea
+_watcher = VersionWatcher(VERSION_KEY)
+
+
+def invalidate() -> None:
+    _watcher.bump()
+
+
+def version() -> int:
+    """
+    Versiunea navigării, pentru cheile de cache ale blogului (carduri, arhivă).
+    """
+    return _watcher.current()
+
+
+# ============================================================
+# TF-IDF
+# ============================================================
+
+def _terms(post) -> Counter:
+    text = " ".join([post.title, post.title, post.short or "", strip_tags(post.content or "")])
+    return Counter(t for t in tokenize(text) if len(t) > 2 and not t.isdigit() and t not in STOPWORDS)
+
+
+def _tfidf_vectors(posts) -> Dict[int, Dict[str, float]]:
+    tfs = {p.pk: _terms(p) for p in posts}
+    df = Counter()
+    for tf in tfs.values():
+        df.update(tf.keys())
+
+    n = len(tfs) or 1
+    vectors = {}
+    for pk, tf in tfs.items():
+        vec = {t: (1 + math.log(c)) * math.log((1 + n) / (1 + df[t])) for t, c in tf.items()}
+        norm = math.sqrt(sum(w * w for w in vec.values())) or 1.0
+        vectors[pk] = {t: w / norm for t, w in vec.items() if w > 0}
+    return vectors
+
+
+def _related(vectors: Dict[int, Dict[str, float]], order: List[int], limit: int) -> Dict[int, List[int]]:
+    # index inversat termen -> [(post, pondere)], ca să nu comparăm fiecare pereche
+    postings: Dict[str, List] = {}
+    for pk, vec in vectors.items():
+        for t, w in vec.items():
+            postings.setdefault(t, []).append((pk, w))
+
+    out = {}
+    for pk, vec in vectors.items():
+        scores: Dict[int, float] = Counter()
+        for t, w in vec.items():
+            for other, w2 in postings[t]:
+                if other != pk:
+                    scores[other] += w * w2
+        best = sorted(scores, key=lambda o: -scores[o])[:limit]
+
+        # completăm cu cele mai noi articole dacă nu sunt destule similare
+        if len(best) < limit:
+            for other in order:
+                if other != pk and other not in best:
+                    best.append(other)
+                    if len(best) >= limit:
+                        break
+        out[pk] = best
+    return out
+
+
+# ============================================================
+# Recalculare
+# ============================================================
+
+def rebuild_navigation() -> int:
+    """
+    Recalculează prev/next (după published_at, indexul (is_published, published_at))
+    și articolele similare pentru toate articolele publicate.
+    """
+    from .models import BlogPost, BlogPostNav
+
+    posts = list(
+        BlogPost.objects.filter(is_published=True)
+        .only("id", "title", "short", "content", "published_at")
+        .order_by("published_at", "id")
+    )
+    ids = [p.pk for p in posts]
+    newest_first = list(reversed(ids))
+    related = _related(_tfidf_vectors(posts), newest_first, RELATED_COUNT)
+
+    rows = []
+    for i, pk in enumerate(ids):
+        rows.append(BlogPostNav(
+            post_id=pk,
+            prev_post_id=ids[i - 1] if i > 0 else None,
+            next_post_id=ids[i + 1] if i + 1 < len(ids) else None,
+            related_ids=related.get(pk, []),
+        ))
+
+    with transaction.atomic():
+        BlogPostNav.objects.all().delete()
+        BlogPostNav.objects.bulk_create(rows, batch_size=500)
+
+    invalidate()
+    return len(rows)
+
+
+# ============================================================
+# Citire (blog_detail)
+# ============================================================
+
+def neighbours(post) -> dict:
+    """
+    {"prev": post|None, "next": post|None, "related": [post, ...]} pentru blog_detail.
+    post trebuie încărcat cu select_related("nav"); lista vine din cache
+    (o singură interogare la prima cerere după o modificare).
+    """
+    from .models import BlogPost, BlogPostNav
+
+    try:
+        nav = post.nav
+    except BlogPostNav.DoesNotExist:
+        # articol publicat înainte ca recalcularea de după commit să se termine:
+        # doar prev/next pentru el, fără cache; tabelul îl reface semnalul / comanda
+        return _single_post_nav(post)
+
+    key = f"blog:nav:{version()}:{post.pk}"
+    data = cache.get(key)
+    if data is not None:
+        return data
+
+    wanted = [i for i in [nav.prev_post_id, nav.next_post_id, *nav.related_ids] if i]
+    cards = (
+        BlogPost.objects.filter(is_published=True)
+        .only("id", "title", "slug", "image", "published_at")
+        .in_bulk(wanted)
+    )
+
+    def _card(pk: Optional[int]):
+        return cards.get(pk) if pk else None
+
+    data = {
+        "prev": _card(nav.prev_post_id),
+        "next": _card(nav.next_post_id),
+        "related": [cards[i] for i in nav.related_ids if i in cards],
+    }
+    cache.set(key, data, CACHE_TTL)
+    return data
+
+
+def _single_post_nav(post) -> dict:
+    from .models import BlogPost
+
+    published = BlogPost.objects.filter(is_published=True).only("id", "title", "slug", "image", "published_at")
+    # aceeași ordine ca rebuild_navigation: (published_at, id)
+    at = post.published_at
+    prev = (
+        published.filter(Q(published_at__lt=at) | Q(published_at=at, id__lt=post.pk))
+        .order_by("-published_at", "-id").first()
+    )
+    nxt = (
+        published.filter(Q(published_at__gt=at) | Q(published_at=at, id__gt=post.pk))
+        .order_by("published_at", "id").first()
+    )
+    return {"prev": prev, "next": nxt, "related": []}
@@ -0,0 +1,255 @@
+from __future__ import annotations
+
+import bisect
+import threading
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from perf.versions import VersionWatcher
+from search.text import tokenize
+
+VERSION_KEY = "catalog:index:version"
+
+# ponderi pentru ordonarea după relevanță
+TITLE_WEIGHT = 10
+SKU_WEIGHT = 8
+SPECS_WEIGHT = 2
+TEXT_WEIGHT = 1
+
+FACETS = ("cat", "brand", "avail")
+
+
+@dataclass(frozen=True)
+class ProductEntry:
+    pk: int
+    sort_key: Tuple[int, str]
+    cat: str     # slug categorie
+    brand: str   # nume brand
+    avail: str
+
+
+@dataclass
+class CatalogResult:
+    ids: List[int]
+    facets: Dict[str, Dict[str, int]]
+
+
+def _weighted_terms(product) -> Dict[str, int]:
+    tf: Dict[str, int] = defaultdict(int)
+    for t in tokenize(product.title):
+        tf[t] += TITLE_WEIGHT
+    for t in tokenize(product.sku):
+        tf[t] += SKU_WEIGHT
+    specs = product.specs if isinstance(product.specs, dict) else {}
+    for k, v in specs.items():
+        for t in tokenize(f"{k} {v}"):
+            tf[t] += SPECS_WEIGHT
+    for t in tokenize(product.short_description):
+        tf[t] += TEXT_WEIGHT
+    return dict(tf)
+
+
+class CatalogIndex:
+    """
+    Index inversat al produselor active (titlu, SKU, specs) + seturi per valoare de fațetă.
+    Contoarele globale ale fațetelor se actualizează incremental la fiecare produs salvat;
+    celelalte procese observă versiunea din baza de date (perf.versions) și reconstruiesc
+    indexul la următoarea citire.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._watcher = VersionWatcher(VERSION_KEY)
+        self._reset()
+
+    def _reset(self) -> None:
+        self._entries: Dict[int, ProductEntry] = {}
+        self._postings: Dict[str, Dict[int, int]] = defaultdict(dict)
+        self._vocab: List[str] = []
+        self._terms: Dict[int, List[str]] = {}
+        self._facet_sets: Dict[str, Dict[str, Set[int]]] = {f: defaultdict(set) for f in FACETS}
+        self._facet_counts: Dict[str, Counter] = {f: Counter() for f in FACETS}
+
+    # ---- construire ----
+    def _add(self, product) -> None:
+        entry = ProductEntry(
+            pk=product.pk,
+            sort_key=(product.order, product.title.lower()),
+            cat=product.category.slug if product.category_id else "",
+            brand=product.brand.name if product.brand_id else "",
+            avail=product.availability,
+        )
+        self._entries[entry.pk] = entry
+
+        tf = _weighted_terms(product)
+        for t, w in tf.items():
+            if t not in self._postings:
+                bisect.insort(self._vocab, t)
+            self._postings[t][entry.pk] = w
+        self._terms[entry.pk] = list(tf)
+
+        for facet in FACETS:
+            value = getattr(entry, facet)
+            if value:
+                self._facet_sets[facet][value].add(entry.pk)
+                self._facet_counts[facet][value] += 1
+
+    def _remove(self, pk: int) -> None:
+        entry = self._entries.pop(pk, None)
+        if entry is None:
+            return
+
+        for t in self._terms.pop(pk, []):
+            self._postings[t].pop(pk, None)
+            if not self._postings[t]:
+                del self._postings[t]
+                i = bisect.bisect_left(self._vocab, t)
+                if i < len(self._vocab) and self._vocab[i] == t:
+                    self._vocab.pop(i)
+
+        for facet in FACETS:
+            value = getattr(entry, facet)
+            if value:
+                self._facet_sets[facet][value].discard(pk)
+                self._facet_counts[facet][value] -= 1
+                if self._facet_counts[facet][value] <= 0:
+                    del self._facet_counts[facet][value]
+                    self._facet_sets[facet].pop(value, None)
+
+    def _rebuild(self) -> None:
+        from .models import Product
+
+        self._reset()
+        qs = Product.objects.filter(is_active=True).select_related("brand", "category")
+        for p in qs.iterator(chunk_size=2000):
+            self._add(p)
+
+    def _ensure_fresh(self) -> None:
+        if self._watcher.stale():
+            self._rebuild()
+            self._watcher.synced()
+
+    def version(self) -> int:
+        """
+        Versiunea indexului (pentru cache-uri derivate, ex: cheile de filtre din specs).
+        """
+        with self._lock:
+            self._ensure_fresh()
+            return self._watcher.token or 0
+
+    # ---- actualizare incrementală ----
+    def update(self, product) -> None:
+        with self._lock:
+            if self._watcher.token is not None:
+                self._remove(product.pk)
+                if product.is_active:
+                    self._add(product)
+            # rămânem "la zi" doar dacă indexul local era deja sincronizat
+            self._watcher.bump()
+
+    def remove(self, pk: int) -> None:
+        with self._lock:
+            if self._watcher.token is not None:
+                self._remove(pk)
+            self._watcher.bump()
+
+    def invalidate(self) -> None:
+        # ex: redenumire brand / slug categorie schimbat
+        with self._lock:
+            self._watcher.reset()
+            self._watcher.bump()
+
+    # ---- interogare ----
+    def _expand(self, token: str) -> List[str]:
+        i = bisect.bisect_left(self._vocab, token)
+        out = []
+        while i < len(self._vocab) and self._vocab[i].startswith(token):
+            out.append(self._vocab[i])
+            i += 1
+        return out
+
+    def _text_scores(self, q: str) -> Optional[Dict[int, int]]:
+        tokens = tokenize(q)
+        if not tokens:
+            return None
+        scores: Optional[Dict[int, int]] = None
+        for token in tokens:
+            token_scores: Dict[int, int] = defaultdict(int)
+            for term in self._expand(token):
+                for pk, w in self._postings[term].items():
+                    # potrivirea exactă contează mai mult decât prefixul
+                    token_scores[pk] = max(token_scores[pk], w * 2 if term == token else w)
+            if scores is None:
+                scores = dict(token_scores)
+            else:
+                scores = {pk: s + token_scores[pk] for pk, s in scores.items() if pk in token_scores}
+            if not scores:
+                break
+        return scores or {}
+
+    def search(self, q: str = "", filters: Optional[Dict[str, str]] = None,
+               restrict: Optional[Set[int]] = None) -> CatalogResult:
+        """
+        Produsele care corespund textului + filtrelor, ordonate, și contoarele de fațete.
+        Contorul unei fațete ignoră filtrul propriu (ex: numărul pe fiecare brand
+        ține cont de categorie și disponibilitate, dar nu de brandul selectat).
+        restrict: id-uri deja filtrate în altă parte (ex: intervale pe specs).
+        """
+        filters = {f: v for f, v in (filters or {}).items() if f in FACETS and v}
+
+        with self._lock:
+            self._ensure_fresh()
+            scores = self._text_scores(q)
+
+            if scores is None and not filters and restrict is None:
+                ids = sorted(self._entries, key=lambda pk: self._entries[pk].sort_key)
+                facets = {f: dict(self._facet_counts[f]) for f in FACETS}
+                return CatalogResult(ids=ids, facets=facets)
+
+            base: Set[int] = set(self._entries) if scores is None else set(scores)
+            if restrict is not None:
+                base = base & restrict
+            selected = {f: self._facet_sets[f].get(v, set()) for f, v in filters.items()}
+
+            def _matching(skip: str = "") -> Set[int]:
+                out = base
+                for f, s in selected.items():
+                    if f != skip:
+                        out = out & s
+                return out
+
+            facets = {}
+            for facet in FACETS:
+                pool = _matching(skip=facet)
+                facets[facet] = {
+                    value: len(pool & members)
+                    for value, members in self._facet_sets[facet].items()
+                    if not pool.isdisjoint(members)
+                }
+
+            matched = _matching()
+            if scores is None:
+                ids = sorted(matched, key=lambda pk: self._entries[pk].sort_key)
+            else:
+                ids = sorted(matched, key=lambda pk: (-scores[pk], self._entries[pk].sort_key))
+
+        return CatalogResult(ids=ids, facets=facets)
+
+
+catalog_index = CatalogIndex()
+
+
+def search_catalog(q: str = "", filters: Optional[Dict[str, str]] = None,
+                   restrict: Optional[Set[int]] = None) -> CatalogResult:
+    return catalog_index.search(q, filters, restrict)
+
+
+def products_in_order(ids: Sequence[int]):
+    """
+    Produsele pentru o pagină de rezultate, în ordinea dată.
+    """
+    from .models import Product
+
+    by_pk = Product.objects.select_related("brand", "category").in_bulk(list(ids))
+    return [by_pk[pk] for pk in ids if pk in by_pk]
@@ -0,0 +1,547 @@
+from __future__ import annotations
+
+import csv
+import json
+import os
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files import File
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils._os import safe_join
+from django.utils.text import slugify
+
+from search.text import fold_text
+
+from .models import Brand, Product, ProductCategory
+
+BATCH_SIZE = 1000
+# bazele de slug verificate per interogare (limita de adâncime a expresiilor în SQLite)
+SLUG_QUERY_CHUNK = 200
+
+# coloanele exportate (și recunoscute la import); "spec:<Cheie>" = o cheie din specs
+COLUMNS = [
+    "sku", "title", "brand", "category", "availability", "lead_time_days",
+    "short_description", "description", "is_active", "order", "specs",
+    "datasheet", "image",
+]
+
+# câmpurile Product comparate / actualizate la upsert
+UPDATE_FIELDS = [
+    "title", "brand", "category", "availability", "lead_time_days",
+    "short_description", "description", "is_active", "order", "specs",
+]
+
+_TRUE = {"1", "true", "da", "yes", "y", "x", "activ"}
+_FALSE = {"0", "false", "nu", "no", "n", "inactiv"}
+
+
+@dataclass
+class ImportReport:
+    rows: int = 0
+    created: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    brands_created: int = 0
+    categories_created: int = 0
+    files_attached: int = 0
+    errors: List[str] = field(default_factory=list)
+    # fișiere scrise în storage (șterse dacă importul eșuează)
+    files_written: List[Tuple[object, str]] = field(default_factory=list, repr=False)
+    # (sku, {câmp: (vechi, nou)}) pentru dry-run / log
+    changes: List[Tuple[str, Dict[str, Tuple]]] = field(default_factory=list)
+    # dry-run: branduri / categorii "create" în loturile anterioare (nesalvate)
+    planned: Dict[str, object] = field(default_factory=dict, repr=False)
+
+
+# ============================================================
+# Citire (streaming)
+# ============================================================
+
+def _norm_header(h) -> str:
+    h = str(h or "").strip()
+    if h.lower().startswith("spec:"):
+        return "spec:" + h[5:].strip()
+    return fold_text(h).replace(" ", "_")
+
+
+def _read_csv(path: str) -> Iterator[Dict[str, str]]:
+    with open(path, newline="", encoding="utf-8-sig") as fh:
+        sample = fh.read(4096)
+        fh.seek(0)
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=",;\t")
+        except csv.Error:
+            dialect = csv.excel
+        reader = csv.reader(fh, dialect)
+        headers = [_norm_header(h) for h in next(reader, [])]
+        for values in reader:
+            yield dict(zip(headers, values))
+
+
+def _read_xlsx(path: str) -> Iterator[Dict[str, str]]:
+    from openpyxl import load_workbook
+
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = wb.active.iter_rows(values_only=True)
+        headers = [_norm_header(h) for h in next(rows, ())]
+        for values in rows:
+            if values is None or all(v in (None, "") for v in values):
+                continue
+            yield {h: ("" if v is None else v) for h, v in zip(headers, values)}
+    finally:
+        wb.close()
+
+
+def read_rows(path: str) -> Iterator[Dict[str, str]]:
+    if path.lower().endswith((".xlsx", ".xlsm")):
+        return _read_xlsx(path)
+    return _read_csv(path)
+
+
+def _batches(rows: Iterable, size: int) -> Iterator[List]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+# ============================================================
+# Conversii câmpuri
+# ============================================================
+
+def _str(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip()
+
+
+def _int(value) -> Optional[int]:
+    s = _str(value)
+    if not s:
+        return None
+    try:
+        return int(Decimal(s.replace(",", ".")))
+    except Exception:
+        raise ValueError(f"număr invalid: {s!r}")
+
+
+def _bool(value, default=True) -> bool:
+    s = fold_text(value)
+    if not s:
+        return default
+    if s in _TRUE:
+        return True
+    if s in _FALSE:
+        return False
+    raise ValueError(f"valoare da/nu invalidă: {value!r}")
+
+
+_AVAILABILITY = {}
+for _code, _label in Product.AVAILABILITY_CHOICES:
+    _AVAILABILITY[fold_text(_code)] = _code
+    _AVAILABILITY[fold_text(_label)] = _code
+
+
+def _availability(value) -> str:
+    s = fold_text(value)
+    if not s:
+        return "ORDER"
+    code = _AVAILABILITY.get(s) or _AVAILABILITY.get(s.replace(" ", "_"))
+    if not code:
+        raise ValueError(f"disponibilitate necunoscută: {value!r}")
+    return code
+
+
+def _specs(row: Dict) -> Optional[dict]:
+    """
+    Coloana "specs" (JSON sau "Cheie=Valoare; Cheie2=Valoare2") + coloane "spec:<Cheie>".
+    None = fișierul nu are specificații (nu le atingem la update).
+    """
+    has_specs = "specs" in row or any(k.startswith("spec:") for k in row)
+    if not has_specs:
+        return None
+
+    specs = {}
+    raw = _str(row.get("specs"))
+    if raw.startswith("{"):
+        data = json.loads(raw)
+        if not isinstance(data, dict):
+            raise ValueError("specs trebuie să fie un obiect JSON")
+        specs.update({str(k): _str(v) for k, v in data.items()})
+    elif raw:
+        for part in raw.split(";"):
+            if "=" in part:
+                k, v = part.split("=", 1)
+                if k.strip():
+                    specs[k.strip()] = v.strip()
+
+    for k, v in row.items():
+        if k.startswith("spec:") and _str(v):
+            specs[k[5:]] = _str(v)
+    return specs
+
+
+# ============================================================
+# Rezolvare bulk brand / categorie / slug
+# ============================================================
+
+def _resolve_brands(names: Iterable[str], dry_run: bool, report: ImportReport) -> Dict[str, Optional[Brand]]:
+    wanted = {fold_text(n): n for n in names if n}
+    if not wanted:
+        return {}
+
+    # Brand.name e unic, dar comparăm fără majuscule / diacritice
+    existing = {fold_text(b.name): b for b in Brand.objects.all()}
+    existing.update({k[6:]: v for k, v in report.planned.items() if k.startswith("brand:")})
+    missing = [Brand(name=name[:120]) for key, name in wanted.items() if key not in existing]
+
+    if missing:
+        report.brands_created += len(missing)
+        if not dry_run:
+            Brand.objects.bulk_create(missing, ignore_conflicts=True)
+            existing = {fold_text(b.name): b for b in Brand.objects.all()}
+        else:
+            for b in missing:
+                existing[fold_text(b.name)] = report.planned[f"brand:{fold_text(b.name)}"] = b
+
+    return {key: existing.get(key) for key in wanted}
+
+
+def _category_slug(name: str) -> str:
+    # ProductCategory.slug are max_length=50
+    return slugify(name)[:50].strip("-")
+
+
+def _resolve_categories(names: Iterable[str], dry_run: bool, report: ImportReport) -> Dict[str, Optional[ProductCategory]]:
+    wanted = {_category_slug(n): n for n in names if n and _category_slug(n)}
+    if not wanted:
+        return {}
+
+    existing = {c.slug: c for c in ProductCategory.objects.filter(slug__in=list(wanted))}
+    existing.update({k[4:]: v for k, v in report.planned.items() if k.startswith("cat:") and k[4:] in wanted})
+    missing = [ProductCategory(name=name[:120], slug=slug) for slug, name in wanted.items() if slug not in existing]
+
+    if missing:
+        report.categories_created += len(missing)
+        if not dry_run:
+            ProductCategory.objects.bulk_create(missing, ignore_conflicts=True)
+            existing = {c.slug: c for c in ProductCategory.objects.filter(slug__in=list(wanted))}
+        else:
+            for c in missing:
+                existing[c.slug] = report.planned[f"cat:{c.slug}"] = c
+
+    return existing
+
+
+def unique_slugs(titles: List[str], taken_in_batch: Optional[set] = None) -> List[str]:
+    """
+    Slug-uri unice pentru un lot de produse noi: slug-urile ocupate se citesc
+    o dată pentru tot lotul, apoi sufixele -2, -3 ... se alocă în memorie.
+    """
+    bases = [slugify(t)[:45] or "produs" for t in titles]
+    distinct = sorted(set(bases))
+
+    used = set(taken_in_batch or ())
+    for i in range(0, len(distinct), SLUG_QUERY_CHUNK):
+        cond = Q()
+        for base in distinct[i:i + SLUG_QUERY_CHUNK]:
+            cond |= Q(slug=base) | Q(slug__startswith=f"{base}-")
+        used.update(Product.objects.filter(cond).values_list("slug", flat=True))
+
+    out = []
+    for base in bases:
+        slug, n = base, 2
+        while slug in used:
+            slug = f"{base}-{n}"
+            n += 1
+        used.add(slug)
+        out.append(slug)
+    return out
+
+
+# ============================================================
+# Fișiere (datasheet / imagine) dintr-un folder local
+# ============================================================
+
+def _attach(product: Product, field_name: str, filename: str, files_dir: str, dry_run: bool,
+            written: List[Tuple[object, str]]) -> bool:
+    if not filename or not files_dir:
+        return False
+    current = getattr(product, field_name)
+    if current and os.path.basename(current.name) == os.path.basename(filename):
+        return False
+    try:
+        # numele vine din fișier: "../settings.py" sau o cale absolută nu ies din folder
+        path = safe_join(files_dir, filename)
+    except SuspiciousFileOperation:
+        raise ValueError(f"cale de fișier nepermisă: {filename}")
+    if not os.path.isfile(path):
+        raise ValueError(f"fișier lipsă: {filename}")
+    if not dry_run:
+        with open(path, "rb") as fh:
+            # FieldFile.save pune fișierul în upload_to; save=False -> scriem produsul în bulk
+            current.save(os.path.basename(filename), File(fh), save=False)
+        written.append((current.storage, current.name))
+    return True
+
+
+def _delete_files(written: List[Tuple[object, str]]) -> None:
+    for storage, name in written:
+        storage.delete(name)
+    written.clear()
+
+
+# ============================================================
+# Import
+# ============================================================
+
+# coloană din fișier -> (câmp, conversie); aliasuri românești acceptate
+_FIELD_COLUMNS = {
+    "title": ("title", lambda v: _str(v)[:180]),
+    "titlu": ("title", lambda v: _str(v)[:180]),
+    "denumire": ("title", lambda v: _str(v)[:180]),
+    "brand": ("brand", _str),
+    "category": ("category", _str),
+    "categorie": ("category", _str),
+    "availability": ("availability", _availability),
+    "disponibilitate": ("availability", _availability),
+    "lead_time_days": ("lead_time_days", _int),
+    "short_description": ("short_description", lambda v: _str(v)[:255]),
+    "description": ("description", _str),
+    "is_active": ("is_active", _bool),
+    "order": ("order", lambda v: _int(v) or 0),
+    "datasheet": ("datasheet", _str),
+    "image": ("image", _str),
+}
+
+
+def _parse_row(row: Dict) -> Dict:
+    """
+    Doar coloanele prezente în fișier; la update, câmpurile lipsă rămân neatinse.
+    """
+    sku = _str(row.get("sku") or row.get("cod"))
+    if not sku:
+        raise ValueError("lipsește SKU")
+
+    data = {"sku": sku[:64]}
+    for column, (name, convert) in _FIELD_COLUMNS.items():
+        if column in row:
+            data[name] = convert(row[column])
+
+    specs = _specs(row)
+    if specs is not None:
+        data["specs"] = specs
+    return data
+
+
+def _apply(product: Product, data: Dict, brands, categories) -> Dict[str, Tuple]:
+    changed = {}
+    for name in UPDATE_FIELDS:
+        if name not in data:
+            continue
+        new = data[name]
+
+        if name in ("brand", "category"):
+            if name == "brand":
+                new = brands.get(fold_text(new)) if new else None
+            else:
+                new = categories.get(_category_slug(new)) if new else None
+            old = getattr(product, name) if getattr(product, f"{name}_id") else None
+            if (old.pk if old else None) != (new.pk if new else None) or (new is not None and new.pk is None):
+                changed[name] = (str(old or ""), str(new or ""))
+                setattr(product, name, new)
+            continue
+
+        if name == "title" and not new:
+            continue
+        old = getattr(product, name)
+        if old != new:
+            changed[name] = (old, new)
+            setattr(product, name, new)
+    return changed
+
+
+def _import_batch(rows: List[Dict], files_dir: str, dry_run: bool, report: ImportReport,
+                  taken_slugs: set, touched: List[Product]) -> None:
+    parsed: Dict[str, Dict] = {}
+    for i, row in rows:
+        try:
+            data = _parse_row(row)
+        except (ValueError, json.JSONDecodeError) as e:
+            report.errors.append(f"rândul {i}: {e}")
+            continue
+        parsed[data["sku"]] = data  # SKU duplicat în fișier: ultimul rând câștigă
+
+    if not parsed:
+        return
+
+    brands = _resolve_brands((d.get("brand") for d in parsed.values()), dry_run, report)
+    categories = _resolve_categories((d.get("category") for d in parsed.values()), dry_run, report)
+
+    existing: Dict[str, Product] = {}
+    qs = Product.objects.filter(sku__in=list(parsed)).select_related("brand", "category").order_by("pk")
+    for p in qs:
+        existing.setdefault(p.sku, p)  # SKU nu e unic în DB: actualizăm primul
+
+    to_create, to_update = [], []
+    for sku, data in parsed.items():
+        product = existing.get(sku)
+        is_new = product is None
+        if is_new:
+            product = Product(sku=sku, specs={})
+
+        written: List[Tuple[object, str]] = []
+        try:
+            changed = _apply(product, data, brands, categories)
+            for name in ("datasheet", "image"):
+                if _attach(product, name, data.get(name, ""), files_dir, dry_run, written):
+                    changed[name] = ("", data[name])
+                    report.files_attached += 1
+        except ValueError as e:
+            # rândul respins: nici fișierele lui nu rămân
+            _delete_files(written)
+            report.errors.append(f"SKU {sku}: {e}")
+            continue
+        report.files_written.extend(written)
+
+        if is_new:
+            if not product.title:
+                report.errors.append(f"SKU {sku}: lipsește titlul")
+                continue
+            to_create.append(product)
+            report.changes.append((sku, changed))
+        elif changed:
+            to_update.append(product)
+            report.changes.append((sku, changed))
+        else:
+            report.unchanged += 1
+
+    for product, slug in zip(to_create, unique_slugs([p.title for p in to_create], taken_slugs)):
+        product.slug = slug
+        taken_slugs.add(slug)
+
+    report.created += len(to_create)
+    report.updated += len(to_update)
+    if dry_run:
+        return
+
+    # auto_now nu se aplică la bulk_update
+    now = timezone.now()
+    for product in to_create + to_update:
+        product.updated_at = now
+
+    Product.objects.bulk_create(to_create, batch_size=BATCH_SIZE)
+    Product.objects.bulk_update(to_update, UPDATE_FIELDS + ["datasheet", "image", "updated_at"], batch_size=BATCH_SIZE)
+    touched.extend(to_create)
+    touched.extend(to_update)
+
+
+def _after_import(products: List[Product]) -> None:
+    """
+    bulk_create / bulk_update nu trimit semnale: refacem aici ce fac receiverele
+    (specs indexate, index catalog, full-text, dashboard).
+    """
+    from search.api import index_many
+    from search.registry import KINDS
+
+    from . import dashboard
+    from .catalog import catalog_index
+    from .publish import sitemaps
+    from .specs import sync_many_product_specs
+
+    for batch in _batches(products, BATCH_SIZE):
+        sync_many_product_specs(batch)
+        index_many(KINDS["product"], batch)
+
+    catalog_index.invalidate()
+    dashboard.invalidate()
+    sitemaps.refresh_section("products")
+
+
+def import_catalog(path: str, files_dir: str = "", dry_run: bool = False,
+                   batch_size: int = BATCH_SIZE) -> ImportReport:
+    """
+    Import CSV/XLSX cu upsert după SKU. În dry-run nu se scrie nimic
+    (nici branduri/categorii, nici fișiere); raportul conține diferențele.
+    """
+    report = ImportReport()
+    taken_slugs: set = set()
+    touched: List[Product] = []
+
+    numbered = ((i, row) for i, row in enumerate(read_rows(path), start=2))
+    try:
+        with transaction.atomic():
+            for batch in _batches(numbered, batch_size):
+                report.rows += len(batch)
+                _import_batch(batch, files_dir, dry_run, report, taken_slugs, touched)
+
+            if not dry_run and touched:
+                _after_import(touched)
+    except BaseException:
+        # rollback: fișierele deja copiate în MEDIA_ROOT nu mai au produs
+        _delete_files(report.files_written)
+        raise
+
+    return report
+
+
+# ============================================================
+# Export (streaming)
+# ============================================================
+
+def _export_row(p: Product) -> List:
+    return [
+        p.sku,
+        p.title,
+        p.brand.name if p.brand_id else "",
+        p.category.name if p.category_id else "",
+        p.availability,
+        "" if p.lead_time_days is None else p.lead_time_days,
+        p.short_description,
+        p.description,
+        "1" if p.is_active else "0",
+        p.order,
+        json.dumps(p.specs or {}, ensure_ascii=False),
+        os.path.basename(p.datasheet.name) if p.datasheet else "",
+        os.path.basename(p.image.name) if p.image else "",
+    ]
+
+
+def iter_export_rows(chunk_size: int = 2000) -> Iterator[List]:
+    yield list(COLUMNS)
+    qs = Product.objects.select_related("brand", "category").order_by("pk")
+    for p in qs.iterator(chunk_size=chunk_size):
+        yield _export_row(p)
+
+
+def export_csv(fh) -> int:
+    writer = csv.writer(fh)
+    n = -1
+    for n, row in enumerate(iter_export_rows()):
+        writer.writerow(row)
+    return max(n, 0)
+
+
+def export_xlsx(path: str) -> int:
+    from openpyxl import Workbook
+
+    # write_only: rândurile nu sunt ținute în memorie
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Produse")
+    n = -1
+    for n, row in enumerate(iter_export_rows()):
+        ws.append(row)
+    wb.save(path)
+    return max(n, 0)
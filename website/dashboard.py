@@ -0,0 +1,107 @@
+from datetime import timedelta
+
+from django.apps import apps
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from perf.versions import VersionWatcher
+
+VERSION_KEY = "admin:dashboard"
+CACHE_TTL = 60  # secunde; fereastra "ultimele 30 zile" nu are nevoie de mai mult
+
+# modelele care, la save/delete, invalidează cifrele din dashboard
+WATCHED_MODELS = (
+    "website.ContactMessage",
+    "website.BlogPost",
+    "website.Service",
+    "website.Project",
+    "website.Product",
+    "documents.Document",
+    "documents.DocumentType",
+)
+
+
+# versiunea e în baza de date (perf.versions): o salvare din alt proces invalidează și cache-ul de aici
+_watcher = VersionWatcher(VERSION_KEY)
+
+
+def invalidate(**kwargs) -> None:
+    _watcher.bump()
+
+
+def _website_metrics(last_30) -> dict:
+    ContactMessage = apps.get_model("website", "ContactMessage")
+    BlogPost = apps.get_model("website", "BlogPost")
+    Service = apps.get_model("website", "Service")
+    Project = apps.get_model("website", "Project")
+    Product = apps.get_model("website", "Product")
+
+    contacts = ContactMessage.objects.aggregate(
+        contact_unread=Count("pk", filter=Q(is_read=False)),
+        contacts_30d=Count("pk", filter=Q(created_at__gte=last_30)),
+    )
+    blog = BlogPost.objects.aggregate(
+        blog_total=Count("pk"),
+        blog_published=Count("pk", filter=Q(is_published=True)),
+    )
+    products = Product.objects.aggregate(
+        products_total=Count("pk"),
+        products_active=Count("pk", filter=Q(is_active=True)),
+    )
+
+    return {
+        **contacts,
+        **blog,
+        **products,
+        "services_total": Service.objects.count(),
+        "projects_total": Project.objects.count(),
+        # liste materializate ca să poată fi puse în cache
+        "recent_contacts": list(ContactMessage.objects.order_by("-created_at")[:6]),
+        "recent_posts": list(BlogPost.objects.order_by("-published_at")[:6]),
+    }
+
+
+def _document_metrics(last_30) -> dict:
+    try:
+        Document = apps.get_model("documents", "Document")
+        DocumentType = apps.get_model("documents", "DocumentType")
+    except LookupError:
+        # app "documents" nu e instalat
+        return {}
+
+    docs = Document.objects.aggregate(
+        docs_total=Count("pk"),
+        docs_draft=Count("pk", filter=Q(status="DRAFT")),
+        docs_in_progress=Count("pk", filter=Q(status="IN_PROGRESS")),
+        docs_ready=Count("pk", filter=Q(status="READY")),
+        docs_final=Count("pk", filter=Q(status="FINAL")),
+        docs_30d=Count("pk", filter=Q(created_at__gte=last_30)),
+    )
+
+    return {
+        **docs,
+        "doc_types_total": DocumentType.objects.count(),
+        "recent_docs": list(
+            Document.objects.select_related("doc_type", "client_user", "owner").order_by("-created_at")[:8]
+        ),
+    }
+
+
+def compute_metrics() -> dict:
+    last_30 = timezone.now() - timedelta(days=30)
+    # din baza principală: recalcularea urmează invalidării pe semnale, o replică
+    # cu până la REPORTING_MAX_LAG întârziere ar pune în cache cifrele vechi
+    return {**_website_metrics(last_30), **_document_metrics(last_30)}
+
+
+def get_metrics() -> dict:
+    """
+    Cifrele pentru pagina de index din admin, din cache (TTL scurt + invalidare pe semnale).
+    """
+    key = f"admin:dashboard:{_watcher.current()}"
+    metrics = cache.get(key)
+    if metrics is None:
+        metrics = compute_metrics()
+        cache.set(key, metrics, CACHE_TTL)
+    return metrics
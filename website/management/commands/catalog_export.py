@@ -0,0 +1,27 @@
+import sys
+
+from django.core.management.base import BaseCommand
+
+from website.catalog_io import export_csv, export_xlsx
+
+
+class Command(BaseCommand):
+    help = "Export catalog produse în CSV/XLSX (același format ca la import)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", nargs="?", default="-", help="Fișier destinație (.csv / .xlsx); '-' = stdout (CSV).")
+
+    def handle(self, *args, **options):
+        path = options["path"]
+
+        if path == "-":
+            export_csv(sys.stdout)
+            return
+
+        if path.lower().endswith(".xlsx"):
+            n = export_xlsx(path)
+        else:
+            with open(path, "w", newline="", encoding="utf-8-sig") as fh:
+                n = export_csv(fh)
+
+        self.stderr.write(self.style.SUCCESS(f"{n} produse exportate în {path}."))
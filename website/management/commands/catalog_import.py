@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from website.catalog_io import BATCH_SIZE, import_catalog
+
+
+class Command(BaseCommand):
+    help = "Import catalog produse din CSV/XLSX (upsert după SKU, branduri/categorii create automat)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Fișier .csv sau .xlsx")
+        parser.add_argument("--files", default="", help="Folder local cu fișierele din coloanele datasheet / image.")
+        parser.add_argument("--dry-run", action="store_true", help="Nu scrie nimic, doar afișează diferențele.")
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+        parser.add_argument("--show", type=int, default=50, help="Câte modificări se afișează (dry-run).")
+
+    def handle(self, *args, **options):
+        try:
+            report = import_catalog(
+                options["path"],
+                files_dir=options["files"],
+                dry_run=options["dry_run"],
+                batch_size=options["batch_size"],
+            )
+        except FileNotFoundError as e:
+            raise CommandError(str(e))
+
+        if options["dry_run"]:
+            for sku, changed in report.changes[:options["show"]]:
+                self.stdout.write(f"{sku}:")
+                for name, (old, new) in changed.items():
+                    self.stdout.write(f"    {name}: {old!r} -> {new!r}")
+            if len(report.changes) > options["show"]:
+                self.stdout.write(f"... încă {len(report.changes) - options['show']} produse modificate")
+
+        for err in report.errors:
+            self.stderr.write(err)
+
+        prefix = "[dry-run] " if options["dry_run"] else ""
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefix}{report.rows} rânduri: {report.created} create, {report.updated} actualizate, "
+            f"{report.unchanged} neschimbate, {len(report.errors)} erori; "
+            f"branduri noi: {report.brands_created}, categorii noi: {report.categories_created}, "
+            f"fișiere atașate: {report.files_attached}."
+        ))
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from website.publish import export
+from website.publish.writer import publish_root
+
+
+class Command(BaseCommand):
+    help = "Randează toate paginile publice (toate limbile) în PUBLISH_ROOT, cu fișierele statice hash-uite."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--only", nargs="+", metavar="SELECTOR",
+            help='Doar paginile selectate, ex. "page:home" "blog:" "product:42".',
+        )
+        parser.add_argument("--skip-assets", action="store_true", help="Nu recopia fișierele statice.")
+
+    def handle(self, *args, **options):
+        stats = export.export(options["only"], collect_assets=not options["skip_assets"])
+        self.stdout.write(self.style.SUCCESS(
+            f"{stats['rendered']} pagini randate, {stats['written']} scrise, {stats['removed']} șterse, "
+            f"{stats['assets']} fișiere statice în {publish_root()}."
+        ))
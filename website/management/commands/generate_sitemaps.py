@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from website.publish import feeds, sitemaps
+from website.publish.writer import publish_root
+
+
+class Command(BaseCommand):
+    help = "Generează sitemap.xml (+ fișierele pe secțiuni) și feed-urile RSS/Atom ale blogului în PUBLISH_ROOT."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--section", choices=sitemaps.SECTION_NAMES, help="Doar o secțiune (+ indexul).")
+
+    def handle(self, *args, **options):
+        if options["section"]:
+            sitemaps.write_section(options["section"])
+            sitemaps.write_index()
+        else:
+            sitemaps.write_all()
+            feeds.write_feeds()
+
+        self.stdout.write(self.style.SUCCESS(f"Fișiere generate în {publish_root()}."))
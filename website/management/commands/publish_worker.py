@@ -0,0 +1,45 @@
+import logging
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from website.publish import queue
+from website.publish.writer import publish_root
+
+logger = logging.getLogger("website.publish")
+
+
+class Command(BaseCommand):
+    help = (
+        "Scrie în PUBLISH_ROOT ce s-a modificat din admin: secțiunile de sitemap, feed-urile "
+        "și, cu STATIC_EXPORT, paginile (inclusiv la capetele ferestrelor pop-up-urilor)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--every", type=int, default=0, metavar="SECONDS", help="Rulează în buclă.")
+
+    def handle(self, *args, **options):
+        while True:
+            try:
+                stats = queue.drain()
+            except Exception:
+                if not options["every"]:
+                    raise
+                # rândurile rămân în coadă și se reiau după lease
+                logger.exception("Publicarea din coadă a eșuat.")
+                stats = None
+            if stats:
+                self.report(stats)
+            if not options["every"]:
+                return
+            close_old_connections()
+            time.sleep(options["every"])
+
+    def report(self, stats):
+        parts = [f"{stats['sitemaps']} secțiuni sitemap"]
+        if stats["feeds"]:
+            parts.append("feed-uri")
+        if "rendered" in stats:
+            parts.append(f"{stats['rendered']} pagini randate, {stats['written']} scrise, {stats['removed']} șterse")
+        self.stdout.write(self.style.SUCCESS(f"{', '.join(parts)} în {publish_root()}."))
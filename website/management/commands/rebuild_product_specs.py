@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from website.catalog import catalog_index
+from website.models import Product
+from website.specs import sync_product_specs
+
+
+class Command(BaseCommand):
+    help = "Reface tabelul ProductSpec (valori tipizate, unități normalizate) din Product.specs."
+
+    def handle(self, *args, **options):
+        total = 0
+        for product in Product.objects.order_by("pk").iterator(chunk_size=500):
+            sync_product_specs(product)
+            total += 1
+
+        # lista de filtre din cache e legată de versiunea catalogului
+        catalog_index.invalidate()
+        self.stdout.write(self.style.SUCCESS(f"Specificații refăcute pentru {total} produse."))
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-19 16:29
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('website', '0002_industry_short'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductSpec',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=120)),
+                ('label', models.CharField(max_length=120)),
+                ('raw', models.CharField(blank=True, max_length=255)),
+                ('value_text', models.CharField(blank=True, max_length=255)),
+                ('value_min', models.FloatField(blank=True, null=True)),
+                ('value_max', models.FloatField(blank=True, null=True)),
+                ('unit', models.CharField(blank=True, max_length=20)),
+                ('base_unit', models.CharField(blank=True, max_length=20)),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='spec_values', to='website.product')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['key', 'value_text'], name='website_pro_key_0e7253_idx'), models.Index(fields=['key', 'value_min'], name='website_pro_key_eeb3be_idx'), models.Index(fields=['key', 'value_max'], name='website_pro_key_21fd75_idx')],
+                'unique_together': {('product', 'key')},
+            },
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-19 16:34
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('website', '0003_productspec'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BlogPostNav',
+            fields=[
+                ('post', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='nav', serialize=False, to='website.blogpost')),
+                ('related_ids', models.JSONField(blank=True, default=list)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='blogpost',
+            index=models.Index(fields=['is_published', 'published_at'], name='website_blo_is_publ_11c301_idx'),
+        ),
+        migrations.AddField(
+            model_name='blogpostnav',
+            name='next_post',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='website.blogpost'),
+        ),
+        migrations.AddField(
+            model_name='blogpostnav',
+            name='prev_post',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='website.blogpost'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 16:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('website', '0004_blog_navigation'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blogpost',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
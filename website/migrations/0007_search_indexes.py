@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-19 16:59
+
+from django.db import migrations, models
+
+from perf.postgres import search_setup, trigram_index
+
+
+class Migration(migrations.Migration):
+    # indexuri parțiale pe ambele backend-uri; cele trigram doar pe PostgreSQL
+
+    dependencies = [
+        ('website', '0006_content_updated_at'),
+    ]
+
+    operations = [
+        search_setup(),
+        trigram_index("website_contactmessage", "name", unaccent=True),
+        trigram_index("website_contactmessage", "email"),
+        trigram_index("website_contactmessage", "company", unaccent=True),
+        migrations.AddIndex(
+            model_name='contactmessage',
+            index=models.Index(condition=models.Q(('is_read', False)), fields=['-created_at'], name='contact_unread_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['order', 'title'], name='product_active_order_idx'),
+        ),
+    ]
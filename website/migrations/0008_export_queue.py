@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-19 17:35
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('website', '0007_search_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExportRequest',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('selector', models.CharField(max_length=200)),
+                ('available_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['available_at'], name='website_exp_availab_6b94e2_idx')],
+            },
+        ),
+    ]
@@ -27,6 +27,7 @@ class Service(models.Model):
     )
 
     is_featured = models.BooleanField(default=False)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ["title"]
@@ -50,6 +51,7 @@ class Project(models.Model):
     description = models.TextField(blank=True)
     cover = models.ImageField(upload_to="projects/", blank=True, null=True)
     is_featured = models.BooleanField(default=False)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ["title"]
@@ -105,6 +107,10 @@ class ContactMessage(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            # parțial: doar necititele (badge-ul și lista din dashboard)
+            models.Index(fields=["-created_at"], condition=models.Q(is_read=False), name="contact_unread_idx"),
+        ]
 
     def __str__(self):
         return f"{self.name} - {self.email}"
@@ -187,6 +193,7 @@ class Product(models.Model):
 
     datasheet = models.FileField(upload_to="datasheets/", null=True, blank=True)
     image = models.ImageField(upload_to="products/", null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def save(self, *args, **kwargs):
         if not self.slug:
@@ -195,11 +202,43 @@ class Product(models.Model):
 
     class Meta:
         ordering = ["order", "title"]
+        indexes = [
+            # parțial: catalogul public citește doar produsele active, în ordinea implicită
+            models.Index(fields=["order", "title"], condition=models.Q(is_active=True), name="product_active_order_idx"),
+        ]
 
     def __str__(self):
         return self.title
 
 
+class ProductSpec(models.Model):
+    """
+    Proiecție indexată din Product.specs: o linie per cheie, cu valoarea
+    numerică normalizată la unitatea de bază (kW -> W, mm -> m etc.).
+    Se regenerează la salvarea produsului (website/specs.py).
+    """
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name="spec_values")
+    key = models.CharField(max_length=120)          # normalizat (fără diacritice, lower)
+    label = models.CharField(max_length=120)        # cheia așa cum e scrisă în specs
+    raw = models.CharField(max_length=255, blank=True)
+    value_text = models.CharField(max_length=255, blank=True)  # normalizat, pt. egalitate
+    value_min = models.FloatField(null=True, blank=True)       # în unitatea de bază
+    value_max = models.FloatField(null=True, blank=True)       # = value_min dacă nu e interval
+    unit = models.CharField(max_length=20, blank=True)         # unitatea scrisă (ex: kW)
+    base_unit = models.CharField(max_length=20, blank=True)    # unitatea de bază (ex: W)
+
+    class Meta:
+        unique_together = [("product", "key")]
+        indexes = [
+            models.Index(fields=["key", "value_text"]),
+            models.Index(fields=["key", "value_min"]),
+            models.Index(fields=["key", "value_max"]),
+        ]
+
+    def __str__(self):
+        return f"{self.label}: {self.raw}"
+
+
 class AboutPage(models.Model):
     # HERO
     hero_title = models.CharField(max_length=200, default="Construim soluții digitale care cresc afaceri")
@@ -317,9 +356,13 @@ class BlogPost(models.Model):
     image = models.ImageField(upload_to="blog/covers/", blank=True, null=True)  # cover
     published_at = models.DateTimeField(default=timezone.now)
     is_published = models.BooleanField(default=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ["-published_at"]
+        indexes = [
+            models.Index(fields=["is_published", "published_at"]),
+        ]
 
     def __str__(self):
         return self.title
@@ -328,6 +371,21 @@ class BlogPost(models.Model):
         return reverse("blog_detail", args=[self.slug])
 
 
+class BlogPostNav(models.Model):
+    """
+    Navigare precalculată pentru blog_detail (prev / next / articole similare).
+    Se recalculează la salvarea / ștergerea unui articol (website/blog_nav.py).
+    """
+    post = models.OneToOneField(BlogPost, on_delete=models.CASCADE, primary_key=True, related_name="nav")
+    prev_post = models.ForeignKey(BlogPost, null=True, blank=True, on_delete=models.SET_NULL, related_name="+")
+    next_post = models.ForeignKey(BlogPost, null=True, blank=True, on_delete=models.SET_NULL, related_name="+")
+    related_ids = models.JSONField(default=list, blank=True)  # ordonate după similaritate TF-IDF
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"nav:{self.post_id}"
+
+
 class BlogPostImage(models.Model):
     post = models.ForeignKey(BlogPost, on_delete=models.CASCADE, related_name="gallery")
     image = models.ImageField(upload_to="blog/gallery/")
@@ -340,3 +398,24 @@ class BlogPostImage(models.Model):
     def __str__(self):
         return self.caption or f"Image for {self.post.title}"
 
+
+
+class ExportRequest(models.Model):
+    """
+    Coada de publicare (website/publish/queue.py): un rând per selector, scris în
+    tranzacția modificării: secțiuni de sitemap, feed-uri și paginile exportului
+    static. Fișierele se scriu în worker (python manage.py publish_worker), nu în
+    request-ul din admin.
+    """
+    selector = models.CharField(max_length=200)
+    # mesajele pop-up programate: re-export la începutul / sfârșitul ferestrei
+    available_at = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["available_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.selector} @ {self.available_at:%Y-%m-%d %H:%M}"
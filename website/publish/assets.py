@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+import base64
+import gzip
+import hashlib
+import io
+import os
+import re
+from functools import lru_cache
+from typing import Optional
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage, staticfiles_storage
+from django.core.files.base import ContentFile
+from django.templatetags.static import static
+
+try:  # opțional: .br doar dacă e instalat pachetul brotli
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESS_EXTENSIONS = {".css", ".js", ".svg", ".json", ".xml", ".txt", ".map", ".html", ".ico", ".eot", ".ttf"}
+# sub prag, antetele gzip costă mai mult decât câștigul
+COMPRESS_MIN_SIZE = 512
+JPEG_QUALITY = 85
+WEBP_QUALITY = 82
+# re-encodarea se păstrează doar dacă scade sub 90% (evită pierderi repetate la JPEG)
+REENCODE_RATIO = 0.9
+
+
+# ============================================================
+# Minificare / optimizare
+# ============================================================
+
+_CSS_STRING_RE = re.compile(r"""("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')""")
+_CSS_COMMENT_RE = re.compile(r"/\*(?!!).*?\*/", re.DOTALL)
+
+
+def minify_css(css: str) -> str:
+    """
+    Minificare conservatoare: comentarii, spații, ";" final. Șirurile rămân neatinse.
+    """
+    parts = _CSS_STRING_RE.split(css)
+    out = []
+    for i, part in enumerate(parts):
+        if i % 2:
+            out.append(part)
+            continue
+        part = _CSS_COMMENT_RE.sub("", part)
+        part = re.sub(r"\s+", " ", part)
+        part = re.sub(r"\s*([{};,>])\s*", r"\1", part)
+        part = re.sub(r":\s+", ":", part)
+        part = part.replace(";}", "}")
+        out.append(part)
+    return "".join(out).strip()
+
+
+_SVG_STRIP_RES = [
+    re.compile(r"<!--.*?-->", re.DOTALL),
+    re.compile(r"<metadata\b.*?</metadata>", re.DOTALL),
+    re.compile(r"<sodipodi:namedview\b.*?(?:/>|</sodipodi:namedview>)", re.DOTALL),
+    re.compile(r"\s(?:sodipodi|inkscape):[\w-]+=\"[^\"]*\""),
+    re.compile(r"\sxmlns:(?:sodipodi|inkscape)=\"[^\"]*\""),
+]
+_SVG_DATA_URI_RE = re.compile(r"data:image/(png|jpeg);base64,([A-Za-z0-9+/=\s]+)")
+
+
+def minify_svg(svg: str) -> str:
+    """
+    Scoate metadatele editorului (Inkscape) și recomprimă imaginile raster încorporate.
+    """
+    for rx in _SVG_STRIP_RES:
+        svg = rx.sub("", svg)
+
+    def _embedded(m):
+        raw = base64.b64decode(re.sub(r"\s+", "", m.group(2)))
+        better = optimize_image(raw, m.group(1))
+        data = better if better is not None else raw
+        return f"data:image/{m.group(1)};base64," + base64.b64encode(data).decode("ascii")
+
+    svg = _SVG_DATA_URI_RE.sub(_embedded, svg)
+    return re.sub(r">\s+<", "><", svg).strip()
+
+
+def optimize_image(data: bytes, fmt: str) -> Optional[bytes]:
+    """
+    PNG fără pierderi (optimize), JPEG progresiv q85 fără metadate.
+    None dacă rezultatul nu e suficient de mic.
+    """
+    from PIL import Image
+
+    try:
+        img = Image.open(io.BytesIO(data))
+        img.load()
+    except Exception:
+        return None
+
+    buf = io.BytesIO()
+    if fmt == "png":
+        img.save(buf, "PNG", optimize=True)
+    else:
+        if img.mode not in ("RGB", "L"):
+            img = img.convert("RGB")
+        img.save(buf, "JPEG", quality=JPEG_QUALITY, optimize=True, progressive=True)
+
+    out = buf.getvalue()
+    return out if len(out) < len(data) * REENCODE_RATIO else None
+
+
+def webp_variant(data: bytes) -> Optional[bytes]:
+    from PIL import Image
+
+    try:
+        img = Image.open(io.BytesIO(data))
+        img.load()
+    except Exception:
+        return None
+    buf = io.BytesIO()
+    img.save(buf, "WEBP", quality=WEBP_QUALITY, method=6)
+    out = buf.getvalue()
+    return out if len(out) < len(data) else None
+
+
+# ============================================================
+# Storage pentru collectstatic
+# ============================================================
+
+class VertixStaticStorage(ManifestStaticFilesStorage):
+    """
+    collectstatic: minificare CSS/SVG, optimizare PNG/JPEG, nume cu hash + staticfiles.json,
+    apoi frați .webp (imagini) și .gz / .br (text) pentru nginx (gzip_static / brotli_static).
+    """
+
+    manifest_strict = False
+
+    def post_process(self, paths, dry_run=False, **options):
+        if dry_run:
+            return
+
+        for name in paths:
+            self._optimize(name)
+
+        # hash-ul se calculează pe copiile optimizate din STATIC_ROOT
+        local = {name: (self, name) for name in paths}
+        yield from super().post_process(local, dry_run=dry_run, **options)
+
+        for name in paths:
+            hashed = self.hashed_files.get(self.hash_key(self.clean_name(name)))
+            for target in {name, hashed} - {None}:
+                self._siblings(target)
+
+    def _read(self, name: str) -> bytes:
+        with self.open(name) as fh:
+            return fh.read()
+
+    def _replace(self, name: str, data: bytes) -> None:
+        self.delete(name)
+        self._save(name, ContentFile(data))
+
+    def _optimize(self, name: str) -> None:
+        ext = os.path.splitext(name)[1].lower()
+        if ext not in (".css", ".svg", ".png", ".jpg", ".jpeg") or name.endswith(".min.css"):
+            return
+
+        data = self._read(name)
+        if ext == ".css":
+            new = minify_css(data.decode("utf-8")).encode("utf-8")
+        elif ext == ".svg":
+            new = minify_svg(data.decode("utf-8")).encode("utf-8")
+        else:
+            new = optimize_image(data, "png" if ext == ".png" else "jpeg")
+
+        if new is not None and len(new) < len(data):
+            self._replace(name, new)
+
+    def _siblings(self, name: str) -> None:
+        ext = os.path.splitext(name)[1].lower()
+        if ext in (".png", ".jpg", ".jpeg"):
+            webp = webp_variant(self._read(name))
+            if webp is not None:
+                self._write_sibling(name + ".webp", webp)
+            return
+
+        if ext not in COMPRESS_EXTENSIONS:
+            return
+        data = self._read(name)
+        if len(data) < COMPRESS_MIN_SIZE:
+            return
+
+        gz = gzip.compress(data, compresslevel=9, mtime=0)
+        if len(gz) < len(data):
+            self._write_sibling(name + ".gz", gz)
+        if brotli is not None:
+            br = brotli.compress(data, quality=11)
+            if len(br) < len(data):
+                self._write_sibling(name + ".br", br)
+
+    def _write_sibling(self, name: str, data: bytes) -> None:
+        if self.exists(name):
+            self.delete(name)
+        self._save(name, ContentFile(data))
+
+
+# ============================================================
+# URL-uri pentru template-uri ({% asset %})
+# ============================================================
+
+@lru_cache(maxsize=512)
+def _source_hash(path: str, mtime: float) -> str:
+    with open(path, "rb") as fh:
+        return hashlib.md5(fh.read()).hexdigest()[:12]
+
+
+def asset_url(name: str) -> str:
+    """
+    URL care se schimbă odată cu conținutul (cache "pe viață" în browser):
+    numele cu hash din manifest după collectstatic, altfel ?v=<hash> calculat din sursă.
+    """
+    storage = staticfiles_storage
+    # în DEBUG runserver servește sursele (fără hash)
+    if not settings.DEBUG and isinstance(storage, ManifestStaticFilesStorage):
+        key = storage.hash_key(storage.clean_name(name))
+        if key in storage.hashed_files:
+            return storage.url(name)
+
+    path = finders.find(name)
+    if not path:
+        return static(name)
+    return f"{static(name)}?v={_source_hash(path, os.path.getmtime(path))}"
@@ -0,0 +1,286 @@
+from __future__ import annotations
+
+import json
+import re
+from datetime import timedelta
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone, translation
+
+from .assets import VertixStaticStorage
+from .queue import enqueue
+from .sitemaps import STATIC_PAGES
+from .writer import publish_root, site_url, write_atomic
+
+# ținut evidența paginilor scrise: cheie -> [căi relative]
+MANIFEST_FILE = ".export-manifest.json"
+ASSETS_DIR = "static"
+
+# paginile cu formulare (CSRF) rămân pe Django
+EXCLUDED_PAGES = {"contact"}
+
+# selectori (cheie exactă sau prefix terminat în ":") afectați de fiecare model
+DEPENDENCIES = {
+    "website.sitesettings": ["*"],
+    "website.popupmessage": ["*"],
+    "website.service": ["page:home", "page:services_list", "service:{pk}"],
+    "website.project": ["page:home", "page:projects_list", "project:{pk}"],
+    "website.industry": ["page:projects_list", "page:industries", "project:"],
+    "website.aboutpage": ["page:about"],
+    "website.job": ["page:careers"],
+    # prev/next și articolele similare se schimbă pe tot blogul
+    "website.blogpost": ["page:blog_list", "archive:", "blog:"],
+    "website.product": ["page:products_list", "product:{pk}"],
+    "website.brand": ["page:products_list", "product:"],
+    "website.productcategory": ["page:products_list", "product:"],
+}
+
+
+def enabled() -> bool:
+    return bool(getattr(settings, "STATIC_EXPORT", False))
+
+
+# ============================================================
+# Pagini publice
+# ============================================================
+
+Target = Tuple[str, tuple]
+
+
+def _targets() -> Dict[str, Target]:
+    """
+    cheie -> (url name, args) pentru toate paginile publice exportabile.
+    """
+    from website.blog_content import month_archive
+    from website.models import BlogPost, Product, Project, Service
+
+    out: Dict[str, Target] = {}
+    for url_name, _ in STATIC_PAGES:
+        if url_name not in EXCLUDED_PAGES:
+            out[f"page:{url_name}"] = (url_name, ())
+
+    for pk, slug in Service.objects.values_list("pk", "slug"):
+        out[f"service:{pk}"] = ("service_detail", (slug,))
+    for pk, slug in Project.objects.values_list("pk", "slug"):
+        out[f"project:{pk}"] = ("project_detail", (slug,))
+    for pk, slug in BlogPost.objects.filter(is_published=True).values_list("pk", "slug"):
+        out[f"blog:{pk}"] = ("blog_detail", (slug,))
+    for pk, slug in Product.objects.filter(is_active=True).values_list("pk", "slug").iterator(chunk_size=2000):
+        out[f"product:{pk}"] = ("product_detail", (slug,))
+
+    for row in month_archive():
+        m = row["month"]
+        if m:
+            out[f"archive:{m:%Y-%m}"] = ("blog_archive", (m.year, m.month))
+
+    return {k: v for k, v in out.items() if all(str(a) for a in v[1])}
+
+
+def _matches(key: str, selectors: Iterable[str]) -> bool:
+    for sel in selectors:
+        if sel == "*" or sel == key or (sel.endswith(":") and key.startswith(sel)):
+            return True
+    return False
+
+
+def selectors_for(label: str, pk) -> List[str]:
+    return [s.format(pk=pk) for s in DEPENDENCIES.get(label, [])]
+
+
+# ============================================================
+# Randare
+# ============================================================
+
+def _client() -> Client:
+    parts = urlsplit(site_url())
+    return Client(
+        HTTP_HOST=parts.netloc or "localhost",
+        secure=parts.scheme == "https",
+        raise_request_exception=False,
+    )
+
+
+def _output_path(url: str) -> str:
+    path = url.lstrip("/")
+    return f"{path}index.html" if path.endswith("/") or not path else path
+
+
+class _Assets:
+    """
+    Copie a fișierelor statice, procesate ca la collectstatic (minificare, hash,
+    .gz/.br), în PUBLISH_ROOT/static.
+    """
+
+    def __init__(self):
+        self.storage = VertixStaticStorage(
+            location=publish_root() / ASSETS_DIR,
+            base_url="/" + settings.STATIC_URL.strip("/") + "/",
+        )
+        prefix = re.escape(self.storage.base_url)
+        self.pattern = re.compile(rf'(?P<attr>(?:src|href)=["\']){prefix}(?P<name>[^"\'?#]+)(?:\?v=[0-9a-f]+)?')
+
+    def collect(self) -> int:
+        found = {}
+        for finder in finders.get_finders():
+            for path, storage in finder.list(["CVS", ".*", "*~"]):
+                prefixed = getattr(storage, "prefix", None)
+                name = f"{prefixed}/{path}" if prefixed else path
+                found.setdefault(name, (storage, path))
+
+        for name, (storage, path) in found.items():
+            if self.storage.exists(name):
+                self.storage.delete(name)
+            with storage.open(path) as fh:
+                self.storage.save(name, fh)
+
+        paths = {name: (self.storage, name) for name in found}
+        for _ in self.storage.post_process(paths, dry_run=False):
+            pass
+        return len(found)
+
+    def rewrite(self, html: str) -> str:
+        def _sub(m):
+            # doar numele din manifest; cele deja cu hash ({% asset %} în prod) rămân
+            hashed = self.storage.hashed_files.get(self.storage.hash_key(m.group("name")))
+            if not hashed:
+                return m.group(0)
+            return f'{m.group("attr")}{self.storage.base_url}{hashed}'
+
+        return self.pattern.sub(_sub, html)
+
+
+def _load_manifest() -> Dict[str, List[str]]:
+    path = publish_root() / MANIFEST_FILE
+    if not path.exists():
+        return {}
+    try:
+        return json.loads(path.read_text("utf-8"))
+    except ValueError:
+        return {}
+
+
+def _save_manifest(manifest: Dict[str, List[str]]) -> None:
+    data = json.dumps(manifest, sort_keys=True, indent=0).encode("utf-8")
+    write_atomic(MANIFEST_FILE, data)
+
+
+def _render(client: Client, assets: _Assets, target: Target) -> Dict[str, Optional[bytes]]:
+    """
+    {cale relativă: html} per limbă; None dacă pagina nu e publică (redirect / 404).
+    """
+    url_name, args = target
+    out = {}
+    for lang, _ in settings.LANGUAGES:
+        with translation.override(lang):
+            url = reverse(url_name, args=args)
+        response = client.get(url)
+        rel = _output_path(url)
+        if response.status_code != 200 or not response["Content-Type"].startswith("text/html"):
+            out[rel] = None
+            continue
+        html = response.content.decode(response.charset or "utf-8")
+        out[rel] = assets.rewrite(html).encode("utf-8")
+    return out
+
+
+def _remove(relpaths: Iterable[str]) -> None:
+    root = publish_root()
+    for rel in relpaths:
+        path = root / rel
+        if path.is_file():
+            path.unlink()
+
+
+def export(selectors: Optional[Iterable[str]] = None, collect_assets: bool = False) -> dict:
+    """
+    Randează paginile selectate (toate dacă selectors e None) în PUBLISH_ROOT.
+    Șterge fișierele paginilor care nu mai există / nu mai sunt publice.
+    """
+    selectors = ["*"] if selectors is None else list(selectors)
+    stats = {"rendered": 0, "written": 0, "removed": 0, "assets": 0}
+
+    assets = _Assets()
+    if collect_assets or not (publish_root() / ASSETS_DIR / assets.storage.manifest_name).exists():
+        stats["assets"] = assets.collect()
+
+    manifest = _load_manifest()
+    targets = _targets()
+    client = _client()
+
+    current_lang = translation.get_language()
+    try:
+        for key, target in targets.items():
+            if not _matches(key, selectors):
+                continue
+            pages = _render(client, assets, target)
+            stats["rendered"] += len(pages)
+
+            kept: Set[str] = set()
+            for rel, data in pages.items():
+                if data is None:
+                    continue
+                kept.add(rel)
+                stats["written"] += write_atomic(rel, data)
+
+            stale = set(manifest.get(key, [])) - kept
+            _remove(stale)
+            stats["removed"] += len(stale)
+            if kept:
+                manifest[key] = sorted(kept)
+            else:
+                manifest.pop(key, None)
+    finally:
+        translation.activate(current_lang)
+
+    # obiecte șterse / nepublicate
+    for key in [k for k in manifest if k not in targets and _matches(k, selectors)]:
+        _remove(manifest[key])
+        stats["removed"] += len(manifest.pop(key))
+
+    _save_manifest(manifest)
+    return stats
+
+
+# ============================================================
+# Coadă (randarea în worker, nu în request)
+# ============================================================
+
+# câmpuri de fereastră: pagina se schimbă la aceste momente fără nicio salvare
+TIME_WINDOWS = {
+    "website.popupmessage": ("start_at", "end_at"),
+}
+
+
+def _window_edges(label: str, instance) -> List:
+    now = timezone.now()
+    edges = []
+    for name in TIME_WINDOWS.get(label, ()):
+        at = getattr(instance, name, None)
+        if at is None:
+            continue
+        # end_at e inclusiv (context_processors.popup_messages): pop-up-ul dispare după
+        if name == "end_at":
+            at += timedelta(seconds=1)
+        if at > now:
+            edges.append(at)
+    return edges
+
+
+def refresh(label: str, pk, instance=None) -> None:
+    """
+    Pune în coadă paginile afectate de modificare; pentru modelele cu fereastră
+    de timp (pop-up-uri), și re-exportul de la capetele ferestrei.
+    """
+    if not enabled():
+        return
+    selectors = selectors_for(label, pk)
+    if not selectors:
+        return
+    enqueue(selectors)
+    for at in _window_edges(label, instance):
+        enqueue(selectors, at=at)
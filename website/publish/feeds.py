@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from io import StringIO
+
+from django.conf import settings
+from django.urls import reverse
+from django.utils import translation
+from django.utils.feedgenerator import Atom1Feed, Rss201rev2Feed
+
+from website.blog_content import make_excerpt
+
+from .queue import FEEDS_SELECTOR, enqueue
+from .writer import site_url, write_atomic
+
+FEED_ITEMS = 30
+FEED_DIR = "feeds"
+
+FEED_TITLE = "Vertix – Blog & Noutăți"
+FEED_DESCRIPTION = "Articole, proiecte și know-how din automatizări, retrofit și digitalizare industrială."
+
+
+def feed_path(lang: str, kind: str) -> str:
+    return f"{FEED_DIR}/blog-{lang}.{kind}.xml"
+
+
+def _build(feed_class, lang: str, posts) -> bytes:
+    base = site_url()
+    with translation.override(lang):
+        feed = feed_class(
+            title=FEED_TITLE,
+            link=base + reverse("blog_list"),
+            description=FEED_DESCRIPTION,
+            language=lang,
+            feed_url=f"{base}/{feed_path(lang, 'atom' if feed_class is Atom1Feed else 'rss')}",
+        )
+        for p in posts:
+            url = base + reverse("blog_detail", args=[p.slug])
+            feed.add_item(
+                title=p.title,
+                link=url,
+                description=make_excerpt(p.short, p.content),
+                unique_id=url,
+                pubdate=p.published_at,
+                updateddate=p.updated_at,
+            )
+
+    out = StringIO()
+    feed.write(out, "utf-8")
+    return out.getvalue().encode("utf-8")
+
+
+def write_feeds() -> None:
+    """
+    RSS 2.0 + Atom pentru ultimele articole publicate, câte unul per limbă.
+    """
+    from website.models import BlogPost
+
+    posts = list(
+        BlogPost.objects.filter(is_published=True)
+        .only("id", "title", "slug", "short", "content", "published_at", "updated_at")
+        .order_by("-published_at")[:FEED_ITEMS]
+    )
+    for lang, _ in settings.LANGUAGES:
+        write_atomic(feed_path(lang, "rss"), _build(Rss201rev2Feed, lang, posts))
+        write_atomic(feed_path(lang, "atom"), _build(Atom1Feed, lang, posts))
+
+
+def refresh_feeds() -> None:
+    enqueue([FEEDS_SELECTOR])
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import Iterable, List, Optional, Tuple
+
+from django.db import router, transaction
+from django.utils import timezone
+
+# cât timp un lot revendicat e "al" worker-ului; după (ex. proces oprit) se reia
+LEASE = timedelta(minutes=10)
+
+# selectorii care nu sunt pagini exportate
+SITEMAP_PREFIX = "sitemap:"
+FEEDS_SELECTOR = "feeds:blog"
+
+
+def enqueue(selectors: Iterable[str], at=None) -> None:
+    """
+    Adaugă selectorii în coadă, în tranzacția apelantului (fără scriere pe disc).
+    Un selector care așteaptă deja în coadă nu se mai adaugă încă o dată.
+    """
+    from website.models import ExportRequest
+
+    selectors = list(dict.fromkeys(selectors))
+    if at is None:
+        at = timezone.now()
+        pending = set(
+            ExportRequest.objects.filter(selector__in=selectors, available_at__lte=at)
+            .values_list("selector", flat=True)
+        )
+        selectors = [s for s in selectors if s not in pending]
+    ExportRequest.objects.bulk_create([ExportRequest(selector=s, available_at=at) for s in selectors])
+
+
+def claim(now=None) -> Tuple[List[int], List[str]]:
+    """
+    Revendică cererile scadente (available_at mutat după lease, ca alt worker să
+    nu le ia). Întoarce (pk-uri, selectori distincți).
+    """
+    from website.models import ExportRequest
+
+    now = now or timezone.now()
+    alias = router.db_for_write(ExportRequest)
+    ready = ExportRequest.objects.using(alias).filter(available_at__lte=now)
+    with transaction.atomic(using=alias):
+        rows = list(ready.values_list("pk", "selector"))
+        if rows:
+            ExportRequest.objects.using(alias).filter(pk__in=[pk for pk, _ in rows]).update(available_at=now + LEASE)
+    return [pk for pk, _ in rows], sorted({s for _, s in rows})
+
+
+def drain(now=None) -> Optional[dict]:
+    """
+    Scrie o singură dată tot ce e scadent (selectorii repetați se unesc):
+    secțiunile de sitemap + indexul, feed-urile și, cu STATIC_EXPORT, paginile.
+    La eroare rândurile rămân și se reiau după lease.
+    """
+    from website.models import ExportRequest
+
+    from . import export, feeds, sitemaps
+
+    pks, selectors = claim(now)
+    if not pks:
+        return None
+
+    sections = [name for name in sitemaps.SECTION_NAMES if f"{SITEMAP_PREFIX}{name}" in selectors]
+    for name in sections:
+        sitemaps.write_section(name)
+    if sections:
+        sitemaps.write_index()
+    if FEEDS_SELECTOR in selectors:
+        feeds.write_feeds()
+
+    pages = [s for s in selectors if not s.startswith(SITEMAP_PREFIX) and s != FEEDS_SELECTOR]
+    stats = {"sitemaps": len(sections), "feeds": FEEDS_SELECTOR in selectors}
+    if pages and export.enabled():
+        stats.update(export.export(["*"] if "*" in pages else pages))
+    ExportRequest.objects.filter(pk__in=pks).delete()
+    return stats
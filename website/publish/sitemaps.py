@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timezone as dt_timezone
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.db.models import Max
+from django.urls import reverse
+from django.utils import translation
+
+from .queue import SITEMAP_PREFIX, enqueue
+from .writer import remove_stale, site_url, write_atomic
+
+# limita din protocolul sitemaps.org (URL-uri per fișier)
+MAX_URLS = 50000
+SITEMAP_DIR = "sitemaps"
+INDEX_FILE = "sitemap.xml"
+
+# pagini statice: (url name, flag din SiteSettings care le ascunde)
+STATIC_PAGES = [
+    ("home", "home_enabled"),
+    ("about", "about_enabled"),
+    ("services_list", "services_enabled"),
+    ("projects_list", "projects_enabled"),
+    ("industries", "industries_enabled"),
+    ("products_list", None),
+    ("blog_list", "blog_enabled"),
+    ("careers", "careers_enabled"),
+    ("contact", "contact_enabled"),
+    ("gdpr", "gdpr_enabled"),
+    ("cookies", "cookies_enabled"),
+]
+
+
+@dataclass(frozen=True)
+class Section:
+    name: str
+    # (url name, args, lastmod) pentru fiecare obiect public
+    items: Callable[[], Iterator[Tuple[str, tuple, Optional[datetime]]]]
+    # (număr obiecte, lastmod maxim) fără să itereze tot
+    stats: Callable[[], Tuple[int, Optional[datetime]]]
+
+
+def _site_settings():
+    from website.site_settings import get_site_settings
+    return get_site_settings()
+
+
+def _enabled(flag: Optional[str]) -> bool:
+    return flag is None or bool(getattr(_site_settings(), flag, True))
+
+
+def _model_section(name: str, url_name: str, queryset: Callable, flag: Optional[str] = None) -> Section:
+    def items():
+        if not _enabled(flag):
+            return
+        for slug, updated in queryset().values_list("slug", "updated_at").order_by("pk").iterator(chunk_size=2000):
+            if slug:
+                yield url_name, (slug,), updated
+
+    def stats():
+        if not _enabled(flag):
+            return 0, None
+        agg = queryset().aggregate(last=Max("updated_at"))
+        return queryset().count(), agg["last"]
+
+    return Section(name, items, stats)
+
+
+def _static_items():
+    s = _site_settings()
+    for url_name, flag in STATIC_PAGES:
+        if flag is None or getattr(s, flag, True):
+            yield url_name, (), s.updated_at
+
+
+def _static_stats():
+    s = _site_settings()
+    return sum(1 for _, flag in STATIC_PAGES if flag is None or getattr(s, flag, True)), s.updated_at
+
+
+def _sections() -> Dict[str, Section]:
+    from website.models import BlogPost, Product, Project, Service
+
+    return {
+        "pages": Section("pages", _static_items, _static_stats),
+        "services": _model_section("services", "service_detail", lambda: Service.objects.all(), "services_enabled"),
+        "projects": _model_section("projects", "project_detail", lambda: Project.objects.all(), "projects_enabled"),
+        "blog": _model_section("blog", "blog_detail", lambda: BlogPost.objects.filter(is_published=True), "blog_enabled"),
+        "products": _model_section("products", "product_detail", lambda: Product.objects.filter(is_active=True)),
+    }
+
+
+SECTION_NAMES = ("pages", "services", "projects", "blog", "products")
+
+
+# ============================================================
+# XML
+# ============================================================
+
+def _languages() -> List[str]:
+    return [code for code, _ in settings.LANGUAGES]
+
+
+def _localized(url_name: str, args: tuple) -> Dict[str, str]:
+    base = site_url()
+    out = {}
+    for lang in _languages():
+        with translation.override(lang):
+            out[lang] = base + reverse(url_name, args=args)
+    return out
+
+
+def _w3c(dt: Optional[datetime]) -> str:
+    if not dt:
+        return ""
+    return dt.astimezone(dt_timezone.utc).strftime("%Y-%m-%dT%H:%M:%S+00:00")
+
+
+def _url_entries(section: Section) -> Iterator[str]:
+    """
+    Un <url> per limbă, cu alternativele hreflang (i18n_patterns: /ro/..., /en/...).
+    """
+    for url_name, args, lastmod in section.items():
+        urls = _localized(url_name, args)
+        alternates = "".join(
+            f'<xhtml:link rel="alternate" hreflang="{lang}" href="{escape(u)}"/>' for lang, u in urls.items()
+        )
+        mod = f"<lastmod>{_w3c(lastmod)}</lastmod>" if lastmod else ""
+        for u in urls.values():
+            yield f"<url><loc>{escape(u)}</loc>{mod}{alternates}</url>"
+
+
+def _urlset(entries: List[str]) -> bytes:
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9" '
+        'xmlns:xhtml="http://www.w3.org/1999/xhtml">\n'
+        + "\n".join(entries)
+        + "\n</urlset>\n"
+    ).encode("utf-8")
+
+
+def _section_file(name: str, n: int) -> str:
+    return f"{SITEMAP_DIR}/sitemap-{name}-{n}.xml"
+
+
+# ============================================================
+# Generare
+# ============================================================
+
+def write_section(name: str) -> List[str]:
+    """
+    Rescrie fișierele unei secțiuni (împărțite la MAX_URLS) și întoarce căile lor.
+    """
+    section = _sections()[name]
+    files, chunk = [], []
+
+    def _flush():
+        rel = _section_file(name, len(files) + 1)
+        write_atomic(rel, _urlset(chunk))
+        files.append(rel)
+
+    for entry in _url_entries(section):
+        chunk.append(entry)
+        if len(chunk) >= MAX_URLS:
+            _flush()
+            chunk = []
+    if chunk or not files:
+        _flush()
+
+    remove_stale(set(files), f"{SITEMAP_DIR}/sitemap-{name}-")
+    return files
+
+
+def write_index() -> None:
+    """
+    sitemap.xml = index cu toate fișierele de secțiune; numărul de fișiere și
+    lastmod vin din agregate (fără să reitereze obiectele).
+    """
+    n_lang = len(_languages())
+    parts = []
+    for name in SECTION_NAMES:
+        count, last = _sections()[name].stats()
+        n_files = max(1, -(-count * n_lang // MAX_URLS))
+        for n in range(1, n_files + 1):
+            loc = f"{site_url()}/{_section_file(name, n)}"
+            mod = f"<lastmod>{_w3c(last)}</lastmod>" if last else ""
+            parts.append(f"<sitemap><loc>{escape(loc)}</loc>{mod}</sitemap>")
+
+    data = (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+        + "\n".join(parts)
+        + "\n</sitemapindex>\n"
+    ).encode("utf-8")
+    write_atomic(INDEX_FILE, data)
+
+
+def write_all() -> None:
+    for name in SECTION_NAMES:
+        write_section(name)
+    write_index()
+
+
+def refresh_section(*names: str) -> None:
+    """
+    Regenerare incrementală: secțiunile modificate + indexul, scrise de worker
+    (python manage.py publish_worker), nu în request-ul din admin.
+    """
+    enqueue([f"{SITEMAP_PREFIX}{name}" for name in names])
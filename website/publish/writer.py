@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import os
+import tempfile
+from pathlib import Path
+from typing import Set
+
+from django.conf import settings
+
+
+def publish_root() -> Path:
+    """
+    Folder servit direct de web server (nginx), în afara Django.
+    PUBLISH_ROOT în settings; implicit <BASE_DIR>/public.
+    """
+    return Path(getattr(settings, "PUBLISH_ROOT", settings.BASE_DIR / "public"))
+
+
+def site_url() -> str:
+    return getattr(settings, "SITE_URL", "http://localhost:8000").rstrip("/")
+
+
+def write_atomic(relpath: str, data: bytes) -> bool:
+    """
+    Scrie fișierul prin rename (cititorii nu văd niciodată un fișier pe jumătate).
+    Întoarce False dacă conținutul e identic (mtime rămâne neschimbat).
+    """
+    path = publish_root() / relpath
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.exists() and path.read_bytes() == data:
+        return False
+
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(data)
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+    return True
+
+
+def remove_stale(relpaths: Set[str], prefix: str) -> None:
+    """
+    Șterge fișierele generate anterior (prefix dat) care nu mai fac parte din set.
+    """
+    root = publish_root()
+    folder = (root / prefix).parent
+    if not folder.exists():
+        return
+    for path in folder.glob(f"{Path(prefix).name}*"):
+        rel = str(path.relative_to(root))
+        if rel not in relpaths:
+            path.unlink()
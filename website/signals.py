@@ -0,0 +1,111 @@
+from django.apps import apps
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import dashboard
+from .blog_nav import rebuild_navigation
+from .catalog import catalog_index
+from .models import BlogPost, Brand, Product, ProductCategory, Project, Service, SiteSettings
+from .publish import export, feeds, sitemaps
+from .specs import sync_product_specs
+
+
+def connect_dashboard_signals():
+    for label in dashboard.WATCHED_MODELS:
+        app_label, model_name = label.split(".")
+        if not apps.is_installed(app_label):
+            continue
+        model = apps.get_model(app_label, model_name)
+        post_save.connect(dashboard.invalidate, sender=model, dispatch_uid=f"dashboard-save-{label}")
+        post_delete.connect(dashboard.invalidate, sender=model, dispatch_uid=f"dashboard-delete-{label}")
+
+
+def _export_changed(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    export.refresh(sender._meta.label_lower, instance.pk, instance)
+
+
+def connect_export_signals():
+    # export static (website/publish/export.py): doar paginile afectate, prin coadă
+    for label in export.DEPENDENCIES:
+        model = apps.get_model(label)
+        post_save.connect(_export_changed, sender=model, dispatch_uid=f"export-save-{label}")
+        post_delete.connect(_export_changed, sender=model, dispatch_uid=f"export-delete-{label}")
+
+
+# ----------------------------
+# Catalog produse (index + fațete)
+# ----------------------------
+
+@receiver(post_save, sender=Product)
+def product_saved(sender, instance, raw=False, **kwargs):
+    if raw:  # loaddata
+        return
+    # specs întâi: lista de filtre din cache e legată de versiunea indexului de catalog
+    sync_product_specs(instance)
+    catalog_index.update(instance)
+
+
+@receiver(post_delete, sender=Product)
+def product_deleted(sender, instance, **kwargs):
+    catalog_index.remove(instance.pk)
+
+
+@receiver(post_save, sender=Brand)
+@receiver(post_delete, sender=Brand)
+@receiver(post_save, sender=ProductCategory)
+@receiver(post_delete, sender=ProductCategory)
+def catalog_facet_renamed(sender, **kwargs):
+    # numele / slug-ul apare în fațete => reconstruire la următoarea căutare
+    catalog_index.invalidate()
+
+
+# ----------------------------
+# Blog: navigare precalculată
+# ----------------------------
+
+@receiver(post_save, sender=BlogPost)
+@receiver(post_delete, sender=BlogPost)
+def blog_post_changed(sender, raw=False, **kwargs):
+    if raw:
+        return
+    # după commit: recalcularea citește toate articolele publicate
+    transaction.on_commit(rebuild_navigation)
+
+
+# ----------------------------
+# Sitemap / feed-uri statice (website/publish)
+# ----------------------------
+
+_SITEMAP_SECTIONS = {
+    Service: "services",
+    Project: "projects",
+    BlogPost: "blog",
+    Product: "products",
+}
+
+
+@receiver(post_save, sender=Service)
+@receiver(post_delete, sender=Service)
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+@receiver(post_save, sender=BlogPost)
+@receiver(post_delete, sender=BlogPost)
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+def public_content_changed(sender, raw=False, **kwargs):
+    if raw:
+        return
+    sitemaps.refresh_section(_SITEMAP_SECTIONS[sender])
+    if sender is BlogPost:
+        feeds.refresh_feeds()
+
+
+@receiver(post_save, sender=SiteSettings)
+def site_settings_changed(sender, raw=False, **kwargs):
+    if raw:
+        return
+    # flag-urile *_enabled ascund secțiuni întregi
+    sitemaps.refresh_section(*sitemaps.SECTION_NAMES)
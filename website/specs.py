@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+import re
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set, Tuple
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q
+
+from search.text import fold_text
+
+from .catalog import catalog_index
+
+# unitate scrisă -> (unitate de bază, factor)
+UNITS: Dict[str, Tuple[str, float]] = {
+    "V": ("V", 1), "mV": ("V", 1e-3), "kV": ("V", 1e3),
+    "A": ("A", 1), "mA": ("A", 1e-3), "kA": ("A", 1e3),
+    "W": ("W", 1), "kW": ("W", 1e3), "MW": ("W", 1e6), "mW": ("W", 1e-3),
+    "CP": ("W", 735.5), "HP": ("W", 745.7),
+    "VA": ("VA", 1), "kVA": ("VA", 1e3),
+    "Hz": ("Hz", 1), "kHz": ("Hz", 1e3), "MHz": ("Hz", 1e6),
+    "mm": ("m", 1e-3), "cm": ("m", 1e-2), "m": ("m", 1), "km": ("m", 1e3),
+    "g": ("kg", 1e-3), "kg": ("kg", 1), "t": ("kg", 1e3),
+    "Pa": ("Pa", 1), "kPa": ("Pa", 1e3), "MPa": ("Pa", 1e6), "bar": ("Pa", 1e5), "mbar": ("Pa", 1e2),
+    "°C": ("°C", 1), "C": ("°C", 1),
+    "rpm": ("rpm", 1), "rot/min": ("rpm", 1),
+    "l": ("l", 1), "L": ("l", 1), "ml": ("l", 1e-3),
+    "Nm": ("Nm", 1),
+    "Ω": ("Ω", 1), "ohm": ("Ω", 1), "kΩ": ("Ω", 1e3),
+    "%": ("%", 1),
+}
+
+# fallback fără majuscule ("kw", "KW" -> kW); la coliziuni (mw / MW) câștigă prima
+_UNITS_LOWER: Dict[str, str] = {}
+for _u in UNITS:
+    _UNITS_LOWER.setdefault(_u.lower(), _u)
+
+_NUM = r"[-+]?\d+(?:[.,]\d+)?"
+VALUE_RE = re.compile(
+    rf"^\s*(?P<lo>{_NUM})\s*(?:(?:-|–|\.\.|÷)\s*(?P<hi>{_NUM}))?\s*(?P<unit>[^\d\s][^\s]*)?\s*$"
+)
+
+MAX_FILTER_KEYS = 8
+# lista de filtre e legată de versiunea indexului de catalog; TTL doar ca limită de memorie
+FILTER_KEYS_TTL = 3600
+
+
+@dataclass(frozen=True)
+class ParsedValue:
+    value_min: Optional[float]
+    value_max: Optional[float]
+    unit: str
+    base_unit: str
+
+
+def spec_key(label) -> str:
+    return fold_text(label)[:120]
+
+
+def _to_float(s: str) -> float:
+    return float(s.replace(",", "."))
+
+
+def resolve_unit(unit: str) -> Optional[str]:
+    unit = (unit or "").strip()
+    if not unit:
+        return ""
+    if unit in UNITS:
+        return unit
+    return _UNITS_LOWER.get(unit.lower())
+
+
+def parse_value(raw) -> ParsedValue:
+    """
+    "24V" -> 24 V; "2,2 kW" -> 2200 W; "10-20 mm" -> 0.01..0.02 m.
+    Valorile nenumerice / cu unități necunoscute rămân doar text.
+    """
+    m = VALUE_RE.match(str(raw or ""))
+    if not m:
+        return ParsedValue(None, None, "", "")
+
+    unit = resolve_unit(m.group("unit"))
+    if unit is None:
+        return ParsedValue(None, None, "", "")
+
+    base, factor = UNITS.get(unit, ("", 1))
+    lo = _to_float(m.group("lo")) * factor
+    hi = _to_float(m.group("hi")) * factor if m.group("hi") else lo
+    if hi < lo:
+        lo, hi = hi, lo
+    return ParsedValue(lo, hi, unit, base)
+
+
+def _spec_rows(product) -> List:
+    from .models import ProductSpec
+
+    specs = product.specs if isinstance(product.specs, dict) else {}
+    rows, seen = [], set()
+    for label, raw in specs.items():
+        key = spec_key(label)
+        if not key or key in seen or isinstance(raw, (dict, list)):
+            continue
+        seen.add(key)
+        parsed = parse_value(raw)
+        rows.append(ProductSpec(
+            product=product,
+            key=key,
+            label=str(label)[:120],
+            raw=str(raw if raw is not None else "")[:255],
+            value_text=fold_text(raw)[:255],
+            value_min=parsed.value_min,
+            value_max=parsed.value_max,
+            unit=parsed.unit,
+            base_unit=parsed.base_unit,
+        ))
+    return rows
+
+
+def sync_product_specs(product) -> None:
+    from .models import ProductSpec
+
+    rows = _spec_rows(product)
+    with transaction.atomic():
+        ProductSpec.objects.filter(product=product).delete()
+        ProductSpec.objects.bulk_create(rows)
+
+
+def sync_many_product_specs(products) -> None:
+    """
+    Varianta bulk (import catalog): un singur delete + un bulk_create.
+    """
+    from .models import ProductSpec
+
+    products = list(products)
+    rows = [row for p in products for row in _spec_rows(p)]
+    with transaction.atomic():
+        ProductSpec.objects.filter(product__in=[p.pk for p in products]).delete()
+        ProductSpec.objects.bulk_create(rows, batch_size=1000)
+
+
+# ============================================================
+# Filtre pe interval
+# ============================================================
+
+@dataclass(frozen=True)
+class RangeKey:
+    key: str
+    label: str
+    unit: str       # unitatea afișată în filtru (cea mai folosită)
+    base_unit: str
+    count: int
+
+
+def range_filter_keys(limit: int = MAX_FILTER_KEYS) -> List[RangeKey]:
+    """
+    Cheile numerice cele mai folosite (pentru filtrele "de la / până la").
+    Lista e în cache și se reface odată cu indexul de catalog.
+    """
+    from .models import ProductSpec
+
+    cache_key = f"catalog:spec-keys:{catalog_index.version()}:{limit}"
+    keys = cache.get(cache_key)
+    if keys is not None:
+        return keys
+
+    units: Dict[str, Counter] = defaultdict(Counter)
+    labels: Dict[str, str] = {}
+    rows = (
+        ProductSpec.objects
+        .filter(value_min__isnull=False, product__is_active=True)
+        .values_list("key", "label", "unit", "base_unit")
+    )
+    for key, label, unit, base in rows:
+        units[key][(unit, base)] += 1
+        labels.setdefault(key, label)
+
+    keys = []
+    for key, counter in units.items():
+        (unit, base), _ = counter.most_common(1)[0]
+        keys.append(RangeKey(key, labels[key], unit, base, sum(counter.values())))
+    keys.sort(key=lambda k: (-k.count, k.key))
+    keys = keys[:limit]
+
+    cache.set(cache_key, keys, FILTER_KEYS_TTL)
+    return keys
+
+
+def parse_bound(value, display_unit: str) -> Optional[float]:
+    """
+    Limită introdusă de user: "5" (în unitatea afișată) sau "5 kW" (unitate explicită).
+    O unitate explicită cu altă mărime decât filtrul ("5 A" pentru kW) e ignorată.
+    """
+    value = (value or "").strip()
+    if not value:
+        return None
+    parsed = parse_value(value)
+    if parsed.value_min is None:
+        return None
+    base, factor = UNITS.get(display_unit, ("", 1))
+    if parsed.unit:
+        return parsed.value_min if parsed.base_unit == base else None
+    return parsed.value_min * factor
+
+
+def filter_product_ids(
+    ranges: Dict[str, Tuple[str, Optional[float], Optional[float]]],
+) -> Optional[Set[int]]:
+    """
+    {key: (base_unit, lo, hi)} în unitatea de bază -> id-urile produselor care se
+    suprapun cu toate intervalele. None = niciun filtru activ.
+    Valorile aceleiași chei scrise în altă mărime (ex: "16 A" la "Putere") nu se compară.
+    """
+    from .models import ProductSpec
+
+    ids: Optional[Set[int]] = None
+    for key, (base_unit, lo, hi) in ranges.items():
+        if lo is None and hi is None:
+            continue
+        cond = Q(key=key, base_unit=base_unit, value_min__isnull=False)
+        if lo is not None:
+            cond &= Q(value_max__gte=lo)
+        if hi is not None:
+            cond &= Q(value_min__lte=hi)
+        matched = set(ProductSpec.objects.filter(cond).values_list("product_id", flat=True))
+        ids = matched if ids is None else ids & matched
+        if not ids:
+            break
+    return ids
@@ -0,0 +1,13 @@
+from django import template
+
+from website.publish.assets import asset_url
+
+register = template.Library()
+
+
+@register.simple_tag
+def asset(name):
+    """
+    {% asset "website/css/styles.css" %} -> URL cu hash (cache-abil pe termen nelimitat).
+    """
+    return asset_url(name)
@@ -1,3 +1,516 @@
-from django.test import TestCase
+import gzip
+import json
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.cache import cache
+from django.core.cache.utils import make_template_fragment_key
+from django.core.management import call_command
+from django.db import transaction
+from django.template import Context, Template
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone, translation
+from django.utils.functional import empty
+
+from accounts.models import User
+from perf import versions
+from perf.testing import plain_static_storage
+from perf.versions import VersionWatcher
+
+from . import blog_content, blog_nav, catalog_io, dashboard
+from .catalog import CatalogIndex
+from .models import BlogPost, BlogPostNav, Brand, ContactMessage, ExportRequest, PopUpMessage, Product, ProductCategory
+from .publish import assets, export, queue, sitemaps
+from .site_settings import get_site_settings
+from .specs import filter_product_ids, parse_bound
+from .views import BLOG_PER_PAGE
+
+
+@mock.patch.object(versions, "CHECK_INTERVAL", 0)
+class CatalogIndexTests(TestCase):
+    """
+    O instanță CatalogIndex separată = indexul din alt proces (worker Gunicorn).
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.category = ProductCategory.objects.create(name="Motoare", slug="motoare")
+        cls.brand = Brand.objects.create(name="Siemens")
+        cls.product = Product.objects.create(title="Motor asincron", slug="motor", category=cls.category, brand=cls.brand)
+
+    def test_other_process_sees_product_changes(self):
+        other = CatalogIndex()
+        self.assertEqual(other.search("motor").ids, [self.product.pk])
+
+        Product.objects.create(title="Motor pas cu pas", slug="motor-pas", category=self.category)
+        self.assertEqual(len(other.search("motor").ids), 2)
+
+        self.product.is_active = False
+        self.product.save()
+        self.assertEqual(len(other.search("motor").ids), 1)
+
+    def test_other_process_sees_brand_rename_in_facets(self):
+        other = CatalogIndex()
+        self.assertEqual(other.search().facets["brand"], {"Siemens": 1})
+
+        self.brand.name = "Siemens AG"
+        self.brand.save()
+        self.assertEqual(other.search().facets["brand"], {"Siemens AG": 1})
+
+    def test_version_is_checked_at_most_once_per_interval(self):
+        other = CatalogIndex()
+        other.search()
+        with mock.patch.object(other._watcher, "interval", 60), \
+                mock.patch.object(versions, "current") as current:
+            other.search("motor")
+        current.assert_not_called()
+
+
+class SpecRangeFilterTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.motor = Product.objects.create(title="Motor", slug="motor", specs={"Putere": "5 kW"})
+        # aceeași cheie, altă mărime: nu trebuie comparată cu kW
+        cls.odd = Product.objects.create(title="Releu", slug="releu", specs={"Putere": "5000 A"})
+
+    def test_bound_with_other_unit_base_is_rejected(self):
+        self.assertIsNone(parse_bound("5 A", "kW"))
+        self.assertEqual(parse_bound("2000 W", "kW"), 2000)
+        self.assertEqual(parse_bound("2", "kW"), 2000)
+
+    def test_filter_compares_only_values_with_the_same_base_unit(self):
+        self.assertEqual(filter_product_ids({"putere": ("W", 4000, 6000)}), {self.motor.pk})
+        self.assertEqual(filter_product_ids({"putere": ("A", 4000, 6000)}), {self.odd.pk})
+
+
+class CatalogImportTests(TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+        self.media = os.path.join(self.tmp, "media")
+        self.files = os.path.join(self.tmp, "files")
+        os.makedirs(self.files)
+        with open(os.path.join(self.files, "fisa.pdf"), "wb") as fh:
+            fh.write(b"%PDF-1.4")
+        with open(os.path.join(self.tmp, "secret.txt"), "w") as fh:
+            fh.write("secret")
+        self.enterContext(override_settings(MEDIA_ROOT=self.media))
+
+    def run_import(self, *rows):
+        path = os.path.join(self.tmp, "catalog.csv")
+        with open(path, "w", encoding="utf-8") as fh:
+            fh.write("sku;title;category;datasheet\n")
+            for row in rows:
+                fh.write(";".join(row) + "\n")
+        return catalog_io.import_catalog(path, files_dir=self.files)
+
+    def media_files(self):
+        return [f for _, _, files in os.walk(self.media) for f in files]
+
+    def test_file_outside_files_dir_is_rejected(self):
+        report = self.run_import(
+            ("A1", "Motor", "", "../secret.txt"),
+            ("A2", "Pompa", "", os.path.join(self.tmp, "secret.txt")),
+        )
+        self.assertEqual(report.created, 0)
+        self.assertEqual(len(report.errors), 2)
+        self.assertIn("nepermisă", report.errors[0])
+        self.assertEqual(self.media_files(), [])
+
+    def test_attached_file_is_copied(self):
+        report = self.run_import(("A1", "Motor", "", "fisa.pdf"))
+        self.assertEqual((report.created, report.files_attached), (1, 1))
+        self.assertEqual(Product.objects.get(sku="A1").datasheet.name, "datasheets/fisa.pdf")
+        self.assertEqual(self.media_files(), ["fisa.pdf"])
+
+    def test_files_are_removed_when_the_import_rolls_back(self):
+        with mock.patch.object(catalog_io, "_after_import", side_effect=RuntimeError("boom")), \
+                self.assertRaises(RuntimeError):
+            self.run_import(("A1", "Motor", "", "fisa.pdf"))
+        self.assertFalse(Product.objects.filter(sku="A1").exists())
+        self.assertEqual(self.media_files(), [])
+
+    def test_long_category_name_fits_the_slug_field(self):
+        name = "Echipamente pentru automatizare industriala si retrofit de linii"
+        report = self.run_import(("A1", "Motor", name, ""), ("A2", "Pompa", name, ""))
+        self.assertEqual((report.created, report.errors), (2, []))
+        category = ProductCategory.objects.get()
+        self.assertLessEqual(len(category.slug), 50)
+        self.assertEqual(set(Product.objects.values_list("category", flat=True)), {category.pk})
+
+
+class BlogNavigationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        now = timezone.now()
+        cls.first = BlogPost.objects.create(title="Retrofit", slug="retrofit", content="x", published_at=now - timedelta(days=2))
+        cls.second = BlogPost.objects.create(title="Service", slug="service", content="x", published_at=now - timedelta(days=1))
+        cls.third = BlogPost.objects.create(title="Automatizare", slug="automatizare", content="x", published_at=now)
+
+    def load(self, post):
+        return BlogPost.objects.select_related("nav").get(pk=post.pk)
+
+    def test_post_without_nav_row_does_not_rebuild_the_table(self):
+        with mock.patch.object(blog_nav, "rebuild_navigation") as rebuild:
+            nav = blog_nav.neighbours(self.load(self.second))
+        rebuild.assert_not_called()
+        self.assertFalse(BlogPostNav.objects.exists())
+        self.assertEqual((nav["prev"], nav["next"]), (self.first, self.third))
+
+    def test_other_process_stops_linking_an_unpublished_post(self):
+        blog_nav.rebuild_navigation()
+        other = VersionWatcher(blog_nav.VERSION_KEY, interval=0)
+        with mock.patch.object(blog_nav, "_watcher", other):
+            self.assertEqual(blog_nav.neighbours(self.load(self.second))["prev"], self.first)
+
+        # scrierea trece prin watcher-ul "procesului" curent
+        self.first.is_published = False
+        with self.captureOnCommitCallbacks(execute=True):
+            self.first.save()
+
+        with mock.patch.object(blog_nav, "_watcher", other):
+            nav = blog_nav.neighbours(self.load(self.second))
+        self.assertIsNone(nav["prev"])
+        self.assertNotIn(self.first, nav["related"])
+
+
+class PublishQueueTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        get_site_settings()
+        ExportRequest.objects.all().delete()
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+        self.enterContext(override_settings(PUBLISH_ROOT=self.tmp))
+
+    def written(self):
+        return sorted(f for _, _, files in os.walk(self.tmp) for f in files)
+
+    def test_save_queues_the_section_once_and_writes_nothing(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Product.objects.create(title="Motor", slug="motor")
+            Product.objects.create(title="Pompă", slug="pompa")
+        self.assertEqual(list(ExportRequest.objects.values_list("selector", flat=True)), ["sitemap:products"])
+        self.assertEqual(self.written(), [])
+
+        queue.drain()
+        self.assertEqual(self.written(), ["sitemap-products-1.xml", "sitemap.xml"])
+        self.assertFalse(ExportRequest.objects.exists())
+
+    def test_rolled_back_save_queues_nothing(self):
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            BlogPost.objects.create(title="Articol", slug="articol", content="x")
+            raise RuntimeError
+        self.assertFalse(ExportRequest.objects.exists())
+
+    def test_blog_post_queues_its_section_and_the_feeds(self):
+        BlogPost.objects.create(title="Articol", slug="articol", content="x")
+        self.assertEqual(
+            sorted(ExportRequest.objects.values_list("selector", flat=True)), ["feeds:blog", "sitemap:blog"],
+        )
+
+    def test_failed_write_keeps_the_save_and_is_retried(self):
+        with mock.patch.object(sitemaps, "write_index", side_effect=OSError):
+            with self.captureOnCommitCallbacks(execute=True):
+                Product.objects.create(title="Motor", slug="motor")
+            with self.assertRaises(OSError):
+                queue.drain()
+        self.assertTrue(Product.objects.exists())
+
+        queue.drain(now=timezone.now() + queue.LEASE)
+        self.assertIn("sitemap.xml", self.written())
+
+    def test_worker_logs_and_keeps_running(self):
+        Product.objects.create(title="Motor", slug="motor")
+        command = "website.management.commands.publish_worker"
+        with mock.patch.object(queue, "drain", side_effect=[OSError, KeyboardInterrupt]), \
+                mock.patch(f"{command}.close_old_connections"), mock.patch(f"{command}.time.sleep"), \
+                self.assertLogs("website.publish", "ERROR"), self.assertRaises(KeyboardInterrupt):
+            call_command("publish_worker", every=1, stdout=StringIO())
+
+
+@override_settings(STATIC_EXPORT=True)
+class ExportQueueTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        # setările implicite (create la primul acces) ar pune "*" în coadă
+        get_site_settings()
+        ExportRequest.objects.all().delete()
+
+    def setUp(self):
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp)
+        self.enterContext(override_settings(PUBLISH_ROOT=tmp))
+
+    def test_save_queues_selectors_instead_of_rendering(self):
+        with mock.patch.object(export, "export") as render, self.captureOnCommitCallbacks(execute=True):
+            product = Product.objects.create(title="Motor", slug="motor")
+        render.assert_not_called()
+        self.assertEqual(
+            sorted(ExportRequest.objects.values_list("selector", flat=True)),
+            ["page:products_list", f"product:{product.pk}", "sitemap:products"],
+        )
+
+    def test_drain_exports_repeated_selectors_once(self):
+        product = Product.objects.create(title="Motor", slug="motor")
+        product.save()
+        with mock.patch.object(export, "export", return_value={}) as render:
+            queue.drain()
+            self.assertIsNone(queue.drain())
+        render.assert_called_once_with(["page:products_list", f"product:{product.pk}"])
+        self.assertFalse(ExportRequest.objects.exists())
+
+    def test_failed_export_is_retried_after_the_lease(self):
+        Product.objects.create(title="Motor", slug="motor")
+        with mock.patch.object(export, "export", side_effect=RuntimeError), self.assertRaises(RuntimeError):
+            queue.drain()
+        self.assertEqual(ExportRequest.objects.count(), 3)
+
+        with mock.patch.object(export, "export", return_value={}) as render:
+            self.assertIsNone(queue.drain())
+            queue.drain(now=timezone.now() + queue.LEASE)
+        render.assert_called_once()
+
+    def test_popup_window_edges_are_queued(self):
+        start = timezone.now() + timedelta(days=1)
+        end = start + timedelta(days=2)
+        PopUpMessage.objects.create(title="Închis", body="x", start_at=start, end_at=end)
+
+        due = sorted(ExportRequest.objects.values_list("available_at", flat=True))
+        self.assertEqual(due[1:], [start, end + timedelta(seconds=1)])
+        with mock.patch.object(export, "export", return_value={}) as render:
+            queue.drain()
+            queue.drain(now=start)
+        self.assertEqual(render.call_args_list, [mock.call(["*"]), mock.call(["*"])])
+
+
+class SanitizerTests(SimpleTestCase):
+    def test_editor_output_is_kept(self):
+        html = (
+            '<h1>Titlu</h1><p>x<iframe src="https://www.youtube.com/embed/abc" allowfullscreen></iframe></p>'
+            '<img src="data:image/png;base64,AAAA" alt="a">'
+            '<video controls><source src="/media/clip.mp4" type="video/mp4"></video>'
+        )
+        self.assertEqual(blog_content.sanitize_html(html), html.replace("allowfullscreen>", 'allowfullscreen="">')
+                         .replace("controls>", 'controls="">'))
+
+    def test_unsafe_markup_is_removed(self):
+        html = (
+            '<p onclick="x()">a<script>alert(1)</script></p>'
+            '<iframe src="https://evil.example/x">fallback</iframe>'
+            '<iframe src="http://www.youtube.com/embed/abc"></iframe>'
+            '<img src="data:image/svg+xml;base64,AAAA"><a href="javascript:x()">b</a>'
+        )
+        self.assertEqual(blog_content.sanitize_html(html), "<p>a</p><img><a>b</a>")
+
+
+@plain_static_storage
+class BlogListTests(TestCase):
+    databases = {"default", "analytics"}
+
+    @classmethod
+    def setUpTestData(cls):
+        now = timezone.now()
+        cls.posts = [
+            BlogPost.objects.create(
+                title=f"Articol {i}", slug=f"articol-{i}", content=f"<p>Conținut <b>{i}</b></p>",
+                published_at=now - timedelta(days=i),
+            )
+            for i in range(BLOG_PER_PAGE + 2)
+        ]
+
+    def setUp(self):
+        cache.clear()
+
+    def test_invalid_archive_month_is_404(self):
+        response = self.client.get(reverse("blog_archive", args=[2024, 13]))
+        self.assertEqual(response.status_code, 404)
+
+    def test_list_is_paginated(self):
+        response = self.client.get(reverse("blog_list"), {"page": 2})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([p.pk for p in response.context["posts"]], [p.pk for p in self.posts[BLOG_PER_PAGE:]])
+
+    def test_excerpts_are_cached_until_the_post_changes(self):
+        def excerpts():
+            posts = list(BlogPost.objects.only("id", "short", "updated_at").order_by("pk"))
+            blog_content.attach_excerpts(posts)
+            return posts
+
+        self.assertEqual(excerpts()[0].excerpt, "Conținut 0")
+        with self.assertNumQueries(1):  # doar lista; conținutul nu se mai citește
+            excerpts()
+
+        self.posts[0].content = "<p>Nou</p>"
+        self.posts[0].save()
+        self.assertEqual(excerpts()[0].excerpt, "Nou")
+
+
+@plain_static_storage
+class AdminDashboardTests(TestCase):
+    databases = {"default", "analytics"}
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser("admin@example.com", "x")
+        cls.message = ContactMessage.objects.create(name="Ana", email="ana@example.com", message="x")
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.admin)
+        self.compute = self.enterContext(mock.patch.object(dashboard, "compute_metrics", wraps=dashboard.compute_metrics))
+        self.enterContext(mock.patch.object(dashboard._watcher, "interval", 0))
+
+    def test_index_computes_metrics_once_until_a_change(self):
+        self.assertEqual(self.client.get(reverse("vertix_admin:index")).context["dashboard"]["contact_unread"], 1)
+        self.client.get(reverse("vertix_admin:index"))
+        self.assertEqual(self.compute.call_count, 1)
+
+        # alt proces: cache-ul local rămâne, versiunea din baza de date se schimbă
+        self.message.is_read = True
+        with mock.patch.object(dashboard, "_watcher", VersionWatcher(dashboard.VERSION_KEY, interval=0)):
+            self.message.save()
+        response = self.client.get(reverse("vertix_admin:index"))
+        self.assertEqual(response.context["dashboard"]["contact_unread"], 0)
+        self.assertEqual(self.compute.call_count, 2)
+
+    def test_changelist_does_not_compute_metrics(self):
+        response = self.client.get(reverse("vertix_admin:website_contactmessage_changelist"))
+        self.assertEqual(response.status_code, 200)
+        self.compute.assert_not_called()
+
+
+class StaticAssetsTests(SimpleTestCase):
+    """
+    collectstatic cu VertixStaticStorage într-un STATIC_ROOT temporar, doar cu fișierele testului.
+    """
+
+    CSS = "/* antet */\n" + "".join(f".c{i} {{\n  color: red;\n  margin: 0;\n}}\n" for i in range(40))
+
+    def setUp(self):
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp)
+        self.source = source = os.path.join(tmp, "src")
+        self.root = os.path.join(tmp, "root")
+        for name, data in (("site.css", self.CSS), ("mic.css", "a { color: red; }")):
+            os.makedirs(os.path.join(source, "website"), exist_ok=True)
+            with open(os.path.join(source, "website", name), "w") as fh:
+                fh.write(data)
+
+        self.enterContext(override_settings(
+            STATIC_ROOT=self.root,
+            STATICFILES_DIRS=[source],
+            STATICFILES_FINDERS=["django.contrib.staticfiles.finders.FileSystemFinder"],
+            STORAGES={
+                "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+                "staticfiles": {"BACKEND": "website.publish.assets.VertixStaticStorage"},
+            },
+        ))
+
+    def collect(self):
+        call_command("collectstatic", interactive=False, verbosity=0)
+        with open(os.path.join(self.root, "staticfiles.json")) as fh:
+            return json.load(fh)["paths"]
+
+    def read(self, name):
+        with open(os.path.join(self.root, name), "rb") as fh:
+            return fh.read()
+
+    def render(self, name):
+        return Template('{% load assets %}{% asset name %}').render(Context({"name": name}))
+
+    def test_collectstatic_minifies_hashes_and_compresses(self):
+        paths = self.collect()
+        hashed = paths["website/site.css"]
+        self.assertNotEqual(hashed, "website/site.css")
+
+        css = self.read(hashed)
+        self.assertEqual(css, self.read("website/site.css"))
+        self.assertTrue(css.startswith(b".c0{color:red;margin:0}"))
+        self.assertNotIn(b"antet", css)
+        self.assertEqual(gzip.decompress(self.read(hashed + ".gz")), css)
+        self.assertEqual(os.path.exists(os.path.join(self.root, hashed + ".br")), assets.brotli is not None)
+
+        # sub COMPRESS_MIN_SIZE: fără .gz
+        self.assertFalse(os.path.exists(os.path.join(self.root, paths["website/mic.css"] + ".gz")))
+
+    def test_asset_url_uses_the_manifest(self):
+        paths = self.collect()
+        staticfiles_storage._wrapped = empty  # proces nou: manifestul se citește de pe disc
+        self.assertEqual(self.render("website/site.css"), f"/static/{paths['website/site.css']}")
+
+    def test_asset_url_without_collectstatic_is_versioned_by_content(self):
+        self.enterContext(plain_static_storage)
+        url = self.render("website/site.css")
+        path, version = url.split("?v=")
+        self.assertEqual(path, "/static/website/site.css")
+        self.assertEqual(len(version), 12)
+
+        path = os.path.join(self.source, "website", "site.css")
+        with open(path, "a") as fh:
+            fh.write(".nou{}")
+        os.utime(path, (1, 1))
+        self.assertNotEqual(self.render("website/site.css"), url)
+        self.assertEqual(self.render("website/lipsa.css"), "/static/website/lipsa.css")
+
+
+@plain_static_storage
+class FragmentCacheTests(TestCase):
+    databases = {"default", "analytics"}
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("ana@example.com", "x", is_active=True)
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def get_home(self, lang):
+        with translation.override(lang):
+            url = reverse("home")
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def cached(self, lang, authenticated):
+        stamp = get_site_settings().updated_at.timestamp()
+        return (
+            make_template_fragment_key("site_navbar", [lang, authenticated, stamp]) in cache,
+            make_template_fragment_key("site_footer", [lang, authenticated]) in cache,
+        )
+
+    def test_fragments_vary_by_language_and_login(self):
+        self.get_home("ro")
+        self.assertEqual(self.cached("ro", False), (True, True))
+        self.assertEqual(self.cached("en", False), (False, False))
+
+        response = self.get_home("en")
+        self.assertEqual(self.cached("en", False), (True, True))
+        with translation.override("en"):
+            self.assertContains(response, f'href="{reverse("about")}"')
+
+        self.client.force_login(self.user)
+        response = self.get_home("ro")
+        self.assertEqual(self.cached("ro", True), (True, True))
+        with translation.override("ro"):
+            self.assertNotContains(response, f'href="{reverse("register")}"')
+
+    def test_site_settings_change_is_a_new_navbar(self):
+        self.get_home("ro")
+        settings_obj = get_site_settings()
+        settings_obj.about_enabled = False
+        settings_obj.save()
+
+        self.assertEqual(self.cached("ro", False), (False, True))
+        response = self.get_home("ro")
+        with translation.override("ro"):
+            self.assertNotContains(response, f'<a class="nav-link" href="{reverse("about")}"')
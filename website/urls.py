@@ -15,6 +15,7 @@ urlpatterns = [
     path("contact/", views.contact, name="contact"),
 
     path("blog/", views.blog_list, name="blog_list"),
+    path("blog/arhiva/<int:year>/<int:month>/", views.blog_list, name="blog_archive"),
     path("blog/<slug:slug>/", views.blog_detail, name="blog_detail"),
 
     path("cariere/", views.careers, name="careers"),
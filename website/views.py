@@ -1,15 +1,27 @@
 from __future__ import annotations
 
+from datetime import date
+
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
+from django.core.paginator import Paginator
+from django.db import transaction
+from django.db.models import Count
+from django.http import Http404
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
 from django.views.decorators.http import require_http_methods
 
+from notifications.outbox import notify_public_request
+from perf.queries import query_budget
 from portal.forms_public_request import PublicRequestForm
 from portal.models import PublicRequestAttachment
 
+from .blog_content import attach_excerpts, month_archive, rendered_content
+from .blog_nav import neighbours
+from .catalog import products_in_order, search_catalog
 from .site_settings import get_site_settings
+from .specs import filter_product_ids, parse_bound, range_filter_keys
 from .forms import PopUpMessageForm
 
 from .models import (
@@ -29,6 +41,7 @@ from .models import (
 # Public pages
 # ============================================================
 
+@query_budget(10)
 def home(request):
     s = get_site_settings()
     services = Service.objects.filter(is_featured=True)[:6]
@@ -176,10 +189,13 @@ def contact(request):
             if initial.get("email") and not getattr(obj, "email", None):
                 obj.email = initial["email"]
 
-            obj.save()
+            with transaction.atomic():
+                obj.save()
+
+                for f in request.FILES.getlist("attachments"):
+                    PublicRequestAttachment.objects.create(request=obj, file=f)
 
-            for f in request.FILES.getlist("attachments"):
-                PublicRequestAttachment.objects.create(request=obj, file=f)
+                notify_public_request(obj)
 
             messages.success(request, "Cererea a fost înregistrată. Revenim cât mai curând.")
             return redirect("contact")
@@ -222,33 +238,63 @@ def cookies(request):
 # Products
 # ============================================================
 
+PRODUCTS_PER_PAGE = 24
+
+
+@query_budget(14)
 def products_list(request):
     s = get_site_settings()
 
-    qs = Product.objects.filter(is_active=True)
-
     category = request.GET.get("cat") or ""
     brand = request.GET.get("brand") or ""
     availability = request.GET.get("avail") or ""
     q = request.GET.get("q") or ""
 
-    if category:
-        qs = qs.filter(category__slug=category)
-    if brand:
-        qs = qs.filter(brand__name=brand)
-    if availability:
-        qs = qs.filter(availability=availability)
-    if q:
-        qs = qs.filter(title__icontains=q) | qs.filter(sku__icontains=q)
+    # intervale pe specs (ex: Putere 1–5 kW), rezolvate pe ProductSpec (indexat)
+    spec_rows, ranges = [], {}
+    for rk in range_filter_keys():
+        raw_from = request.GET.get(f"spec_{rk.key}_from") or ""
+        raw_to = request.GET.get(f"spec_{rk.key}_to") or ""
+        spec_rows.append({"spec": rk, "from": raw_from, "to": raw_to})
+        ranges[rk.key] = (rk.base_unit, parse_bound(raw_from, rk.unit), parse_bound(raw_to, rk.unit))
+    restrict = filter_product_ids(ranges)
+
+    # index + contoare de fațete precalculate (website/catalog.py)
+    result = search_catalog(q, {"cat": category, "brand": brand, "avail": availability}, restrict)
+
+    paginator = Paginator(result.ids, PRODUCTS_PER_PAGE)
+    page_obj = paginator.get_page(request.GET.get("page") or 1)
+    products = products_in_order(page_obj.object_list)
+
+    cat_counts = result.facets["cat"]
+    brand_counts = result.facets["brand"]
+    avail_counts = result.facets["avail"]
+
+    categories = [
+        {"slug": c.slug, "name": c.name, "count": cat_counts.get(c.slug, 0)}
+        for c in ProductCategory.objects.all()
+    ]
+    brands = [
+        {"name": b.name, "count": brand_counts.get(b.name, 0)}
+        for b in Brand.objects.order_by("name")
+    ]
+    availabilities = [
+        {"code": code, "label": label, "count": avail_counts.get(code, 0)}
+        for code, label in Product.AVAILABILITY_CHOICES
+    ]
 
-    categories = ProductCategory.objects.all()
-    brands = Brand.objects.all()
+    keep = request.GET.copy()
+    keep.pop("page", None)
 
     return render(request, "website/products_list.html", {
         "site_settings": s,
-        "products": qs,
+        "products": products,
+        "page_obj": page_obj,
+        "keep_qs": keep.urlencode(),
         "categories": categories,
         "brands": brands,
+        "availabilities": availabilities,
+        "spec_rows": spec_rows,
         "selected": {"cat": category, "brand": brand, "avail": availability, "q": q},
     })
 
@@ -266,15 +312,43 @@ def product_detail(request, slug):
 # Blog
 # ============================================================
 
-def blog_list(request):
+BLOG_PER_PAGE = 12
+
+
+@query_budget(12)
+def blog_list(request, year=None, month=None):
     s = get_site_settings()
     if not s.blog_enabled:
         return redirect("home")
 
-    posts = BlogPost.objects.filter(is_published=True).order_by("-published_at")
+    archive_month = None
+    if year and month:
+        # ruta acceptă orice întreg: /blog/arhiva/2024/13/ e 404, nu 500
+        try:
+            archive_month = date(year, month, 1)
+        except ValueError:
+            raise Http404("Lună inexistentă.")
+
+    # fără "content" (HTML-ul complet); excerpt-ul vine din cache
+    posts = (
+        BlogPost.objects.filter(is_published=True)
+        .only("id", "title", "slug", "short", "image", "published_at", "updated_at")
+        .annotate(gallery_count=Count("gallery"))
+        .order_by("-published_at")
+    )
+    if year and month:
+        posts = posts.filter(published_at__year=year, published_at__month=month)
+
+    paginator = Paginator(posts, BLOG_PER_PAGE)
+    page_obj = paginator.get_page(request.GET.get("page") or 1)
+    attach_excerpts(page_obj.object_list)
+
     return render(request, "website/blog_list.html", {
         "site_settings": s,
-        "posts": posts,
+        "posts": page_obj.object_list,
+        "page_obj": page_obj,
+        "archive": month_archive(),
+        "archive_month": archive_month,
     })
 
 
@@ -283,31 +357,18 @@ def blog_detail(request, slug):
     if not s.blog_enabled:
         return redirect("home")
 
-    post = get_object_or_404(BlogPost, slug=slug, is_published=True)
-
-    prev_post = (
-        BlogPost.objects.filter(is_published=True, published_at__lt=post.published_at)
-        .order_by("-published_at")
-        .first()
-    )
-    next_post = (
-        BlogPost.objects.filter(is_published=True, published_at__gt=post.published_at)
-        .order_by("published_at")
-        .first()
-    )
-
-    related_qs = BlogPost.objects.filter(is_published=True).exclude(id=post.id)
-    if getattr(post, "category_id", None):
-        related_qs = related_qs.filter(category_id=post.category_id)
+    post = get_object_or_404(BlogPost.objects.select_related("nav"), slug=slug, is_published=True)
 
-    related_posts = related_qs.order_by("-published_at")[:4]
+    # prev / next / similare: precalculate (website/blog_nav.py), din cache
+    nav = neighbours(post)
+    post.content_html = rendered_content(post)
 
     return render(request, "website/blog_detail.html", {
         "site_settings": s,
         "post": post,
-        "prev_post": prev_post,
-        "next_post": next_post,
-        "related_posts": related_posts,
+        "prev_post": nav["prev"],
+        "next_post": nav["next"],
+        "related_posts": nav["related"],
     })
 
 